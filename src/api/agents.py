@@ -1,13 +1,18 @@
 import os
+import time
 import requests
 from typing import TypedDict, Optional, Dict, Any
 from dotenv import load_dotenv
 
+from src.api.metrics import LLM_LATENCY
+
 # Load environment variables
 load_dotenv()
 
 # --- CONFIGURATION ---
 PERPLEXITY_KEY = os.getenv("PERPLEXITY_API_KEY")
+# Overridable so load tests can point the agents at a local stub
+PERPLEXITY_API_URL = os.getenv("PERPLEXITY_API_URL", "https://api.perplexity.ai/chat/completions")
 MODEL_SMART = "sonar-pro"  # High reasoning, expensive
 MODEL_FAST = "sonar"       # Fast, cheaper, adequate for lookup
 
@@ -46,6 +51,7 @@ def call_perplexity(prompt: str, model: str = MODEL_FAST, role: str = "Research
     Generic wrapper to call Perplexity API.
     """
     if not PERPLEXITY_KEY:
+        LLM_LATENCY.observe(0.0, agent=role, model=model, outcome="mock")
         return "Mock Data: System in Offline/Demo Mode (No API Key found)."
     
     headers = {
@@ -59,13 +65,19 @@ def call_perplexity(prompt: str, model: str = MODEL_FAST, role: str = "Research
             {"role": "user", "content": prompt}
         ]
     }
+    start = time.perf_counter()
+    outcome = "ok"
     try:
-        res = requests.post("https://api.perplexity.ai/chat/completions", json=payload, headers=headers)
+        res = requests.post(PERPLEXITY_API_URL, json=payload, headers=headers)
         if res.status_code == 200:
             return res.json()['choices'][0]['message']['content']
+        outcome = f"http_{res.status_code}"
         return f"Error {res.status_code}: {res.text}"
     except Exception as e:
+        outcome = "connection_error"
         return f"Connection Error: {str(e)}"
+    finally:
+        LLM_LATENCY.observe(time.perf_counter() - start, agent=role, model=model, outcome=outcome)
 
 
 # --- AGENT SKILLS ---
@@ -0,0 +1,212 @@
+"""
+Versioned, hot-reloadable portfolio data for the API.
+
+Routes call `DataManager.snapshot()` once per request and read everything from
+that snapshot, so a reload that lands mid-request never mixes old and new
+frames. Reloads build a complete new snapshot (frames plus derived indexes) on
+a background thread and then swap a single reference under a lock.
+"""
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.data import store
+from src.data import features as feature_store
+
+# Datasets served by the API, keyed by snapshot attribute
+SNAPSHOT_DATASETS = {
+    "props": "properties",
+    "units": "units",
+    "tenants": "tenants",
+    "listings": "listings",
+}
+
+
+class DataSnapshot:
+    """
+    One consistent version of the portfolio data plus indexes derived from it.
+    Treat as read-only: routes must copy before mutating a frame.
+    """
+
+    def __init__(self, version: int, frames: Dict[str, pd.DataFrame], feature_version: Optional[str] = None):
+        self.version = version
+        self.loaded_at = datetime.utcnow().isoformat(timespec="seconds")
+        self.props = frames.get("props", pd.DataFrame())
+        self.units = frames.get("units", pd.DataFrame())
+        self.tenants = frames.get("tenants", pd.DataFrame())
+        self.listings = frames.get("listings", pd.DataFrame())
+        # Joined tenants ⋈ units ⋈ properties from the feature store (empty if unavailable)
+        self.tenant_features = frames.get("tenant_features", pd.DataFrame())
+        self.feature_version = feature_version
+
+        # --- Derived indexes ---
+        # Row positions of each property's units (avoids a full isin() scan per request)
+        self.units_by_property: Dict[str, np.ndarray] = {}
+        # Per-property unit count / mean market rent, as used by /properties
+        self.unit_stats = pd.DataFrame(columns=["property_id", "units", "avg_rent"])
+        if not self.units.empty:
+            self.units_by_property = {str(pid): pos for pid, pos in self.units.groupby("property_id").indices.items()}
+            stats = self.units.groupby("property_id").agg({"unit_id": "count", "market_rent": "mean"}).reset_index()
+            stats.columns = ["property_id", "units", "avg_rent"]
+            self.unit_stats = stats
+
+    @property
+    def empty(self) -> bool:
+        return self.props.empty and self.units.empty and self.listings.empty
+
+    def units_for(self, property_ids: List[str]) -> pd.DataFrame:
+        """Units belonging to any of `property_ids`, in their original order."""
+        parts = [self.units_by_property[pid] for pid in property_ids if pid in self.units_by_property]
+        if not parts:
+            return self.units.iloc[0:0]
+        return self.units.iloc[np.sort(np.concatenate(parts))]
+
+    def row_counts(self) -> Dict[str, int]:
+        return {attr: len(getattr(self, attr)) for attr in SNAPSHOT_DATASETS}
+
+
+class DataManager:
+    """
+    Holds the current DataSnapshot and swaps in new versions atomically.
+
+    - `load()` builds the first snapshot synchronously (called at startup).
+    - `reload()` rebuilds in a background thread; requests keep using the old
+      snapshot until the new one is fully built.
+    - `start_watching()` polls the source files' mtimes and triggers `reload()`.
+    """
+
+    def __init__(self, datasets: Optional[Dict[str, str]] = None):
+        self.datasets = datasets or SNAPSHOT_DATASETS
+        self._lock = threading.Lock()
+        self._snapshot = DataSnapshot(0, {})
+        self._reload_thread: Optional[threading.Thread] = None
+        self._watch_stop = threading.Event()
+        self._watch_thread: Optional[threading.Thread] = None
+        self._mtimes: Dict[str, float] = {}
+        self._listeners: List[Callable[[DataSnapshot], None]] = []
+        self.last_error: Optional[str] = None
+        self.last_build_seconds: Optional[float] = None
+
+    # --- Reading ---
+    def snapshot(self) -> DataSnapshot:
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        return self._snapshot.version
+
+    def on_swap(self, callback: Callable[[DataSnapshot], None]):
+        """Register a callback run (on the building thread) after each swap."""
+        self._listeners.append(callback)
+
+    # --- Building ---
+    def _source_mtimes(self) -> Dict[str, float]:
+        mtimes = {}
+        for name in self.datasets.values():
+            path = store.source_path(name)
+            mtimes[name] = os.path.getmtime(path) if os.path.exists(path) else 0.0
+        return mtimes
+
+    def _build(self) -> DataSnapshot:
+        start = time.perf_counter()
+        mtimes = self._source_mtimes()
+        frames = {attr: store.load_dataset(name) for attr, name in self.datasets.items()}
+        feature_version = self._load_features(frames)
+        snapshot = DataSnapshot(self._snapshot.version + 1, frames, feature_version)
+        self._mtimes = mtimes
+        self.last_build_seconds = round(time.perf_counter() - start, 3)
+        return snapshot
+
+    def _load_features(self, frames: Dict[str, pd.DataFrame]) -> Optional[str]:
+        """Add the materialized tenant feature table to `frames`; returns its version."""
+        inputs = feature_store.FEATURE_TABLES["tenant_features"]["inputs"]
+        if not set(inputs) <= set(self.datasets.values()):
+            return None
+        try:
+            frames["tenant_features"], version = feature_store.load_features("tenant_features", with_version=True)
+            return version
+        except Exception as e:
+            # Scorers fall back to joining the snapshot frames themselves
+            print(f"⚠️ Feature store unavailable, joining in memory: {e}")
+            return None
+
+    def _swap(self, snapshot: DataSnapshot):
+        with self._lock:
+            self._snapshot = snapshot
+        for callback in self._listeners:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                print(f"❌ Data swap listener failed: {e}")
+
+    def load(self) -> DataSnapshot:
+        """Build and install a snapshot synchronously."""
+        try:
+            self._swap(self._build())
+            self.last_error = None
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"❌ Failed Data Load: {e}")
+        return self._snapshot
+
+    def reload(self) -> bool:
+        """
+        Rebuild in the background. Returns False if a reload is already running.
+        """
+        with self._lock:
+            if self._reload_thread is not None and self._reload_thread.is_alive():
+                return False
+            self._reload_thread = threading.Thread(target=self._reload_worker, name="data-reload", daemon=True)
+            self._reload_thread.start()
+        return True
+
+    def _reload_worker(self):
+        try:
+            snapshot = self._build()
+        except Exception as e:
+            # Keep serving the previous snapshot
+            self.last_error = str(e)
+            print(f"❌ Data reload failed, keeping v{self.version}: {e}")
+            return
+        self._swap(snapshot)
+        self.last_error = None
+        print(f"🔄 Data reloaded: v{snapshot.version} ({self.last_build_seconds:.2f}s) {snapshot.row_counts()}")
+
+    # --- Watching ---
+    def start_watching(self, interval: float = 30.0):
+        """Poll source files every `interval` seconds and reload on change."""
+        if interval <= 0 or (self._watch_thread is not None and self._watch_thread.is_alive()):
+            return
+        self._watch_stop.clear()
+        self._watch_thread = threading.Thread(target=self._watch_loop, args=(interval,), name="data-watch", daemon=True)
+        self._watch_thread.start()
+
+    def stop_watching(self):
+        self._watch_stop.set()
+
+    def _watch_loop(self, interval: float):
+        while not self._watch_stop.wait(interval):
+            try:
+                if self._source_mtimes() != self._mtimes:
+                    print("👀 Data files changed, reloading...")
+                    self.reload()
+            except OSError as e:
+                print(f"❌ Data watch error: {e}")
+
+    def status(self) -> dict:
+        snap = self._snapshot
+        return {
+            "version": snap.version,
+            "loaded_at": snap.loaded_at,
+            "rows": snap.row_counts(),
+            "feature_version": snap.feature_version,
+            "reloading": self._reload_thread is not None and self._reload_thread.is_alive(),
+            "watching": self._watch_thread is not None and self._watch_thread.is_alive(),
+            "last_build_seconds": self.last_build_seconds,
+            "last_error": self.last_error,
+        }
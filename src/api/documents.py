@@ -0,0 +1,62 @@
+"""
+PDF helpers used by the API: lease text extraction and memo rendering.
+
+Kept free of FastAPI/app state so they can run inside executor worker
+processes (see src/api/executor.py) as well as in the API process.
+"""
+import io
+from datetime import datetime
+
+MAX_LEASE_CHARS = 10000
+
+
+def extract_pdf_text(pdf_bytes: bytes, max_chars: int = MAX_LEASE_CHARS) -> str:
+    """Concatenated text of every page, truncated to max_chars."""
+    import pypdf
+    pdf = pypdf.PdfReader(io.BytesIO(pdf_bytes))
+    return "".join([p.extract_text() for p in pdf.pages])[:max_chars]
+
+
+def render_memo_pdf(title: str, content: str) -> bytes:
+    """Render an investment memo (markdown-ish LLM output) to PDF bytes."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
+    styles = getSampleStyleSheet()
+
+    # Custom Styles
+    title_style = ParagraphStyle('Title', parent=styles['Heading1'], fontSize=24, spaceAfter=24, textColor='#4B0082') # Indigo
+    h2_style = ParagraphStyle('H2', parent=styles['Heading2'], fontSize=16, spaceBefore=18, spaceAfter=12, textColor='#333333')
+    body_style = ParagraphStyle('Body', parent=styles['Normal'], fontSize=11, leading=14, spaceAfter=10)
+
+    flowables = []
+
+    # Header
+    flowables.append(Paragraph("ASA REAL ESTATE INVESTMENTS", styles['Normal']))
+    flowables.append(Spacer(1, 12))
+    flowables.append(Paragraph(f"MEMO: {title}", title_style))
+    flowables.append(Paragraph(f"DATE: {datetime.now().strftime('%B %d, %Y')}", styles['Normal']))
+    flowables.append(Spacer(1, 24))
+
+    # Content Processing (Handle Markdown-ish text from LLM)
+    # Simple markdown to flowable converter for basic structure
+    for line in content.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith('###') or line.startswith('##') or line.startswith('**'):
+             clean_line = line.replace('#', '').replace('*', '').strip()
+             flowables.append(Paragraph(clean_line, h2_style))
+        elif line.startswith('- '):
+             flowables.append(Paragraph(f"• {line[2:]}", body_style))
+        else:
+             flowables.append(Paragraph(line, body_style))
+
+    doc.build(flowables)
+
+    pdf_bytes = buffer.getvalue()
+    buffer.close()
+    return pdf_bytes
@@ -0,0 +1,323 @@
+"""
+Process-pool executor for CPU-heavy API work.
+
+Model inference, PDF text extraction and memo rendering hold the GIL, so one
+heavy request on a worker starves every other request on it. `ProcessExecutor`
+runs them in a pool of pre-started worker processes instead:
+
+- Workers are spawned at startup and load the served models once (through their
+  own memory-mapped ModelCache), so the first task does not pay the load.
+- Tasks: `predict` (batched DataFrame -> array), `pdf_extract` and `render_memo`,
+  plus `warm`, which loads a newly swapped-in model version in every worker.
+- Arrays and byte payloads above EXECUTOR_SHM_MIN_BYTES travel through
+  `multiprocessing.shared_memory` instead of being pickled through the pipe.
+- `status()` reports worker health, queue depth and per-task latency; a broken
+  pool (e.g. a worker killed by the OOM killer) is restarted on the next call.
+
+With EXECUTOR_WORKERS=0 (or before `start()`) the same tasks run in the API process.
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import numpy as np
+
+DEFAULT_WORKERS = int(os.getenv("EXECUTOR_WORKERS", str(min(4, max(1, (os.cpu_count() or 2) - 1)))))
+START_METHOD = os.getenv("EXECUTOR_START_METHOD", "spawn")
+SHM_MIN_BYTES = int(os.getenv("EXECUTOR_SHM_MIN_BYTES", str(1024 * 1024)))
+
+
+# --- 1. SHARED-MEMORY TRANSFER ---
+class SharedPayload:
+    """
+    Handle to an array or bytes object parked in a shared memory block.
+    The receiving side calls `take()`, which copies the data out and unlinks the block.
+    """
+
+    def __init__(self, shm_name, kind, shape=None, dtype=None, size=0):
+        self.shm_name = shm_name
+        self.kind = kind
+        self.shape = shape
+        self.dtype = dtype
+        self.size = size
+
+    @classmethod
+    def put(cls, obj):
+        if isinstance(obj, np.ndarray):
+            data = np.ascontiguousarray(obj)
+            shm = shared_memory.SharedMemory(create=True, size=max(1, data.nbytes))
+            np.ndarray(data.shape, dtype=data.dtype, buffer=shm.buf)[...] = data
+            handle = cls(shm.name, "array", data.shape, data.dtype.str, data.nbytes)
+        else:
+            shm = shared_memory.SharedMemory(create=True, size=max(1, len(obj)))
+            shm.buf[:len(obj)] = obj
+            handle = cls(shm.name, "bytes", size=len(obj))
+        shm.close()
+        return handle
+
+    def take(self):
+        shm = shared_memory.SharedMemory(name=self.shm_name)
+        try:
+            if self.kind == "array":
+                return np.ndarray(self.shape, dtype=np.dtype(self.dtype), buffer=shm.buf).copy()
+            return bytes(shm.buf[:self.size])
+        finally:
+            shm.close()
+            shm.unlink()
+
+
+def pack(obj, min_bytes=SHM_MIN_BYTES):
+    """Move large arrays / byte strings to shared memory; leave everything else as is."""
+    if isinstance(obj, np.ndarray) and obj.dtype != object and obj.nbytes >= min_bytes:
+        return SharedPayload.put(obj)
+    if isinstance(obj, (bytes, bytearray)) and len(obj) >= min_bytes:
+        return SharedPayload.put(obj)
+    return obj
+
+
+def unpack(obj):
+    return obj.take() if isinstance(obj, SharedPayload) else obj
+
+
+# --- 2. WORKER SIDE ---
+def _init_worker(preload):
+    """Runs once per worker process: load the served models into the worker's cache."""
+    from src.models.cache import get_model_cache
+    cache = get_model_cache()
+    for name, version in preload:
+        try:
+            cache.get(name, version)
+        except Exception as e:
+            print(f"❌ Executor worker {os.getpid()} could not preload {name} v{version}: {e}")
+
+
+def _ping():
+    # Short sleep so concurrent pings land on different workers
+    time.sleep(0.05)
+    return os.getpid()
+
+
+def _task_predict(name, version, method, X):
+    from src.models.cache import get_model_cache
+    model = get_model_cache().get(name, version)
+    return pack(np.asarray(getattr(model, method)(unpack(X))))
+
+
+def _task_warm(name, version, method, X):
+    """Load (and score `X` with) a model version in this worker; returns the worker pid."""
+    if X is None:
+        from src.models.cache import get_model_cache
+        get_model_cache().get(name, version)
+    else:
+        _task_predict(name, version, method, X)
+    # Hold the worker briefly so the other warm tasks land on other workers (as in _ping)
+    time.sleep(0.05)
+    return os.getpid()
+
+
+def _task_pdf_extract(pdf_bytes, max_chars=None):
+    from src.api.documents import extract_pdf_text, MAX_LEASE_CHARS
+    return extract_pdf_text(unpack(pdf_bytes), max_chars or MAX_LEASE_CHARS)
+
+
+def _task_render_memo(title, content):
+    from src.api.documents import render_memo_pdf
+    return pack(render_memo_pdf(title, content))
+
+
+TASKS = {
+    "predict": _task_predict,
+    "warm": _task_warm,
+    "pdf_extract": _task_pdf_extract,
+    "render_memo": _task_render_memo,
+}
+
+
+# --- 3. API SIDE ---
+class TaskStats:
+    """Count and latency per task type."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.tasks = {}
+
+    def record(self, task, seconds, ok):
+        with self._lock:
+            entry = self.tasks.setdefault(task, {"completed": 0, "failed": 0, "total_ms": 0.0, "max_ms": 0.0})
+            entry["completed" if ok else "failed"] += 1
+            entry["total_ms"] += seconds * 1000
+            entry["max_ms"] = max(entry["max_ms"], seconds * 1000)
+
+    def summary(self):
+        with self._lock:
+            return {
+                task: {
+                    "completed": e["completed"],
+                    "failed": e["failed"],
+                    "mean_ms": round(e["total_ms"] / max(1, e["completed"] + e["failed"]), 3),
+                    "max_ms": round(e["max_ms"], 3),
+                }
+                for task, e in self.tasks.items()
+            }
+
+
+class ProcessExecutor:
+    """
+    Pre-started process pool for predict / pdf_extract / render_memo tasks.
+
+    Args:
+        workers: Number of worker processes (0 runs tasks on a thread in-process).
+        preload: (model name, version) pairs each worker loads at start-up.
+        start_method: multiprocessing start method; 'spawn' is safe with the
+            API's background threads, 'fork' starts faster on Linux.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, preload=None, start_method=START_METHOD):
+        self.workers = max(0, int(workers))
+        self.preload = list(preload or [])
+        self.start_method = start_method
+        self.stats = TaskStats()
+        self._pool = None
+        self._lock = threading.Lock()
+        # Serializes restarts, so callers that all saw the same broken pool replace it once
+        self._restart_lock = threading.Lock()
+        self._pending = 0
+        self.restarts = 0
+        self.started_at = None
+        self.worker_pids = []
+
+    @property
+    def enabled(self):
+        return self.workers > 0
+
+    @property
+    def running(self):
+        return self._pool is not None
+
+    # --- Lifecycle ---
+    def start(self):
+        """Spawn every worker now (and let it preload models) instead of on first use."""
+        if not self.enabled:
+            return
+        start = time.perf_counter()
+        try:
+            with self._lock:
+                if self._pool is not None:
+                    return
+                ctx = multiprocessing.get_context(self.start_method)
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=ctx,
+                                                 initializer=_init_worker, initargs=(self.preload,))
+                pool = self._pool
+            self.worker_pids = sorted(set(f.result() for f in [pool.submit(_ping) for _ in range(self.workers)]))
+        except Exception as e:
+            # Keep serving: tasks run in-process until the pool is restarted
+            print(f"❌ Executor pool failed to start, running tasks in-process: {e}")
+            self.shutdown()
+            return
+        self.started_at = time.time()
+        print(f"✅ Executor pool ready: {len(self.worker_pids)} workers ({self.start_method}) in {time.perf_counter() - start:.2f}s")
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def restart(self, broken=None):
+        """
+        Replace the pool. With `broken`, only if that pool is still the current one:
+        concurrent callers that hit the same broken pool restart it once, and none of
+        them shuts down the pool another caller has just started.
+        """
+        with self._restart_lock:
+            if broken is not None:
+                with self._lock:
+                    if self._pool is not broken:
+                        return
+            print("🔄 Restarting executor pool")
+            self.shutdown()
+            self.restarts += 1
+            self.start()
+
+    # --- Submission ---
+    def _execute(self, task, *args):
+        """Run a task on the pool (restarting a broken pool once) or in-process when no pool is up."""
+        with self._lock:
+            pool = self._pool
+        if pool is not None:
+            try:
+                return pool.submit(TASKS[task], *args).result()
+            except BrokenProcessPool:
+                # The pool died before or during the task; restart it and retry once
+                self.restart(broken=pool)
+            with self._lock:
+                pool = self._pool
+        if pool is None:
+            return TASKS[task](*args)
+        return pool.submit(TASKS[task], *args).result()
+
+    def call(self, task, *args):
+        """Run a task and block for its result (use from worker threads)."""
+        with self._lock:
+            self._pending += 1
+        start = time.perf_counter()
+        ok = False
+        try:
+            result = self._execute(task, *args)
+            ok = True
+            return unpack(result)
+        finally:
+            with self._lock:
+                self._pending -= 1
+            self.stats.record(task, time.perf_counter() - start, ok)
+
+    async def run(self, task, *args):
+        """Await a task from a request handler without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.call, task, *args)
+
+    # --- Task helpers ---
+    def predict(self, name, version, method, X):
+        return self.call("predict", name, version, method, X)
+
+    def warm(self, name, version, method, X=None):
+        """
+        Load `name` v`version` in the workers (one task per worker) before it serves.
+        Returns the pids reached; [] when no pool is running.
+        """
+        with self._lock:
+            pool = self._pool
+        if pool is None:
+            return []
+        futures = [pool.submit(_task_warm, name, version, method, X) for _ in range(self.workers)]
+        return sorted(set(f.result() for f in futures))
+
+    async def extract_pdf_text(self, pdf_bytes):
+        return await self.run("pdf_extract", pack(pdf_bytes))
+
+    async def render_memo(self, title, content):
+        return await self.run("render_memo", title, content)
+
+    # --- Health ---
+    def status(self):
+        with self._lock:
+            pool = self._pool
+            pending = self._pending
+        processes = dict(getattr(pool, "_processes", None) or {}) if pool is not None else {}
+        return {
+            "enabled": self.enabled,
+            "workers": self.workers,
+            "start_method": self.start_method,
+            "running": pool is not None,
+            "alive": sum(1 for p in processes.values() if p.is_alive()),
+            "pids": sorted(processes),
+            "queue_depth": pending,
+            "restarts": self.restarts,
+            "preload": [f"{name} v{version}" for name, version in self.preload],
+            "tasks": self.stats.summary(),
+        }
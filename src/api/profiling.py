@@ -0,0 +1,300 @@
+"""
+Opt-in request profiling.
+
+`ProfilingMiddleware` is a pure ASGI middleware. While profiling is disarmed
+(the default) it forwards every request untouched after one attribute check.
+Once armed (PROFILING=1 or `POST /admin/profiles/config`), it profiles:
+
+- requests sent with an `X-Profile: 1` header (or `X-Profile: cprofile`), and
+- a random `sample_rate` fraction of all other requests.
+
+Two capture modes:
+
+- `sample` (default): a background thread samples `sys._current_frames()` every
+  `interval_ms` and writes collapsed stacks (flamegraph.pl / speedscope format).
+  It sees sync endpoints running in the threadpool as well as the event loop.
+- `cprofile`: deterministic cProfile of the event-loop thread, saved as a
+  pstats `.prof` file (best for async endpoints such as /chat). The profiler
+  hooks the whole thread, so one cprofile capture runs at a time; requests that
+  ask for one meanwhile are served unprofiled.
+
+Each profile is stored in PROFILE_DIR with a JSON sidecar holding the route,
+status and timing; `ProfileStore` lists, reads and prunes them. Saving runs in
+the default thread pool, off the event loop.
+"""
+import asyncio
+import cProfile
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles"))
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "200"))
+
+# Leaf frames that mean "thread is parked", not doing request work
+_IDLE_MODULES = ("threading.py", "selectors.py", "queue.py", "base_events.py")
+_IDLE_FUNCTIONS = {"wait", "select", "poll", "get", "_worker", "_run_once"}
+
+
+def _write_text(path, text):
+    with open(path, "w") as f:
+        f.write(text)
+
+
+class StackSampler:
+    """Samples the stacks of every other thread at a fixed interval."""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def _collapse(frame):
+        parts = []
+        while frame is not None:
+            code = frame.f_code
+            parts.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+            frame = frame.f_back
+        return ";".join(reversed(parts))
+
+    @staticmethod
+    def _idle(frame):
+        code = frame.f_code
+        return code.co_name in _IDLE_FUNCTIONS and code.co_filename.endswith(_IDLE_MODULES)
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.samples += 1
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own or self._idle(frame):
+                    continue
+                self.stacks[self._collapse(frame)] += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def collapsed(self):
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfileStore:
+    """Profiles on disk: `<id>.collapsed` or `<id>.prof` plus `<id>.json` metadata."""
+
+    def __init__(self, directory=PROFILE_DIR, max_files=PROFILE_MAX_FILES):
+        self.directory = directory
+        self.max_files = max_files
+
+    @staticmethod
+    def _slug(route):
+        return re.sub(r"[^A-Za-z0-9]+", "-", route).strip("-") or "root"
+
+    def new_id(self, method, route):
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+        return f"{stamp}_{method.lower()}_{self._slug(route)}_{uuid.uuid4().hex[:6]}"
+
+    def save(self, profile_id, extension, write, meta):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{profile_id}{extension}")
+        write(path)
+        meta = dict(meta, id=profile_id, file=os.path.basename(path), bytes=os.path.getsize(path))
+        with open(os.path.join(self.directory, f"{profile_id}.json"), "w") as f:
+            json.dump(meta, f, indent=2)
+        self.prune()
+        return meta
+
+    def list(self):
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                try:
+                    with open(os.path.join(self.directory, name)) as f:
+                        entries.append(json.load(f))
+                except (OSError, ValueError):
+                    continue
+        return sorted(entries, key=lambda m: m.get("created_at", ""), reverse=True)
+
+    def path(self, profile_id):
+        """Artifact path for an id, or None (ids are validated against the listing)."""
+        for meta in self.list():
+            if meta["id"] == profile_id:
+                path = os.path.join(self.directory, meta["file"])
+                return path if os.path.exists(path) else None
+        return None
+
+    def prune(self):
+        for meta in self.list()[self.max_files:]:
+            for name in (meta.get("file"), f"{meta['id']}.json"):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except (OSError, TypeError):
+                    pass
+
+
+class Profiler:
+    """
+    Runtime switch shared by the middleware and the admin endpoints.
+
+    Args:
+        enabled: Arm profiling (header-triggered and sampled requests).
+        sample_rate: Fraction of requests profiled without the header (0..1).
+        mode: Default capture mode, 'sample' or 'cprofile'.
+        interval_ms: Stack sampling interval.
+    """
+
+    MODES = ("sample", "cprofile")
+
+    def __init__(self, enabled=False, sample_rate=0.0, mode="sample", interval_ms=5.0, store=None):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.mode = mode
+        self.interval_ms = interval_ms
+        self.store = store or ProfileStore()
+        self.captured = 0
+        # cProfile hooks the whole event-loop thread: only one capture at a time
+        self.cprofile_lock = threading.Lock()
+        self.skipped_busy = 0
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            enabled=os.getenv("PROFILING", "0") == "1",
+            sample_rate=float(os.getenv("PROFILE_SAMPLE_RATE", "0")),
+            mode=os.getenv("PROFILE_MODE", "sample"),
+            interval_ms=float(os.getenv("PROFILE_INTERVAL_MS", "5")),
+        )
+
+    def configure(self, enabled=None, sample_rate=None, mode=None, interval_ms=None):
+        if mode is not None and mode not in self.MODES:
+            raise ValueError(f"mode must be one of {self.MODES}")
+        if enabled is not None:
+            self.enabled = bool(enabled)
+        if sample_rate is not None:
+            self.sample_rate = max(0.0, min(1.0, float(sample_rate)))
+        if mode is not None:
+            self.mode = mode
+        if interval_ms is not None:
+            self.interval_ms = max(0.5, float(interval_ms))
+        return self.status()
+
+    def choose_mode(self, scope):
+        """Capture mode for this request, or None to skip it."""
+        for name, value in scope.get("headers", []):
+            if name == b"x-profile":
+                value = value.decode("latin-1").strip().lower()
+                if value in ("0", "false", "off", ""):
+                    return None
+                return value if value in self.MODES else self.mode
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return self.mode
+        return None
+
+    def status(self):
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "mode": self.mode,
+            "interval_ms": self.interval_ms,
+            "captured": self.captured,
+            "skipped_busy": self.skipped_busy,
+            "directory": self.store.directory,
+        }
+
+
+class ProfilingMiddleware:
+    """Profiles selected requests; a plain pass-through while profiling is disarmed."""
+
+    def __init__(self, app, profiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if not self.profiler.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        mode = self.profiler.choose_mode(scope)
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+        await self._profile(mode, scope, receive, send)
+
+    async def _profile(self, mode, scope, receive, send):
+        profiler = self.profiler
+        method = scope.get("method", "GET")
+        # Reserve the id up front so it can be returned in a response header
+        profile_id = profiler.store.new_id(method, scope.get("path", "/"))
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", profile_id.encode())]
+            await send(message)
+
+        sampler = StackSampler(profiler.interval_ms / 1000) if mode == "sample" else None
+        profile = None
+        if mode == "cprofile":
+            if not profiler.cprofile_lock.acquire(blocking=False):
+                profiler.skipped_busy += 1
+                await self.app(scope, receive, send)
+                return
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:  # 3.12+: another profiling tool is already active
+                profiler.cprofile_lock.release()
+                profiler.skipped_busy += 1
+                await self.app(scope, receive, send)
+                return
+        start = time.perf_counter()
+        if sampler is not None:
+            sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            if sampler is not None:
+                sampler.stop()
+            else:
+                profile.disable()
+                profiler.cprofile_lock.release()
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            meta = {
+                "route": route,
+                "path": scope.get("path"),
+                "method": method,
+                "status": status["code"],
+                "duration_ms": round(duration_ms, 3),
+                "mode": mode,
+                "created_at": datetime.utcnow().isoformat(timespec="milliseconds"),
+            }
+            if sampler is not None:
+                meta.update(samples=sampler.samples, interval_ms=profiler.interval_ms)
+                collapsed = sampler.collapsed()
+                save = (profile_id, ".collapsed", lambda path: _write_text(path, collapsed), meta)
+            else:
+                save = (profile_id, ".prof", profile.dump_stats, meta)
+            try:
+                # File writes and pruning block; keep them off the event loop
+                await asyncio.get_running_loop().run_in_executor(None, profiler.store.save, *save)
+                profiler.captured += 1
+            except OSError as e:
+                print(f"❌ Could not save profile {profile_id}: {e}")
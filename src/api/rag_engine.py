@@ -3,6 +3,8 @@ import os
 from typing import Dict, Any, List, Optional
 
 from src.api.agents import call_perplexity, MODEL_FAST, MODEL_SMART
+from src.data.store import load_dataset
+from src.api.metrics import RAG_CONTEXT_CHARS, record_scan
 
 # --- DATA PATHS ---
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -23,11 +25,14 @@ class RAGEngine:
         unit_df: pd.DataFrame, 
         tenant_data: List[Dict],
         listings_df: Optional[pd.DataFrame] = None,
-        calibrated_tenants_df: Optional[pd.DataFrame] = None
+        calibrated_tenants_df: Optional[pd.DataFrame] = None,
+        churn_summary: Optional[Dict] = None
     ):
         self.props = property_df
         self.units = unit_df
         self.tenants = pd.DataFrame(tenant_data) if tenant_data else pd.DataFrame()
+        # Portfolio-wide churn model breakdown (ChurnScores.summary) for the user's scope
+        self.churn_summary = churn_summary
         
         # Load additional data sources if not provided
         self.listings = listings_df if listings_df is not None else self._load_listings()
@@ -35,18 +40,16 @@ class RAGEngine:
         
     def _load_listings(self) -> pd.DataFrame:
         """Load real estate listings from scraper data."""
-        path = os.path.join(DATA_DIR, "scrapers", "real_listings.csv")
         try:
-            return pd.read_csv(path)
+            return load_dataset("listings")
         except Exception as e:
             print(f"[RAG] Could not load listings: {e}")
             return pd.DataFrame()
     
     def _load_calibrated_tenants(self) -> pd.DataFrame:
         """Load calibrated tenant data for deeper analysis."""
-        path = os.path.join(DATA_DIR, "synthetic", "calibrated_tenants.csv")
         try:
-            return pd.read_csv(path)
+            return load_dataset("tenants")
         except Exception as e:
             print(f"[RAG] Could not load calibrated tenants: {e}")
             return pd.DataFrame()
@@ -82,8 +85,10 @@ class RAGEngine:
         
         # 1. TENANT QUERIES
         if any(k in query_lower for k in ["tenant", "who", "occupant", "lease", "churn", "risk"]):
+            intent = "tenant"
             if not self.tenants.empty:
                 # Try name match first
+                record_scan("rag_tenants", self.tenants)
                 matches = []
                 for term in user_query.split():
                     if len(term) > 2 and term[0].isupper():
@@ -97,7 +102,10 @@ class RAGEngine:
                 else:
                     # Show high-risk tenants if asking about risk
                     if "risk" in query_lower or "churn" in query_lower:
-                        high_risk = self.tenants[self.tenants['riskLevel'] == 'High'].head(10)
+                        high_risk = self.tenants[self.tenants['riskLevel'] == 'High']
+                        if 'churnProbability' in high_risk.columns:
+                            high_risk = high_risk.sort_values('churnProbability', ascending=False)
+                        high_risk = high_risk.head(10)
                         if not high_risk.empty:
                             subset_context = f"High Risk Tenants:\n{high_risk.to_markdown(index=False)}"
                         else:
@@ -111,8 +119,10 @@ class RAGEngine:
 
         # 2. PROPERTY/UNIT QUERIES
         elif any(k in query_lower for k in ["property", "building", "unit", "portfolio", "noi", "occupancy"]):
+            intent = "property"
             if not self.props.empty:
                 # Try to filter by property name if mentioned
+                record_scan("rag_properties", self.props)
                 for term in user_query.split():
                     if len(term) > 3:
                          match = self.props[self.props['name'].str.contains(term, case=False, na=False)]
@@ -135,9 +145,11 @@ class RAGEngine:
         
         # 3. MARKET/LISTING QUERIES
         elif any(k in query_lower for k in ["listing", "market", "available", "for rent", "find", "search"]):
+            intent = "listing"
             if not self.listings.empty:
                 # Filter by location if mentioned
                 location_matches = self.listings.copy()
+                record_scan("rag_listings", self.listings)
                 for term in user_query.split():
                     if len(term) > 3:
                         m = self.listings[self.listings['location'].str.contains(term, case=False, na=False)]
@@ -151,13 +163,18 @@ class RAGEngine:
         
         # 4. ANALYTICS/STATS QUERIES
         elif any(k in query_lower for k in ["total", "count", "how many", "average", "sum", "stats", "overview"]):
+            intent = "stats"
             stats = []
             if not self.props.empty:
                 stats.append(f"Total Properties: {len(self.props)}")
             if not self.units.empty:
                 stats.append(f"Total Units: {len(self.units)}")
                 stats.append(f"Average Rent: ${self.units['market_rent'].mean():,.0f}")
-            if not self.tenants.empty:
+            if self.churn_summary and self.churn_summary.get("tenants"):
+                stats.append(f"Active Tenants: {self.churn_summary['tenants']}")
+                stats.append(f"Risk Breakdown (churn model): {self.churn_summary['by_risk']}")
+                stats.append(f"Average Churn Probability: {self.churn_summary['mean_probability']:.1%}")
+            elif not self.tenants.empty:
                 stats.append(f"Active Tenants: {len(self.tenants)}")
                 by_risk = self.tenants['riskLevel'].value_counts().to_dict()
                 stats.append(f"Risk Breakdown: {by_risk}")
@@ -169,10 +186,13 @@ class RAGEngine:
         
         # 5. FALLBACK - General context
         else:
+            intent = "fallback"
             subset_context = f"Available Data Schema:\n{self._get_schema_summary()}"
             if not self.props.empty:
                 subset_context += f"\n\nSample Properties:\n{self.props.head(5).to_markdown(index=False)}"
 
+        RAG_CONTEXT_CHARS.observe(len(subset_context), intent=intent)
+
         # --- SYNTHESIS ---
         prompt = f"""
         You are an AI Data Analyst for ASA Real Estate Portfolio Management.
@@ -1,16 +1,18 @@
+import time
+_IMPORT_START = time.perf_counter()
+
 from fastapi import FastAPI, HTTPException, Response, UploadFile, File, Form, Depends, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, FileResponse
 from pydantic import BaseModel
+from contextlib import asynccontextmanager
 import pandas as pd
-import joblib
 import os
 import sys
 sys.stdout.reconfigure(encoding='utf-8')
-import requests
-import pypdf
-import io
 import json
+import threading
 import sqlite3
 import bcrypt
 import jwt
@@ -18,14 +20,9 @@ from datetime import datetime, timedelta
 from typing import TypedDict, List, Dict, Annotated, Optional
 from dotenv import load_dotenv
 
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-
-# --- LANGGRAPH IMPORTS ---
-from langgraph.graph import StateGraph, END
+# NOTE: reportlab, pypdf, langgraph and joblib are imported on first use
+# (see src/api/documents.py, get_report_graph, load_models_local)
+# so that importing this module stays cheap for workers and tests.
 
 # --- AGENT IMPORTS ---
 try:
@@ -37,8 +34,16 @@ try:
         chief_editor, 
         risk_agent, 
         lease_agent,
-        listing_analyst_agent
+        listing_analyst_agent,
+        call_perplexity,
+        MODEL_FAST, MODEL_SMART
     )
+    from src.api.rag_engine import RAGEngine
+    from src.api.data_manager import DataManager
+    from src.models.batching import MicroBatcher
+    from src.api.executor import ProcessExecutor
+    from src.api.metrics import REGISTRY, CONTENT_TYPE, MetricsMiddleware, MODEL_PREDICT_LATENCY, MODEL_PREDICT_ROWS, record_scan
+    from src.api.profiling import Profiler, ProfilingMiddleware
 except ImportError:
     # Fallback for running directly from folder
     sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
@@ -50,17 +55,54 @@ except ImportError:
         chief_editor, 
         risk_agent, 
         lease_agent,
-        lease_agent,
         listing_analyst_agent,
         call_perplexity,
         MODEL_FAST, MODEL_SMART
     )
     from src.api.rag_engine import RAGEngine
+    from src.api.data_manager import DataManager
+    from src.models.batching import MicroBatcher
+    from src.api.executor import ProcessExecutor
+    from src.api.metrics import REGISTRY, CONTENT_TYPE, MetricsMiddleware, MODEL_PREDICT_LATENCY, MODEL_PREDICT_ROWS, record_scan
+    from src.api.profiling import Profiler, ProfilingMiddleware
 
 load_dotenv()
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-app = FastAPI(title="ASA Real Estate Engines")
+# --- 0. STARTUP ---
+# Seconds spent per startup stage, reported by /ready and logged once on boot.
+STARTUP_TIMINGS: Dict[str, float] = {"imports": round(time.perf_counter() - _IMPORT_START, 3)}
+
+def _timed_stage(stage, fn):
+    start = time.perf_counter()
+    try:
+        return fn()
+    finally:
+        STARTUP_TIMINGS[stage] = round(time.perf_counter() - start, 3)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Loads models and data once the worker is up instead of at import time.
+    """
+    boot_start = time.perf_counter()
+    _timed_stage("models", load_models_local)
+    _timed_stage("data", load_data_local)
+    _timed_stage("derived", build_derived_state)
+    _timed_stage("executor", start_executor)
+    STARTUP_TIMINGS["total"] = round(time.perf_counter() - boot_start, 3)
+    breakdown = ", ".join(f"{stage}={secs:.2f}s" for stage, secs in STARTUP_TIMINGS.items())
+    print(f"⏱️ Startup breakdown: {breakdown}")
+    DATA.start_watching(DATA_WATCH_SECONDS)
+    if MODEL_WATCHER is not None:
+        MODEL_WATCHER.start()
+    yield
+    DATA.stop_watching()
+    if MODEL_WATCHER is not None:
+        MODEL_WATCHER.stop()
+    EXECUTOR.shutdown()
+
+app = FastAPI(title="ASA Real Estate Engines", lifespan=lifespan)
 
 # CORS Setup
 app.add_middleware(
@@ -70,6 +112,13 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Per-route request counts/latency for GET /metrics (src/api/metrics.py)
+app.add_middleware(MetricsMiddleware)
+# Opt-in request profiling (src/api/profiling.py): disarmed unless PROFILING=1 or
+# toggled via POST /admin/profiles/config; then profiles requests sent with
+# `X-Profile: 1` plus a PROFILE_SAMPLE_RATE fraction of the rest.
+PROFILER = Profiler.from_env()
+app.add_middleware(ProfilingMiddleware, profiler=PROFILER)
 
 # --- AUTH CONFIG ---
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-for-dev-only")
@@ -130,30 +179,204 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
         print(f"AUTH FAIL: JWT Error {e}")
         raise credentials_exception
 
+async def require_admin(current_user: UserData = Depends(get_current_user)):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return current_user
+
 # --- 1. LOAD ML MODELS ---
+# Models are resolved through registry aliases and served from the shared,
+# memory-mapped LRU in src/models/cache.py (joblib is only imported there).
+# Each MODELS entry is a ModelSlot (src/models/serving.py) that a background
+# watcher hot-swaps when the alias moves, e.g.:
+#   python -m src.models.registry set-alias rent_valuation_model production 5
 MODELS = {}
-def load_models_local():
-    base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    val_path = os.path.join(base_path, "models", "rent_valuation_model", "v4", "model.pkl")
-    churn_path = os.path.join(base_path, "models", "churn", "churn_risk_model_v2.pkl")
-    try: MODELS['valuation'] = joblib.load(val_path); print(f"✅ Loaded Valuation")
-    except Exception as e: print(f"❌ Failed Valuation Load: {e}")
-    try: MODELS['churn'] = joblib.load(churn_path); print(f"✅ Loaded Churn")
-    except Exception as e: print(f"❌ Failed Churn Load: {e}")
+# MODELS key -> registry name, env var that pins a version, warm-up row
+MODEL_SPECS = {
+    'valuation': {
+        'name': 'rent_valuation_model',
+        'version_env': 'VALUATION_MODEL_VERSION',
+        'warmup': {'neighborhood': 'Tribeca', 'class': 'A', 'type': '1BD', 'sqft': 850},
+    },
+    'churn': {
+        'name': 'churn_risk_model',
+        'version_env': 'CHURN_MODEL_VERSION',
+        'warmup': {'income': 90000, 'credit_score': 700, 'market_rent': 3200, 'sqft': 800,
+                   'type': '1BD', 'class': 'B', 'neighborhood': 'Harlem', 'rent_burden': 0.43},
+    },
+}
+MODEL_ALIAS = os.getenv("MODEL_ALIAS", "production")
+MODEL_WATCH_SECONDS = float(os.getenv("MODEL_WATCH_SECONDS", "15"))
+# Shadow mode: score SHADOW_PERCENT% of calls with the SHADOW_ALIAS version too
+SHADOW_ALIAS = os.getenv("SHADOW_ALIAS", "canary")
+SHADOW_PERCENT = float(os.getenv("SHADOW_PERCENT", "0"))
+MODEL_WATCHER = None
+
+def _record_predict(slot, version, method, rows, seconds):
+    MODEL_PREDICT_LATENCY.observe(seconds, model=slot.name, version=version, method=method)
+    MODEL_PREDICT_ROWS.inc(rows, model=slot.name, method=method)
 
-load_models_local()
+def load_models_local():
+    global MODEL_WATCHER
+    from src.models.cache import get_model_cache
+    from src.models.serving import ModelSlot, ModelWatcher
+    # Read-only: models are registered with the training scripts or
+    # `python -m src.models.registry register`, never on startup
+    cache = get_model_cache()
+    slots = []
+    for key, spec in MODEL_SPECS.items():
+        pinned = os.getenv(spec['version_env'])
+        slot = ModelSlot(spec['name'], alias=MODEL_ALIAS, pinned_version=int(pinned) if pinned else None,
+                         warmup_rows=[spec['warmup']], cache=cache, executor=EXECUTOR)
+        slots.append(slot)
+        if slot.refresh():
+            MODELS[key] = slot
+            print(f"✅ Loaded {key.title()} ({spec['name']} v{slot.version})")
+        else:
+            print(f"❌ Failed {key.title()} Load: {slot.last_error}")
+        if SHADOW_PERCENT > 0:
+            slot.configure_shadow(SHADOW_ALIAS, SHADOW_PERCENT)
+        slot.on_score(_record_predict)
+        # Added after the first load: at startup build_derived_state builds the
+        # lookup table and churn scores once, after the data is loaded too
+        if key == 'valuation':
+            slot.on_swap(rebuild_valuation_table)
+        elif key == 'churn':
+            slot.on_swap(lambda slot, version, model: rescore_portfolio())
+    MODEL_WATCHER = ModelWatcher(slots, interval=MODEL_WATCH_SECONDS)
+
+# Process pool for CPU-heavy work (src/api/executor.py): model predictions,
+# lease PDF extraction and memo rendering run in EXECUTOR_WORKERS pre-started
+# worker processes so they do not hold this process's GIL (0 = in-process).
+EXECUTOR = ProcessExecutor(preload=[])
+
+def start_executor():
+    EXECUTOR.preload = [(slot.name, slot.version) for slot in MODELS.values() if slot.loaded]
+    EXECUTOR.start()
+
+# Rent estimator grid (src/models/lookup.py): the valuation model tabulated over
+# neighborhood x class x type x sqft. Rebuilt when the valuation slot swaps
+# versions or a data reload brings new neighborhoods; set VALUATION_TABLE=0 to
+# always score with the live model.
+VALUATION_TABLE = None
+VALUATION_TABLE_ENABLED = os.getenv("VALUATION_TABLE", "1") != "0"
+_VALUATION_TABLE_LOCK = threading.Lock()
+
+def _valuation_grid_neighborhoods(snap):
+    names = set(snap.props['neighborhood'].dropna().astype(str)) if not snap.props.empty else set()
+    # Plus the neighborhoods the API scores with by default (PropertyFeatures, /listings)
+    return sorted(names | {'Tribeca', 'Northside'})
+
+def rebuild_valuation_table(slot=None, version=None, model=None):
+    """Build (or load from disk) the lookup table for the served valuation version."""
+    global VALUATION_TABLE
+    slot = slot or MODELS.get('valuation')
+    if not VALUATION_TABLE_ENABLED or slot is None or not slot.loaded:
+        return
+    if model is None:
+        version, model = slot.version, slot.model
+    neighborhoods = _valuation_grid_neighborhoods(DATA.snapshot())
+    with _VALUATION_TABLE_LOCK:
+        current = VALUATION_TABLE
+        if current is not None and current.version == version and current.covers(neighborhoods):
+            return
+        try:
+            from src.models.lookup import load_or_build
+            VALUATION_TABLE = load_or_build(model, slot.cache.registry, slot.name, version, neighborhoods)
+            print(f"✅ Rent lookup table ready for v{version} ({VALUATION_TABLE.size:,} cells)")
+        except Exception as e:
+            print(f"❌ Rent lookup table build failed: {e}")
+
+# Portfolio churn scores (src/models/churn_scoring.py): every calibrated tenant
+# scored in one predict_proba batch whenever the data snapshot or the churn
+# model version changes. /tenants, /chat (RAG) and /analytics/data read these.
+CHURN_SCORES = None
+_CHURN_SCORES_LOCK = threading.Lock()
+
+def rescore_portfolio(snap=None):
+    """Re-score all tenants unless the current scores match the data and model versions."""
+    global CHURN_SCORES
+    slot = MODELS.get('churn')
+    if slot is None or not slot.loaded:
+        return
+    snap = snap or DATA.snapshot()
+    if snap.tenants.empty:
+        return
+    with _CHURN_SCORES_LOCK:
+        current = CHURN_SCORES
+        if current is not None and current.model_version == slot.version and current.data_version == snap.version:
+            return
+        try:
+            from src.models.churn_scoring import score_portfolio
+            CHURN_SCORES = score_portfolio(slot.model, snap.tenants, snap.units, snap.props,
+                                           model_version=slot.version, data_version=snap.version,
+                                           features=snap.tenant_features)
+            print(f"✅ Scored {len(CHURN_SCORES)} tenants for churn (model v{slot.version}, data v{snap.version}) in {CHURN_SCORES.score_seconds:.2f}s")
+        except Exception as e:
+            print(f"❌ Portfolio churn scoring failed: {e}")
+
+VALUATION_TABLE_LOOKUPS = REGISTRY.counter("valuation_table_lookups_total", "Rent estimates by lookup table result", ["result"])
+
+def _lookup_rent(neighborhood, p_class, u_type, sqft):
+    table = VALUATION_TABLE
+    val = None
+    if table is not None and table.version == MODELS['valuation'].version:
+        val = table.lookup(neighborhood, p_class, u_type, sqft)
+    VALUATION_TABLE_LOOKUPS.inc(result="hit" if val is not None else "miss")
+    return val
+
+def estimate_rent(neighborhood, p_class, u_type, sqft):
+    """Valuation for one unit: O(1) from the lookup table, live model when out of grid."""
+    val = _lookup_rent(neighborhood, p_class, u_type, sqft)
+    if val is not None:
+        return val
+    df = pd.DataFrame([{'neighborhood': neighborhood, 'class': p_class, 'type': u_type, 'sqft': sqft}])
+    return MODELS['valuation'].predict(df)[0]
+
+async def estimate_rent_async(neighborhood, p_class, u_type, sqft):
+    """Same as estimate_rent, but out-of-grid inputs go through the micro-batcher."""
+    val = _lookup_rent(neighborhood, p_class, u_type, sqft)
+    if val is not None:
+        return val
+    return await BATCHERS['valuation'].submit({'neighborhood': neighborhood, 'class': p_class, 'type': u_type, 'sqft': sqft})
+
+# Micro-batching (src/models/batching.py): concurrent single-row /predict calls
+# are queued for up to BATCH_MAX_WAIT_MS and scored together (at most
+# BATCH_MAX_SIZE rows per call) in a worker thread.
+BATCHERS = {
+    'valuation': MicroBatcher('valuation', lambda df: MODELS['valuation'].predict(df)),
+    'churn': MicroBatcher('churn', lambda df: MODELS['churn'].predict_proba(df)),
+}
 
 # --- 2. DATA LOADING ---
-try:
-    BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    props_df = pd.read_csv(os.path.join(BASE_DIR, "data", "synthetic", "calibrated_properties.csv"))
-    units_df = pd.read_csv(os.path.join(BASE_DIR, "data", "synthetic", "calibrated_units.csv"))
-    real_listings_path = os.path.join(BASE_DIR, "data", "scrapers", "real_listings.csv")
-    real_listings_df = pd.read_csv(real_listings_path)
-    print(f"✅ Loaded {len(real_listings_df)} listings")
-except Exception as e:
-    print(f"❌ Failed Data Load: {e}")
-    props_df, units_df, real_listings_df = pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Versioned snapshots of the typed datasets (see src/api/data_manager.py).
+# Routes take one snapshot per request; reloads swap in a new one atomically.
+DATA = DataManager()
+DATA_WATCH_SECONDS = float(os.getenv("DATA_WATCH_SECONDS", "30"))
+
+# Set by build_derived_state at the end of startup; until then data swaps
+# leave the lookup table and churn scores to it
+DERIVED_READY = threading.Event()
+
+def _on_data_swap(snap):
+    if not DERIVED_READY.is_set():
+        return
+    rebuild_valuation_table()
+    rescore_portfolio(snap)
+
+DATA.on_swap(_on_data_swap)
+
+def build_derived_state():
+    """Build the rent lookup table and portfolio churn scores once models and data are both loaded."""
+    rebuild_valuation_table()
+    rescore_portfolio()
+    DERIVED_READY.set()
+
+def load_data_local():
+    snap = DATA.load()
+    if snap.version:
+        print(f"✅ Loaded {len(snap.listings)} listings (data v{snap.version})")
 
 # --- 3. SCHEMAS ---
 class PropertyFeatures(BaseModel):
@@ -173,12 +396,15 @@ class TenantFeatures(BaseModel):
     property_class: str = "B"
     neighborhood: str = "Harlem"
     
-    def to_df(self):
+    def to_row(self):
         d = self.dict()
         d['rent_burden'] = d['market_rent'] / (d['income']/12) if d['income'] else 0
         d['type'] = d.pop('unit_type')
         d['class'] = d.pop('property_class')
-        return pd.DataFrame([d])
+        return d
+
+    def to_df(self):
+        return pd.DataFrame([self.to_row()])
 
 class AnalyzeRequest(BaseModel):
     query: str
@@ -192,11 +418,42 @@ class ChatRequest(BaseModel):
     message: str
     history: Optional[List[Dict[str, str]]] = []
 
+class ProfilingConfig(BaseModel):
+    enabled: Optional[bool] = None
+    sample_rate: Optional[float] = None
+    mode: Optional[str] = None
+    interval_ms: Optional[float] = None
+
 # --- 4. CORE ROUTES ---
 
 @app.get("/")
 def health_check(): return {"status": "ASA Neural Core Online"}
 
+@app.get("/ready")
+def readiness_check():
+    """
+    Readiness probe: reports which models/datasets are loaded and the startup breakdown.
+    Uvicorn serves requests only after the lifespan startup, so this is 503 only
+    when the app runs without it (e.g. `--lifespan off`).
+    """
+    ready = "total" in STARTUP_TIMINGS
+    snap = DATA.snapshot()
+    payload = {
+        "ready": ready,
+        "models": {key: {"loaded": key in MODELS, "version": MODELS[key].version if key in MODELS else None} for key in MODEL_SPECS},
+        "data": {
+            "loaded": snap.version > 0,
+            "version": snap.version,
+            "properties": len(snap.props),
+            "units": len(snap.units),
+            "listings": len(snap.listings)
+        },
+        "executor": {"running": EXECUTOR.running, "workers": EXECUTOR.workers},
+        "agent_graph_compiled": _REPORT_GRAPH is not None,
+        "startup_seconds": STARTUP_TIMINGS
+    }
+    return JSONResponse(content=payload, status_code=200 if ready else 503)
+
 @app.post("/token", response_model=Token)
 async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
     conn = get_db_connection()
@@ -243,7 +500,7 @@ async def read_users_me(current_user: UserData = Depends(get_current_user)):
     return current_user
 
 @app.post("/predict/rent")
-def predict_rent(features: PropertyFeatures):
+async def predict_rent(features: PropertyFeatures):
     """
     Endpoint for Dashboard Rent Estimator Widget
     """
@@ -256,14 +513,7 @@ def predict_rent(features: PropertyFeatures):
             p_class = "A" if "A" in features.property_class else ("B" if "B" in features.property_class else "C")
             u_type = "1BD" if "1" in features.unit_type else ("2BD" if "2" in features.unit_type else "Studio")
             
-            df = pd.DataFrame([{
-                'neighborhood': features.neighborhood,
-                'class': p_class, 
-                'type': u_type,
-                'sqft': features.sqft
-            }])
-            
-            val = int(MODELS['valuation'].predict(df)[0])
+            val = int(await estimate_rent_async(features.neighborhood, p_class, u_type, features.sqft))
         except Exception as e:
             print(f"Rent Pred Model Error: {e}")
             # Fallback based on logic if model crashes
@@ -285,7 +535,7 @@ def predict_rent(features: PropertyFeatures):
     }
 
 @app.post("/predict/churn")
-def predict_churn(features: TenantFeatures):
+async def predict_churn(features: TenantFeatures):
     """
     Endpoint for Dashboard Churn Riskometer
     """
@@ -293,9 +543,8 @@ def predict_churn(features: TenantFeatures):
         return {"churn_probability": 0.45, "risk_level": "Medium"}
         
     try:
-        df = features.to_df()
-        # Churn model usage
-        pred_prob = MODELS['churn'].predict_proba(df)[0][1]
+        # Churn model usage (batched with concurrent requests)
+        pred_prob = (await BATCHERS['churn'].submit(features.to_row()))[1]
         return {"churn_probability": float(pred_prob), "risk_level": "High" if pred_prob > 0.5 else "Low"}
     except Exception as e:
         print(f"Churn Pred Error: {e}")
@@ -309,9 +558,10 @@ def predict_churn(features: TenantFeatures):
 @app.get("/listings")
 def get_listings(query: str = None):
     # Same as before...
-    df = real_listings_df.copy()
+    df = DATA.snapshot().listings.copy()
     if df.empty: return {"error": "No data available in system"}
     if query:
+        record_scan("listings", df)
         q = query.lower()
         if '1' in q: df = df[df['beds'].astype(str).str.contains('1')]
         elif '2' in q: df = df[df['beds'].astype(str).str.contains('2')]
@@ -332,8 +582,7 @@ def get_listings(query: str = None):
             ai_val = price
             if 'valuation' in MODELS:
                 try:
-                    input_df = pd.DataFrame([{'neighborhood': 'Northside', 'class': 'B', 'type': '1BD', 'sqft': sqft}])
-                    ai_val = int(MODELS['valuation'].predict(input_df)[0])
+                    ai_val = int(estimate_rent('Northside', 'B', '1BD', sqft))
                 except: ai_val = price 
             delta = ai_val - price
             verdict = "Undervalued" if delta > 150 else ("Overvalued" if delta < -150 else "Fair")
@@ -345,22 +594,32 @@ def get_listings(query: str = None):
     return results
 
 # --- 5. AGENT GRAPH ---
-workflow = StateGraph(AgentState)
-workflow.add_node("macro", macro_agent)
-workflow.add_node("market", market_agent)
-workflow.add_node("legal", legal_agent)
-workflow.add_node("editor", chief_editor)
-workflow.set_entry_point("macro") 
-workflow.add_edge("macro", "market")
-workflow.add_edge("market", "legal")
-workflow.add_edge("legal", "editor")
-workflow.add_edge("editor", END)
-app_graph = workflow.compile()
+_REPORT_GRAPH = None
+
+def get_report_graph():
+    """Compiles the deep-research graph on first use (langgraph is slow to import)."""
+    global _REPORT_GRAPH
+    if _REPORT_GRAPH is None:
+        from langgraph.graph import StateGraph, END
+        start = time.perf_counter()
+        workflow = StateGraph(AgentState)
+        workflow.add_node("macro", macro_agent)
+        workflow.add_node("market", market_agent)
+        workflow.add_node("legal", legal_agent)
+        workflow.add_node("editor", chief_editor)
+        workflow.set_entry_point("macro") 
+        workflow.add_edge("macro", "market")
+        workflow.add_edge("market", "legal")
+        workflow.add_edge("legal", "editor")
+        workflow.add_edge("editor", END)
+        _REPORT_GRAPH = workflow.compile()
+        STARTUP_TIMINGS["agent_graph"] = round(time.perf_counter() - start, 3)
+    return _REPORT_GRAPH
 
 @app.post("/analytics/report")
 def run_deep_report():
     print("🚀 Starting Deep Research Graph...")
-    result = app_graph.invoke({"objective": "Write Q1 2026 Report", "location": "NYC", "year": "2026"})
+    result = get_report_graph().invoke({"objective": "Write Q1 2026 Report", "location": "NYC", "year": "2026"})
     return {"report": result['final_report']}
 
 # --- 6. SCENARIO ---
@@ -377,7 +636,8 @@ def run_scenario(req: ScenarioRequest):
 @app.get("/analytics/data")
 def get_analytics_data(current_user: UserData = Depends(get_current_user)):
     # 1. Determine Scope
-    target_df = props_df.copy()
+    target_df = DATA.snapshot().props.copy()
+    record_scan("properties", target_df)
     if current_user.property_id and current_user.property_id != "ALL":
          target_df = target_df[target_df['property_id'] == current_user.property_id]
     
@@ -390,10 +650,14 @@ def get_analytics_data(current_user: UserData = Depends(get_current_user)):
     # Occupancy (Mocked but based on subset avg)
     avg_occ = 94
     if not target_df.empty and 'occupancy' in target_df.columns:
-        # If we had real occupancy in props_df, use it. currently it's synthetic.
+        # If we had real occupancy in the properties table, use it. currently it's synthetic.
         pass
 
+    scores = CHURN_SCORES
+    churn_risk = scores.summary(target_df['property_id'].tolist()) if scores is not None else None
+
     return {
+        "churn_risk": churn_risk,
         "rent_growth": [
             {"year": "2023", "portfolio": base_growth, "market": 1.8}, 
             {"year": "2024", "portfolio": base_growth + 0.7, "market": 2.1}, 
@@ -411,14 +675,16 @@ def get_analytics_data(current_user: UserData = Depends(get_current_user)):
 # --- 7. UTILS ---
 @app.get("/properties") 
 def get_props(models_only: bool = False, current_user: UserData = Depends(get_current_user)): 
+    snap = DATA.snapshot()
     # If DB load failed
-    if props_df.empty: 
+    if snap.props.empty: 
         return [{"id": "P1", "name": "Rodriguez Towers (Mock)", "neighborhood": "Harlem", "class": "B", "units": 65, "occupancy": 94, "noi": 1200000, "avg_rent": 3800}]
     
     try:
         # FILTER DATA BASED ON ROLE
         print(f"DEBUG: User={current_user.username}, Role={current_user.role}, PID={current_user.property_id}")
-        target_df = props_df.copy()
+        target_df = snap.props.copy()
+        record_scan("properties", target_df)
         
         # Explicit check for specific property access
         if current_user.property_id and current_user.property_id != "ALL":
@@ -426,10 +692,8 @@ def get_props(models_only: bool = False, current_user: UserData = Depends(get_cu
              target_df = target_df[target_df['property_id'] == current_user.property_id]
              print(f"DEBUG: Filtered to {len(target_df)} properties for {current_user.property_id}")
 
-        if not units_df.empty:
-            stats = units_df.groupby('property_id').agg({'unit_id': 'count', 'market_rent': 'mean'}).reset_index()
-            stats.columns = ['property_id', 'units', 'avg_rent']
-            merged = pd.merge(target_df, stats, on='property_id', how='left')
+        if not snap.units.empty:
+            merged = pd.merge(target_df, snap.unit_stats, on='property_id', how='left')
             merged['units'] = merged['units'].fillna(0).astype(int)
             merged['avg_rent'] = merged['avg_rent'].fillna(0).astype(int)
         else:
@@ -446,43 +710,56 @@ def get_props(models_only: bool = False, current_user: UserData = Depends(get_cu
         # Return empty list on error so map doesn't crash frontend
         return []
 
-# Helper for generating mock tenants (Refactored for reuse in RAG)
-def generate_mock_tenants(units_subset):
+# Helper for generating tenant rows (Refactored for reuse in RAG)
+def generate_mock_tenants(units_subset, scores=None):
     tenants = []
     if units_subset.empty: return []
+    scores = scores if scores is not None else CHURN_SCORES
+    # Calibrated tenants scored by the churn model, keyed by unit_id
+    scored = scores.for_units(units_subset['unit_id'].astype(str)) if scores is not None else None
     
     for _, unit in units_subset.iterrows():
-         # Deterministic mock data based on unit ID
          seed = sum(ord(c) for c in str(unit['unit_id']))
-         names = ["Lori Perez", "Kathryn Jimenez", "Shawn Johnson", "James Ortiz", "Michael Smith", "Sarah Wilson", "David Brown", "Emily Davis"]
-         name = names[seed % len(names)]
-         
-         risk_val = (seed % 100) / 100.0
-         if risk_val > 0.8: risk = "High"
-         elif risk_val > 0.5: risk = "Medium" 
-         else: risk = "Low"
-         
          sentiment_opts = ["Happy", "Neutral", "Unhappy"]
          sentiment = sentiment_opts[seed % 3]
 
+         if scored is not None and str(unit['unit_id']) in scored.index:
+             tenant = scored.loc[str(unit['unit_id'])]
+             name, income, credit = str(tenant['name']), int(tenant['income']), int(tenant['credit_score'])
+             risk, reason = str(tenant['risk_level']), str(tenant['risk_reason'])
+             probability = round(float(tenant['churn_probability']), 4)
+         else:
+             # Unscored unit: deterministic mock data based on unit ID
+             names = ["Lori Perez", "Kathryn Jimenez", "Shawn Johnson", "James Ortiz", "Michael Smith", "Sarah Wilson", "David Brown", "Emily Davis"]
+             name = names[seed % len(names)]
+             income, credit = int(unit['market_rent'] * 3.2), 600 + (seed % 250)
+             risk_val = (seed % 100) / 100.0
+             if risk_val > 0.8: risk = "High"
+             elif risk_val > 0.5: risk = "Medium" 
+             else: risk = "Low"
+             reason = "Stable Financials" if risk == "Low" else ("Late Payment History" if risk == "Medium" else " lease violation and noise complaints")
+             probability = None
+
          tenants.append({
              "id": str(unit['unit_id']),
              "name": name,
              "unit": f"{unit['property_id']}_{unit['unit_id']}",
              "rent": int(unit['market_rent']),
-             "income": int(unit['market_rent'] * 3.2),
-             "credit": 600 + (seed % 250),
+             "income": income,
+             "credit": credit,
              "leaseEnd": "2026-06-30",
              "riskLevel": risk,
-             "riskReason": "Stable Financials" if risk == "Low" else ("Late Payment History" if risk == "Medium" else " lease violation and noise complaints"),
+             "churnProbability": probability,
+             "riskReason": reason,
              "sentiment": sentiment
          })
     return tenants
 
 @app.get("/properties/{id}/yield")
 def get_yield(id: str):
-    if units_df.empty: return {"opportunities": []}
-    prop_units = units_df[units_df['property_id'] == id].copy()
+    snap = DATA.snapshot()
+    if snap.units.empty: return {"opportunities": []}
+    prop_units = snap.units_for([id])
     if prop_units.empty: return {"opportunities": []}
     opportunities = []
     for _, unit in prop_units.head(100).iterrows():
@@ -500,8 +777,7 @@ def get_yield(id: str):
 
 @app.post("/legal/analyze")
 async def analyze_legal(file: UploadFile = File(...), query: str = Form(...)):
-    pdf = pypdf.PdfReader(file.file)
-    text = "".join([p.extract_text() for p in pdf.pages])[:10000]
+    text = await EXECUTOR.extract_pdf_text(await file.read())
     result = lease_agent({"document_text": text, "user_query": query})
     return {"result": result.get("lease_analysis", "Analysis Failed")}
 
@@ -512,15 +788,17 @@ def get_tenants(current_user: UserData = Depends(get_current_user)):
     # Mock tenant data generation based on accessible units
     tenants = []
     
+    snap = DATA.snapshot()
+
     # 1. Determine which properties this user can see
     visible_props = []
     if not current_user.property_id or current_user.property_id == "ALL":
-        visible_props = props_df['property_id'].unique().tolist()
+        visible_props = snap.props['property_id'].unique().tolist()
     else:
         visible_props = [current_user.property_id]
         
     # 2. Get units for these properties
-    relevant_units = units_df[units_df['property_id'].isin(visible_props)]
+    relevant_units = snap.units_for(visible_props)
     
     # If it's a single owner, show all their units (up to 500). If Admin, cap at 50 to avoid massive lists.
     if current_user.property_id and current_user.property_id != "ALL":
@@ -552,42 +830,8 @@ async def generate_memo(request: dict, current_user: UserData = Depends(get_curr
     title = request.get('title', 'Investment Memo')
     content = request.get('content', 'No content provided.')
     
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
-    styles = getSampleStyleSheet()
-    
-    # Custom Styles
-    title_style = ParagraphStyle('Title', parent=styles['Heading1'], fontSize=24, spaceAfter=24, textColor='#4B0082') # Indigo
-    h2_style = ParagraphStyle('H2', parent=styles['Heading2'], fontSize=16, spaceBefore=18, spaceAfter=12, textColor='#333333')
-    body_style = ParagraphStyle('Body', parent=styles['Normal'], fontSize=11, leading=14, spaceAfter=10)
-    
-    flowables = []
-    
-    # Header
-    flowables.append(Paragraph("ASA REAL ESTATE INVESTMENTS", styles['Normal']))
-    flowables.append(Spacer(1, 12))
-    flowables.append(Paragraph(f"MEMO: {title}", title_style))
-    flowables.append(Paragraph(f"DATE: {datetime.now().strftime('%B %d, %Y')}", styles['Normal']))
-    flowables.append(Spacer(1, 24))
-    
-    # Content Processing (Handle Markdown-ish text from LLM)
-    # Simple markdown to flowable converter for basic structure
-    for line in content.split('\n'):
-        line = line.strip()
-        if not line:
-            continue
-        if line.startswith('###') or line.startswith('##') or line.startswith('**'):
-             clean_line = line.replace('#', '').replace('*', '').strip()
-             flowables.append(Paragraph(clean_line, h2_style))
-        elif line.startswith('- '):
-             flowables.append(Paragraph(f"• {line[2:]}", body_style))
-        else:
-             flowables.append(Paragraph(line, body_style))
-            
-    doc.build(flowables)
-    
-    pdf_bytes = buffer.getvalue()
-    buffer.close()
+    # Rendered by src/api/documents.py in an executor worker
+    pdf_bytes = await EXECUTOR.render_memo(title, content)
     
     return Response(content=pdf_bytes, media_type="application/pdf")
 
@@ -602,12 +846,14 @@ async def chat_endpoint(req: ChatRequest, current_user: UserData = Depends(get_c
     
     # 1. SCOPE DATA FOR USER
     # Identical logic to properties/tenants route to ensure security
-    target_props = props_df.copy()
+    snap = DATA.snapshot()
+    target_props = snap.props.copy()
+    record_scan("properties", target_props)
     if current_user.property_id and current_user.property_id != "ALL":
          target_props = target_props[target_props['property_id'] == current_user.property_id]
          
     visible_prop_ids = target_props['property_id'].unique().tolist()
-    target_units = units_df[units_df['property_id'].isin(visible_prop_ids)] if not units_df.empty else pd.DataFrame()
+    target_units = snap.units_for(visible_prop_ids) if not snap.units.empty else pd.DataFrame()
     
     # Generate tenants just for this RAG session
     # Cap at 200 for performance if needed, or get all since it's backend processing
@@ -634,7 +880,9 @@ async def chat_endpoint(req: ChatRequest, current_user: UserData = Depends(get_c
             property_df=target_props, 
             unit_df=target_units, 
             tenant_data=target_tenants_list,
-            listings_df=real_listings_df  # Pass market listings
+            listings_df=snap.listings,  # Pass market listings
+            calibrated_tenants_df=snap.tenants,
+            churn_summary=CHURN_SCORES.summary(visible_prop_ids) if CHURN_SCORES is not None else None
         )
         response = rag.query(req.message)
         return {"response": response, "source": "Internal Database"}
@@ -661,6 +909,108 @@ async def chat_endpoint(req: ChatRequest, current_user: UserData = Depends(get_c
     return {"response": response, "source": "AI Assistant"}
 
 
+# --- 8. METRICS ---
+_CACHE_EVENTS = REGISTRY.gauge("model_cache_events", "Model cache lookups since start by result", ["result"])
+_CACHE_HIT_RATIO = REGISTRY.gauge("model_cache_hit_ratio", "Model cache hits / lookups")
+_CACHE_BYTES = REGISTRY.gauge("model_cache_bytes", "Artifact bytes held in the model cache")
+_SERVED_VERSION = REGISTRY.gauge("served_model_version", "Model version currently served", ["model"])
+_BATCH_QUEUE = REGISTRY.gauge("inference_batch_queue_depth", "Rows waiting in the micro-batcher", ["model"])
+_EXECUTOR_QUEUE = REGISTRY.gauge("executor_queue_depth", "Tasks submitted to the process pool and not finished")
+_EXECUTOR_ALIVE = REGISTRY.gauge("executor_workers_alive", "Live executor worker processes")
+_DATA_VERSION = REGISTRY.gauge("data_snapshot_version", "Version of the served data snapshot")
+
+def _collect_runtime_metrics():
+    from src.models.cache import get_model_cache
+    cache = get_model_cache().stats()
+    lookups = cache['hits'] + cache['misses']
+    _CACHE_EVENTS.set(cache['hits'], result="hit")
+    _CACHE_EVENTS.set(cache['misses'], result="miss")
+    _CACHE_EVENTS.set(cache['evictions'], result="eviction")
+    _CACHE_HIT_RATIO.set(cache['hits'] / lookups if lookups else 0)
+    _CACHE_BYTES.set(cache['total_bytes'])
+    for key, slot in MODELS.items():
+        _SERVED_VERSION.set(slot.version or 0, model=slot.name)
+    for key, batcher in BATCHERS.items():
+        _BATCH_QUEUE.set(batcher.status()['queued'], model=key)
+    executor = EXECUTOR.status()
+    _EXECUTOR_QUEUE.set(executor['queue_depth'])
+    _EXECUTOR_ALIVE.set(executor['alive'])
+    _DATA_VERSION.set(DATA.version)
+
+REGISTRY.add_collector(_collect_runtime_metrics)
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """
+    Prometheus text exposition of request, model, LLM, RAG and cache metrics.
+    """
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
+
+# --- 9. ADMIN ---
+@app.get("/admin/data")
+def data_status(current_user: UserData = Depends(require_admin)):
+    return DATA.status()
+
+@app.post("/admin/data/reload")
+def reload_data(current_user: UserData = Depends(require_admin)):
+    """
+    Rebuilds the data snapshot in the background; in-flight requests keep the old one.
+    """
+    started = DATA.reload()
+    return {"started": started, "current_version": DATA.version}
+
+
+@app.get("/admin/models")
+def models_status(current_user: UserData = Depends(require_admin)):
+    from src.models.cache import get_model_cache
+    slots = MODEL_WATCHER.slots if MODEL_WATCHER is not None else []
+    return {
+        "slots": [slot.status() for slot in slots],
+        "watching": MODEL_WATCHER.running if MODEL_WATCHER is not None else False,
+        "cache": get_model_cache().stats(),
+        "valuation_table": VALUATION_TABLE.status() if VALUATION_TABLE is not None else None,
+        "batching": {key: batcher.status() for key, batcher in BATCHERS.items()},
+        "churn_scores": dict(CHURN_SCORES.summary(), score_seconds=CHURN_SCORES.score_seconds) if CHURN_SCORES is not None else None
+    }
+
+@app.get("/admin/executor")
+def executor_status(current_user: UserData = Depends(require_admin)):
+    """
+    Process pool health: live workers, queue depth and per-task latency.
+    """
+    return EXECUTOR.status()
+
+@app.get("/admin/profiles")
+def list_profiles(current_user: UserData = Depends(require_admin)):
+    return {"config": PROFILER.status(), "profiles": PROFILER.store.list()}
+
+@app.post("/admin/profiles/config")
+def configure_profiling(config: ProfilingConfig, current_user: UserData = Depends(require_admin)):
+    """
+    Arm/disarm profiling and set the sample rate, mode ('sample' or 'cprofile') and interval.
+    """
+    try:
+        return PROFILER.configure(**config.dict())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/admin/profiles/{profile_id}")
+def download_profile(profile_id: str, current_user: UserData = Depends(require_admin)):
+    path = PROFILER.store.path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, filename=os.path.basename(path), media_type="application/octet-stream")
+
+@app.post("/admin/models/refresh")
+def refresh_models(current_user: UserData = Depends(require_admin)):
+    """
+    Re-checks registry aliases now instead of waiting for the watcher interval.
+    """
+    if MODEL_WATCHER is None:
+        return {"swapped": []}
+    return {"swapped": MODEL_WATCHER.check_now()}
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -1,27 +1,27 @@
-import pandas as pd
+import sys
 import os
 
-# Define paths
-base_path = r"d:/Python-2025/Antigravity/Beekin_Analysis/src/data/synthetic"
-props_path = os.path.join(base_path, "calibrated_properties.csv")
-units_path = os.path.join(base_path, "calibrated_units.csv")
-tenants_path = os.path.join(base_path, "calibrated_tenants.csv")
+# Add repo root to path to import the data store
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.data.store import load_dataset
+from src.data.features import load_features
 
 # Load Data
 print("Loading Data...")
-props = pd.read_csv(props_path)
-units = pd.read_csv(units_path)
-tenants = pd.read_csv(tenants_path)
+props = load_dataset("properties")
+units = load_dataset("units")
+tenants = load_dataset("tenants")
 
 print(f"Properties: {props.shape}")
 print(f"Units: {units.shape}")
 print(f"Tenants: {tenants.shape}")
 
 # Merge Data (The Relational Part)
-# 1. Join Units to Properties
-units_wide = units.merge(props, on='property_id', how='left')
-# 2. Join Tenants to Units (Inner join = only occupied units)
-master_df = tenants.merge(units_wide, on='unit_id', how='left')
+# Joined once by the feature store (src/data/features.py) and reused across scripts
+# 1. Units joined to Properties
+units_wide = load_features("unit_features")
+# 2. Tenants joined to Units (Inner join = only occupied units)
+master_df = load_features("tenant_features")
 
 print("\n--- Relational Schema ---")
 print("Properties Table Columns:", list(props.columns))
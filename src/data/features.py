@@ -0,0 +1,201 @@
+"""
+Feature store for the joined portfolio tables.
+
+Training scripts, data exploration and the API's batch churn scorer all need
+the same `tenants ⋈ units ⋈ properties` join plus derived columns such as
+`rent_burden`. `load_features()` materializes each joined table once as an
+uncompressed Feather file under `src/data/store/features/`, named by a hash of
+its input CSVs and the feature definitions, and memory-maps it on later loads.
+Editing a CSV (or `FEATURES_VERSION`) produces a new hash and a rebuild; older
+versions are pruned. When `SYNTHETIC_MANIFEST` points at a sharded portfolio
+that lists the table, its pre-joined Parquet partitions are read instead.
+
+Tables:
+- `tenant_features`: one row per tenant with its unit and property
+  (inner join on units), `rent_burden`, `is_high_burden`, `is_low_credit`.
+- `unit_features`: one row per unit with its property's neighborhood/class.
+
+Usage:
+    python -m src.data.features           # build (or reuse) every table
+    python -m src.data.features --force   # rebuild even if the hash matches
+"""
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+
+from src.data import store
+from src.models.registry import file_sha256
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # without pyarrow the tables are rebuilt in memory on every load
+    feather = None
+
+# Bump when a table definition below changes, so stored tables are rebuilt
+FEATURES_VERSION = 1
+FEATURE_DIR = os.path.join(store.STORE_DIR, "features")
+KEEP_VERSIONS = int(os.getenv("FEATURE_KEEP_VERSIONS", "3"))
+
+
+# --- 1. TABLE DEFINITIONS ---
+def build_unit_features(units, props):
+    """Units with their property's name, neighborhood and class."""
+    props = props[['property_id', 'name', 'neighborhood', 'class']].rename(columns={'name': 'property_name'})
+    df = units[['unit_id', 'property_id', 'type', 'sqft', 'market_rent']].merge(props, on='property_id', how='left')
+    return df.reset_index(drop=True)
+
+
+def build_tenant_features(tenants, units, props):
+    """Occupied units: tenant, unit and property columns plus affordability features."""
+    df = tenants[['tenant_id', 'unit_id', 'name', 'income', 'credit_score', 'lease_start']].merge(
+        build_unit_features(units, props), on='unit_id', how='inner')
+    monthly_income = df['income'] / 12
+    df['rent_burden'] = (df['market_rent'] / monthly_income).where(monthly_income > 0, 0.0).astype('float64')
+    df['is_high_burden'] = (df['rent_burden'] > 0.4).astype('int8')
+    df['is_low_credit'] = (df['credit_score'] < 640).astype('int8')
+    return df.reset_index(drop=True)
+
+
+FEATURE_TABLES = {
+    "unit_features": {"inputs": ("units", "properties"), "build": build_unit_features},
+    "tenant_features": {"inputs": ("tenants", "units", "properties"), "build": build_tenant_features},
+}
+
+
+# --- 2. VERSIONING ---
+def input_hashes(table):
+    """sha256 of each source file (CSV or sharded manifest) the table is built from."""
+    return {name: file_sha256(store.source_path(name)) for name in FEATURE_TABLES[table]["inputs"]}
+
+
+def feature_version(table, hashes=None):
+    """Hash identifying a table built from the current inputs and definitions."""
+    hashes = hashes or input_hashes(table)
+    payload = json.dumps({"table": table, "features_version": FEATURES_VERSION, "inputs": hashes}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def feature_path(table, version):
+    return os.path.join(FEATURE_DIR, f"{table}-{version}.feather")
+
+
+# --- 3. MATERIALIZATION ---
+def _compute(table):
+    spec = FEATURE_TABLES[table]
+    return spec["build"](*(store.load_dataset(name) for name in spec["inputs"]))
+
+
+def materialize(table, force=False):
+    """Build and store `table` for the current inputs unless already stored. Returns (version, path)."""
+    if feather is None:
+        raise ImportError("pyarrow is required to store feature tables")
+    hashes = input_hashes(table)
+    version = feature_version(table, hashes)
+    path = feature_path(table, version)
+    if os.path.exists(path) and not force:
+        return version, path
+
+    start = time.perf_counter()
+    df = _compute(table)
+    os.makedirs(FEATURE_DIR, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    # Uncompressed so the file can be memory-mapped without a decode pass
+    feather.write_feather(df, tmp_path, compression="uncompressed")
+    os.replace(tmp_path, path)
+    meta = {
+        "table": table,
+        "version": version,
+        "rows": len(df),
+        "columns": list(df.columns),
+        "inputs": hashes,
+        "features_version": FEATURES_VERSION,
+        "built_at": datetime.now().isoformat(timespec="seconds"),
+        "build_seconds": round(time.perf_counter() - start, 3),
+    }
+    with open(path.replace(".feather", ".json"), "w") as f:
+        json.dump(meta, f, indent=2)
+    _prune(table, keep=version)
+    return version, path
+
+
+def _prune(table, keep):
+    """Remove all but the KEEP_VERSIONS most recent versions of a table (never `keep`)."""
+    prefix = f"{table}-"
+    files = sorted(
+        (os.path.join(FEATURE_DIR, f) for f in os.listdir(FEATURE_DIR) if f.startswith(prefix) and f.endswith(".feather")),
+        key=os.path.getmtime, reverse=True,
+    )
+    for path in files[KEEP_VERSIONS:]:
+        if path == feature_path(table, keep):
+            continue
+        for stale in (path, path.replace(".feather", ".json")):
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+
+def load_features(table="tenant_features", columns=None, with_version=False):
+    """
+    Load a feature table, materializing it first if the inputs changed.
+
+    Args:
+        table: Name in FEATURE_TABLES.
+        columns: Optional subset of columns to read.
+        with_version: Also return the table's version hash.
+    """
+    if table not in FEATURE_TABLES:
+        raise KeyError(f"Unknown feature table '{table}'. Known: {list(FEATURE_TABLES)}")
+    files = store.manifest_files(table)
+    if files is not None:
+        # Sharded portfolios ship the table pre-joined per shard (src/data/synthetic/sharded.py)
+        df = store.read_partitions(table, files, columns)
+        return (df, feature_version(table)) if with_version else df
+    if feather is None:
+        df = _compute(table)
+        df = df[columns] if columns else df
+        return (df, None) if with_version else df
+    version, path = materialize(table)
+    df = feather.read_table(path, columns=columns, memory_map=True).to_pandas(split_blocks=True, date_as_object=False)
+    return (df, version) if with_version else df
+
+
+def status():
+    """Stored versions per table with their metadata."""
+    entries = {}
+    if not os.path.isdir(FEATURE_DIR):
+        return entries
+    for name in sorted(os.listdir(FEATURE_DIR)):
+        if name.endswith(".json"):
+            with open(os.path.join(FEATURE_DIR, name)) as f:
+                meta = json.load(f)
+            entries.setdefault(meta["table"], []).append(meta)
+    return entries
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+    parser = argparse.ArgumentParser(description="Materialize the feature tables.")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if the stored version is current")
+    args = parser.parse_args()
+
+    for table in FEATURE_TABLES:
+        start = time.perf_counter()
+        version, path = materialize(table, force=args.force)
+        built = time.perf_counter() - start
+        start = time.perf_counter()
+        df = load_features(table)
+        loaded = time.perf_counter() - start
+        print(f"✅ {table} v{version}: {len(df):,} rows x {len(df.columns)} cols -> {path} "
+              f"(materialize {built:.3f}s, load {loaded:.3f}s)")
+
+    # Reference: the join each script used to redo on every run
+    start = time.perf_counter()
+    tenants, units, props = (store.load_dataset(n) for n in ("tenants", "units", "properties"))
+    tenants.merge(units, on='unit_id', how='left').merge(props, on='property_id', how='left')
+    print(f"⏱️ Re-joining from the store each time: {time.perf_counter() - start:.3f}s")
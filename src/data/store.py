@@ -0,0 +1,266 @@
+"""
+Columnar data store for the calibrated portfolio and the scraped listings.
+
+The CSVs stay the source of truth. `convert_all()` writes an uncompressed
+Feather (Arrow IPC) copy of each dataset with an explicit schema, and
+`load_dataset()` memory-maps that copy, so repeated loads skip CSV parsing and
+dtype inference. Low-cardinality text columns (`class`, `type`,
+`neighborhood`, ...) come back as pandas categoricals. `amenities` comes back
+as one sequence of strings per row instead of a stringified Python list: a
+`numpy.ndarray` from the Feather and Parquet stores, a `list` from the typed
+CSV fallback.
+
+Set `SYNTHETIC_MANIFEST` to the manifest.json written by
+`src/data/synthetic/sharded.py` to load the datasets it lists from its
+Parquet partitions instead of the CSVs.
+
+Usage:
+    python -m src.data.store          # (re)build every store file
+"""
+import ast
+import json
+import os
+import time
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as pa_dataset
+    import pyarrow.feather as feather
+except ImportError:  # pyarrow is optional; we fall back to typed CSV reads
+    pa = None
+    pa_dataset = None
+    feather = None
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+STORE_DIR = os.path.join(DATA_DIR, "store")
+
+# --- SCHEMAS ---
+# Column kinds: string, category, int32, int64, float64, date, list
+DATASETS = {
+    "properties": {
+        "csv": os.path.join("synthetic", "calibrated_properties.csv"),
+        "columns": {
+            "property_id": "string",
+            "name": "string",
+            "neighborhood": "category",
+            "class": "category",
+        },
+    },
+    "units": {
+        "csv": os.path.join("synthetic", "calibrated_units.csv"),
+        "columns": {
+            "unit_id": "string",
+            "property_id": "string",
+            "type": "category",
+            "amenities": "list",
+            "sqft": "int32",
+            "market_rent": "int32",
+        },
+    },
+    "tenants": {
+        "csv": os.path.join("synthetic", "calibrated_tenants.csv"),
+        "columns": {
+            "tenant_id": "string",
+            "unit_id": "string",
+            "name": "string",
+            "income": "int64",
+            "credit_score": "int32",
+            "lease_start": "date",
+        },
+    },
+    "listings": {
+        "csv": os.path.join("scrapers", "real_listings.csv"),
+        "columns": {
+            "source": "category",
+            "price": "float64",
+            "title": "string",
+            "details": "string",
+            "location": "string",
+            "url": "string",
+            "beds": "float64",
+            "sqft": "float64",
+        },
+    },
+}
+
+
+def _arrow_type(kind):
+    return {
+        "string": pa.string(),
+        "category": pa.dictionary(pa.int32(), pa.string()),
+        "int32": pa.int32(),
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+        "date": pa.date32(),
+        "list": pa.list_(pa.string()),
+    }[kind]
+
+
+def arrow_schema(name):
+    """Explicit Arrow schema for a dataset."""
+    columns = DATASETS[name]["columns"]
+    return pa.schema([(col, _arrow_type(kind)) for col, kind in columns.items()])
+
+
+def _parse_list(value):
+    if isinstance(value, list):
+        return value
+    if not isinstance(value, str) or not value:
+        return []
+    try:
+        parsed = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return [value]
+    return [str(v) for v in parsed] if isinstance(parsed, (list, tuple)) else [str(parsed)]
+
+
+def apply_schema(df, name):
+    """
+    Coerce a raw (CSV-parsed) frame to the dataset schema.
+    Raises ValueError naming the dataset and column if an integer column has blank or malformed values.
+    """
+    columns = DATASETS[name]["columns"]
+    df = df.copy()
+    for col, kind in columns.items():
+        if col not in df.columns:
+            continue
+        if kind == "string":
+            df[col] = df[col].astype("string")
+        elif kind == "category":
+            df[col] = df[col].astype("category")
+        elif kind == "float64":
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype(kind)
+        elif kind in ("int32", "int64"):
+            values = pd.to_numeric(df[col], errors="coerce")
+            missing = values.isna()
+            if missing.any():
+                rows = df.index[missing][:5].tolist()
+                raise ValueError(f"{name}.{col}: {int(missing.sum())} blank or non-numeric value(s) in an "
+                                 f"{kind} column (first rows: {rows})")
+            df[col] = values.astype(kind)
+        elif kind == "date":
+            df[col] = pd.to_datetime(df[col], errors="coerce")
+        elif kind == "list":
+            df[col] = df[col].map(_parse_list)
+    return df
+
+
+def csv_path(name):
+    return os.path.join(DATA_DIR, DATASETS[name]["csv"])
+
+
+# --- SHARDED SOURCES ---
+def manifest_path():
+    """Manifest from SYNTHETIC_MANIFEST, or None (read per call so it can change at runtime)."""
+    return os.getenv("SYNTHETIC_MANIFEST") or None
+
+
+def read_manifest(path=None):
+    path = path or manifest_path()
+    with open(path) as f:
+        return json.load(f)
+
+
+def manifest_files(name, path=None):
+    """Absolute Parquet partitions for `name` listed in the manifest, or None if it is not listed."""
+    path = path or manifest_path()
+    if not path:
+        return None
+    entry = read_manifest(path)["datasets"].get(name)
+    if entry is None:
+        return None
+    root = os.path.dirname(os.path.abspath(path))
+    return [os.path.join(root, f) for f in entry["files"]]
+
+
+def source_path(name):
+    """File whose changes mean the dataset changed: the manifest if it lists `name`, else the CSV."""
+    if manifest_files(name) is not None:
+        return manifest_path()
+    return csv_path(name)
+
+
+def read_partitions(name, files, columns=None):
+    if pa is None:
+        raise ImportError("pyarrow is required to read sharded Parquet datasets")
+    schema = arrow_schema(name) if name in DATASETS else None
+    table = pa_dataset.dataset(files, format="parquet", schema=schema).to_table(columns=columns)
+    # Arrow types decide the dtypes (as for the Feather copies), not the writer's pandas metadata
+    return table.to_pandas(split_blocks=True, date_as_object=False, ignore_metadata=True)
+
+
+def store_path(name):
+    return os.path.join(STORE_DIR, f"{name}.feather")
+
+
+def _read_csv(name):
+    columns = DATASETS[name]["columns"]
+    # Give the parser explicit dtypes where it can use them; the rest is coerced after.
+    dtypes = {col: kind for col, kind in columns.items() if kind in ("category", "float64")}
+    return apply_schema(pd.read_csv(csv_path(name), dtype=dtypes), name)
+
+
+def is_stale(name):
+    """True if the store file is missing or older than its CSV."""
+    path = store_path(name)
+    if not os.path.exists(path):
+        return True
+    return os.path.getmtime(path) < os.path.getmtime(csv_path(name))
+
+
+def convert_dataset(name):
+    """Write the Feather copy of one dataset. Returns the store path."""
+    if pa is None:
+        raise ImportError("pyarrow is required to build the columnar store")
+    df = _read_csv(name)
+    table = pa.Table.from_pandas(df, preserve_index=False).cast(arrow_schema(name))
+    os.makedirs(STORE_DIR, exist_ok=True)
+    path = store_path(name)
+    tmp_path = f"{path}.tmp"
+    # Uncompressed so the file can be memory-mapped without a decode pass
+    feather.write_feather(table, tmp_path, compression="uncompressed")
+    os.replace(tmp_path, path)
+    return path
+
+
+def convert_all(force=False):
+    """Build (or refresh stale) store files for every dataset."""
+    written = []
+    for name in DATASETS:
+        if force or is_stale(name):
+            written.append(convert_dataset(name))
+    return written
+
+
+def load_dataset(name, columns=None):
+    """
+    Load a dataset as a typed DataFrame.
+
+    Uses the memory-mapped Feather copy when pyarrow is available, converting
+    it first if it is missing or older than the CSV. Without pyarrow the CSV
+    is parsed with the same schema. Datasets listed in the SYNTHETIC_MANIFEST
+    manifest are read from its Parquet partitions.
+    """
+    if name not in DATASETS:
+        raise KeyError(f"Unknown dataset '{name}'. Known: {list(DATASETS)}")
+    files = manifest_files(name)
+    if files is not None:
+        return read_partitions(name, files, columns)
+    if pa is None:
+        df = _read_csv(name)
+        return df[columns] if columns else df
+
+    if is_stale(name):
+        convert_dataset(name)
+    table = feather.read_table(store_path(name), columns=columns, memory_map=True)
+    return table.to_pandas(split_blocks=True, date_as_object=False)
+
+
+if __name__ == "__main__":
+    for name in DATASETS:
+        start = time.perf_counter()
+        path = convert_dataset(name)
+        elapsed = time.perf_counter() - start
+        print(f"✅ {name}: {os.path.getsize(path) / 1024:.0f} KB -> {path} ({elapsed:.2f}s)")
@@ -2,24 +2,21 @@ import pandas as pd
 import numpy as np
 from faker import Faker
 import random
-import re
+import os
+import sys
+
+# Add repo root to path to import the listing parser when run as a script
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+from src.data.synthetic.calibration import parse_listings
 
 # 1. Load and Calibrate from Real Data
 def calibrate_parameters(real_data_path):
     print(f"Loading real data from {real_data_path}...")
     df = pd.read_csv(real_data_path)
     
-    # Clean text to find bedrooms
-    def parse_beds(text):
-        if not isinstance(text, str): return None
-        text = text.lower()
-        if 'studio' in text: return 0
-        match = re.search(r'(\d+)\s*(?:br|bed|bd)', text)
-        if match: return int(match.group(1))
-        return None
-
-    # Apply parsing to Title (usually richer descriptive text in CL)
-    df['parsed_beds'] = df['title'].apply(parse_beds)
+    # Bedrooms from the beds column, details and title, parsed in bulk
+    # (per-segment distributions: see calibration.py)
+    df['parsed_beds'] = parse_listings(df)['beds']
     
     # Calculate distributions
     stats = {}
@@ -0,0 +1,347 @@
+"""
+Market calibration: rent distributions per (unit type, location cluster).
+
+`calibrate_and_generate.calibrate_parameters` runs a Python regex per listing
+(`df['title'].apply(parse_beds)`), reads only the title, and fits one normal
+(mean, std) per bed type. Location is applied later as a hard-coded
+multiplier. This module calibrates from the listings themselves:
+
+- `parse_listings` reads bedrooms with vectorized `str.extract` from the
+  scraper's `beds` column, the `details` housing line ("2br - 900ft2") and the
+  title, in that order of trust. It also fills a missing price from `details`.
+- Listing locations are grouped into `CLUSTERS` price tiers by their median
+  rent relative to the unit-type median, shrunk towards 1.0 for locations with
+  few listings.
+- Each (unit type, cluster) segment keeps `N_QUANTILES` empirical quantiles of
+  its rent. Segments with fewer than `MIN_SEGMENT_LISTINGS` listings use the
+  pooled unit type, and unit types with too few listings use the heuristic
+  normals from calibrate_parameters.
+
+The result is a small JSON artifact (`calibration.json`, a few KB). The
+vectorized, sharded and streaming generators accept a `MarketCalibration` in
+place of the `stats` dict. They then draw every unit's rent in bulk by inverse
+CDF: one uniform per unit, interpolated in its segment's quantile row.
+
+Usage:
+    python -m src.data.synthetic.calibration                 # fit and save src/data/store/calibration.json
+    python -m src.data.synthetic.calibration --show
+"""
+import hashlib
+import json
+import os
+from datetime import datetime
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from src.data import store
+from src.models.registry import file_sha256
+
+CALIBRATION_VERSION = 1
+CALIBRATION_PATH = os.getenv("MARKET_CALIBRATION", os.path.join(store.STORE_DIR, "calibration.json"))
+# meta['source'] is stored relative to the repo, so the artifact stays valid in another checkout
+REPO_ROOT = os.path.dirname(os.path.dirname(store.DATA_DIR))
+
+UNIT_TYPES = ['Studio', '1BD', '2BD', '3BD', '4BD']
+CLUSTERS = ['value', 'mid', 'prime']
+POOLED = 'all'
+# Same outlier filter as calibrate_parameters
+PRICE_RANGE = (500, 20000)
+N_QUANTILES = 21  # every 5th percentile
+MIN_SEGMENT_LISTINGS = 8
+MIN_TYPE_LISTINGS = 6  # calibrate_parameters needs > 5
+# Pseudo-listings at the market level (1.0) added to each location's rent index
+LOCATION_PRIOR = 3
+# Heuristic (mu, sigma) for unit types the scrape missed, as in calibrate_parameters
+FALLBACK_RENT = {'Studio': (2500, 500), '1BD': (3200, 600), '2BD': (4500, 1000), '3BD': (6000, 1500),
+                 '4BD': (8000, 2000)}
+
+# Same patterns as calibrate_parameters' parse_beds
+BEDS_PATTERN = r'(\d+)\s*(?:br|bed|bd)'
+STUDIO_PATTERN = 'studio'
+PRICE_PATTERN = r'\$\s*([\d,]+)'
+
+
+def normalize_location(values):
+    """Lower-case, single-spaced location keys ("Harlem / Morningside" -> "harlem / morningside")."""
+    return pd.Series(values, dtype=object).astype("string").str.lower().str.replace(r'\s+', ' ', regex=True).str.strip()
+
+
+def _beds_from_text(text):
+    """Bedrooms mentioned in a text column (studio = 0), NaN where none."""
+    text = text.astype("string").str.lower()
+    beds = pd.to_numeric(text.str.extract(BEDS_PATTERN, expand=False), errors='coerce')
+    return beds.mask(text.str.contains(STUDIO_PATTERN, regex=False, na=False), 0).astype(float)
+
+
+def parse_listings(df):
+    """
+    Listings with `beds`, `unit_type`, `price` and `location_key` parsed in bulk.
+
+    Bedrooms come from the scraped `beds` column, then the `details` text, then
+    the title. Rows without a price, bedrooms or location are kept with NaN.
+    """
+    df = df.copy()
+    beds = pd.to_numeric(df['beds'], errors='coerce') if 'beds' in df else pd.Series(np.nan, index=df.index)
+    for column in ('details', 'title'):
+        if column in df:
+            beds = beds.fillna(_beds_from_text(df[column]))
+    df['beds'] = beds
+
+    price = pd.to_numeric(df['price'], errors='coerce') if 'price' in df else pd.Series(np.nan, index=df.index)
+    if 'details' in df:
+        from_details = df['details'].astype("string").str.extract(PRICE_PATTERN, expand=False).str.replace(',', '')
+        price = price.fillna(pd.to_numeric(from_details, errors='coerce'))
+    df['price'] = price
+
+    type_idx = np.clip(beds.fillna(-1).to_numpy(), -1, len(UNIT_TYPES) - 1).astype(int)
+    df['unit_type'] = pd.Series(np.array(UNIT_TYPES + [None], dtype=object)[type_idx], index=df.index)
+    df['location_key'] = normalize_location(df['location']) if 'location' in df else pd.NA
+    return df
+
+
+def _quantiles(prices):
+    return np.quantile(np.asarray(prices, dtype=float), np.linspace(0, 1, N_QUANTILES))
+
+
+def _normal_quantiles(mu, sigma):
+    """Quantiles of a normal, clipped to the outlier range (the 0 and 1 ends at +-2.5 sigma)."""
+    normal = NormalDist(mu, sigma)
+    return np.clip([normal.inv_cdf(p) for p in np.linspace(0.006, 0.994, N_QUANTILES)], *PRICE_RANGE)
+
+
+class MarketCalibration:
+    """
+    Fitted rent quantiles per (unit type, location cluster).
+
+    Args:
+        segments: {unit_type: {cluster or 'all': {'n': listings, 'quantiles': [...]}}}.
+        locations: {location_key: {'cluster': name, 'index': rent index, 'n': listings}}.
+        meta: Provenance (source relative to the repo, sha256, created_at, listing counts).
+    """
+
+    def __init__(self, segments, locations, meta=None):
+        self.segments = segments
+        self.locations = locations
+        self.meta = meta or {}
+        # (type, cluster) -> row of the quantile table; POOLED rows exist for every type
+        keys = [(t, c) for t in UNIT_TYPES for c in [POOLED] + CLUSTERS]
+        self._row = {key: i for i, key in enumerate(keys)}
+        self._table = np.array([self._segment(t, c)['quantiles'] for t, c in keys], dtype=float)
+
+    def _segment(self, unit_type, cluster):
+        by_cluster = self.segments[unit_type]
+        return by_cluster.get(cluster) or by_cluster[POOLED]
+
+    # --- Fitting ---
+    @classmethod
+    def fit(cls, listings, source=None):
+        """Fit from raw listings (see `parse_listings`); duplicates by `url` are dropped first."""
+        raw = len(listings)
+        if 'url' in listings:
+            listings = listings.drop_duplicates('url')
+        df = parse_listings(listings)
+        low, high = PRICE_RANGE
+        df = df[(df['price'] > low) & (df['price'] < high) & df['unit_type'].notna()]
+
+        # Location rent index: median price relative to the unit-type median, shrunk towards 1.0
+        relative = df['price'] / df.groupby('unit_type')['price'].transform('median')
+        by_location = relative[df['location_key'].notna()].groupby(df['location_key']).agg(['median', 'size'])
+        index = (by_location['median'] * by_location['size'] + LOCATION_PRIOR) / (by_location['size'] + LOCATION_PRIOR)
+        # Tier edges at the listing-weighted quantiles, so clusters hold similar numbers of listings
+        edges = np.quantile(np.repeat(index.to_numpy(), by_location['size'].to_numpy()),
+                            np.linspace(0, 1, len(CLUSTERS) + 1)[1:-1])
+        tier = np.searchsorted(edges, index.to_numpy(), side='right')
+        locations = {
+            key: {'cluster': CLUSTERS[t], 'index': round(float(i), 4), 'n': int(n)}
+            for key, t, i, n in zip(index.index, tier, index.to_numpy(), by_location['size'].to_numpy())
+        }
+        df = df.assign(cluster=df['location_key'].map({k: v['cluster'] for k, v in locations.items()}))
+
+        segments = {}
+        for unit_type in UNIT_TYPES:
+            prices = df.loc[df['unit_type'] == unit_type]
+            if len(prices) >= MIN_TYPE_LISTINGS:
+                segments[unit_type] = {POOLED: {'n': len(prices), 'quantiles': _quantiles(prices['price'])}}
+            else:
+                segments[unit_type] = {POOLED: {'n': 0, 'quantiles': _normal_quantiles(*FALLBACK_RENT[unit_type])}}
+            for cluster, group in prices.groupby('cluster'):
+                if len(group) >= MIN_SEGMENT_LISTINGS:
+                    segments[unit_type][cluster] = {'n': len(group), 'quantiles': _quantiles(group['price'])}
+        for by_cluster in segments.values():
+            for segment in by_cluster.values():
+                segment['quantiles'] = [round(float(q), 2) for q in segment['quantiles']]
+
+        meta = {
+            'calibration_version': CALIBRATION_VERSION,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'source': os.path.relpath(source, REPO_ROOT) if source else None,
+            'source_sha256': file_sha256(source) if source and os.path.exists(source) else None,
+            'listings': raw,
+            'used': len(df),
+        }
+        return cls(segments, locations, meta)
+
+    # --- Persistence ---
+    def to_dict(self):
+        return {**self.meta, 'segments': self.segments, 'locations': self.locations}
+
+    @classmethod
+    def from_dict(cls, data):
+        data = dict(data)
+        segments = data.pop('segments')
+        locations = data.pop('locations')
+        return cls(segments, locations, data)
+
+    def save(self, path=CALIBRATION_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(f"{path}.tmp", "w") as f:
+            json.dump(self.to_dict(), f, indent=1)
+        os.replace(f"{path}.tmp", path)
+        return path
+
+    @classmethod
+    def load(cls, path=CALIBRATION_PATH):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    @property
+    def fingerprint(self):
+        """Short hash of the fitted distributions (recorded in manifests and checkpoints)."""
+        body = json.dumps({'segments': self.segments, 'locations': self.locations}, sort_keys=True)
+        return hashlib.sha256(body.encode()).hexdigest()[:16]
+
+    # --- Sampling ---
+    def cluster_of(self, neighborhood):
+        """Cluster of a neighborhood name: exact location match, else the largest location containing it."""
+        key = normalize_location([neighborhood]).iloc[0]
+        if key in self.locations:
+            return self.locations[key]['cluster']
+        matches = [(v['n'], k) for k, v in self.locations.items() if key and (key in k or k in key)]
+        return self.locations[max(matches)[1]]['cluster'] if matches else None
+
+    def segment_table(self, unit_types, neighborhoods):
+        """
+        Quantile-table rows for every combination of distinct `unit_types` and
+        `neighborhoods`: a (types, neighborhoods) array, plus a per-neighborhood
+        mask of those without a cluster (pooled unit type).
+        """
+        clusters = [self.cluster_of(n) for n in neighborhoods]
+        rows = np.array([[self._row[(t, c or POOLED)] for c in clusters] for t in unit_types], dtype=np.int64)
+        return rows, np.array([c is None for c in clusters])
+
+    def sample(self, rng, rows):
+        """One rent per entry of `rows` (quantile-table rows), by linear interpolation of the inverse CDF."""
+        position = rng.random(len(rows)) * (N_QUANTILES - 1)
+        lower = np.minimum(position.astype(np.int64), N_QUANTILES - 2)
+        fraction = position - lower
+        return self._table[rows, lower] * (1 - fraction) + self._table[rows, lower + 1] * fraction
+
+    def sample_rents(self, rng, unit_types, neighborhoods):
+        """
+        Rents for units of `unit_types` in `neighborhoods` (arrays of equal length).
+
+        Returns:
+            (rents, pooled): float rents drawn from each unit's segment, and a mask
+            of units whose neighborhood has no cluster (drawn from the pooled unit
+            type, so a location multiplier still applies to them).
+        """
+        type_idx, types = pd.factorize(np.asarray(unit_types, dtype=object))
+        name_idx, names = pd.factorize(np.asarray(neighborhoods, dtype=object))
+        rows, pooled = self.segment_table(types, names)
+        return self.sample(rng, rows[type_idx, name_idx]), pooled[name_idx]
+
+    def stats(self):
+        """(mu, sigma) per unit type from the pooled quantiles, like calibrate_parameters."""
+        result = {}
+        for unit_type in UNIT_TYPES:
+            q = np.asarray(self.segments[unit_type][POOLED]['quantiles'])
+            # Mean of the piecewise-linear inverse CDF; sigma from the interquartile range
+            mu = float(np.mean((q[:-1] + q[1:]) / 2))
+            iqr = np.interp(0.75, np.linspace(0, 1, N_QUANTILES), q) - np.interp(0.25, np.linspace(0, 1, N_QUANTILES), q)
+            result[unit_type] = (mu, float(iqr / 1.349))
+        return result
+
+    def summary(self):
+        """One row per segment: unit type, cluster, listings, p10/p50/p90."""
+        rows = []
+        for unit_type, by_cluster in self.segments.items():
+            for cluster, segment in by_cluster.items():
+                q = segment['quantiles']
+                rows.append({'type': unit_type, 'cluster': cluster, 'n': segment['n'],
+                             'p10': q[2], 'p50': q[N_QUANTILES // 2], 'p90': q[-3]})
+        return pd.DataFrame(rows)
+
+
+def calibrate(path=None, out=CALIBRATION_PATH, save=True):
+    """Fit from the listings (default: the store's listings source) and optionally save the artifact."""
+    path = path or store.source_path("listings")
+    listings = store.load_dataset("listings") if path == store.source_path("listings") else pd.read_csv(path)
+    calibration = MarketCalibration.fit(listings, source=path)
+    if save:
+        calibration.save(out)
+    return calibration
+
+
+def load_calibration(path=CALIBRATION_PATH, refit=True):
+    """
+    The saved calibration, refitted (and re-saved) when it is missing or was fitted
+    from a different listings file or calibration version.
+    """
+    if os.path.exists(path):
+        calibration = MarketCalibration.load(path)
+        source = calibration.meta.get('source')
+        source = source and os.path.join(REPO_ROOT, source)
+        current = (calibration.meta.get('calibration_version') == CALIBRATION_VERSION and source
+                   and os.path.exists(source) and calibration.meta.get('source_sha256') == file_sha256(source))
+        if current or not refit:
+            return calibration
+    return calibrate(out=path)
+
+
+def stats_key(stats):
+    """JSON-able identity of generator stats: the (mu, sigma) dict, or the calibration fingerprint."""
+    if isinstance(stats, MarketCalibration):
+        return {'calibration': stats.fingerprint}
+    return {k: [float(v) for v in mu_sigma] for k, mu_sigma in stats.items()}
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    import time
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+    parser = argparse.ArgumentParser(description="Fit per-segment rent distributions from the scraped listings.")
+    parser.add_argument("--listings", help="Listings CSV (default: the store's listings)")
+    parser.add_argument("--out", default=CALIBRATION_PATH)
+    parser.add_argument("--show", action="store_true", help="Print the saved calibration instead of refitting")
+    args = parser.parse_args()
+
+    if args.show:
+        calibration = MarketCalibration.load(args.out)
+    else:
+        start = time.perf_counter()
+        calibration = calibrate(args.listings, out=args.out)
+        print(f"✅ Calibrated {calibration.meta['used']} of {calibration.meta['listings']} listings in "
+              f"{time.perf_counter() - start:.2f}s -> {args.out} ({os.path.getsize(args.out) / 1024:.1f} KB)")
+
+    print("\n--- Location clusters ---")
+    for cluster in CLUSTERS:
+        members = sorted((k for k, v in calibration.locations.items() if v['cluster'] == cluster),
+                         key=lambda k: calibration.locations[k]['index'])
+        print(f"{cluster}: {', '.join(members)}")
+    print("\n--- Segments (rent quantiles) ---")
+    print(calibration.summary().to_string(index=False))
+
+    # Bulk sampling check: 1M units
+    rng = np.random.default_rng(0)
+    from src.data.synthetic.vectorized import NEIGHBORHOODS
+    types = np.array(UNIT_TYPES[:4])[rng.integers(0, 4, size=1_000_000)]
+    hoods = NEIGHBORHOODS[rng.integers(0, len(NEIGHBORHOODS), size=1_000_000)]
+    start = time.perf_counter()
+    rents, pooled = calibration.sample_rents(rng, types, hoods)
+    print(f"\n⏱️ Sampled {len(rents):,} rents in {time.perf_counter() - start:.3f}s "
+          f"({pooled.mean():.0%} from pooled types: "
+          f"{', '.join(n for n in NEIGHBORHOODS if calibration.cluster_of(n) is None) or 'none'})")
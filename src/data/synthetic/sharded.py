@@ -0,0 +1,198 @@
+"""
+Sharded, multi-process synthetic portfolio generation.
+
+Splits the property range into shards of `shard_properties` and generates them
+on a process pool with `vectorized.generate_batch`. Each shard's generator is
+seeded from `np.random.SeedSequence(seed).spawn(n_shards)`, so the output
+depends only on the seed and the shard size, not on the worker count or the
+order in which shards finish.
+
+Every worker writes its own Parquet partition per dataset, so no single
+process holds the whole portfolio:
+
+    <out>/properties/shard-00000.parquet
+    <out>/units/shard-00000.parquet
+    <out>/tenants/shard-00000.parquet
+    <out>/unit_features/shard-00000.parquet     # pre-joined, see src/data/features.py
+    <out>/tenant_features/shard-00000.parquet
+    <out>/manifest.json
+
+A shard's units and tenants only reference its own properties, so the feature
+joins are done per shard as well. `manifest.json` is written last and lists
+every partition with its row counts. Point `SYNTHETIC_MANIFEST` at it and
+`load_dataset()` / `load_features()` (and so the API and the trainers) read
+the sharded portfolio instead of the CSVs. The out-of-core trainers can stream
+it with `ChunkSource(manifest_files("tenant_features", path))`.
+
+Usage:
+    python -m src.data.synthetic.sharded --properties 100000 --out src/data/store/synthetic
+    SYNTHETIC_MANIFEST=src/data/store/synthetic/manifest.json uvicorn src.api.server:app
+"""
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime
+
+import numpy as np
+
+from src.data import store
+from src.data.features import build_tenant_features, build_unit_features
+from src.data.synthetic.calibration import load_calibration, stats_key
+from src.data.synthetic.vectorized import BATCH_PROPERTIES, NamePools, generate_batch
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # sharded output is Parquet-only
+    pa = None
+    pq = None
+
+DEFAULT_WORKERS = int(os.getenv("SYNTHETIC_WORKERS", str(max(1, os.cpu_count() or 1))))
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+DATASETS = ("properties", "units", "tenants", "unit_features", "tenant_features")
+
+# Set in each worker by _init_worker
+_WORKER = {}
+
+
+def _init_worker(stats, pools, as_of, out_dir):
+    _WORKER.update(stats=stats, pools=pools, as_of=as_of, out_dir=out_dir)
+
+
+def _write(df, name, out_dir, shard):
+    """Write one partition (cast to the store schema for raw datasets). Returns its path relative to out_dir."""
+    relative = os.path.join(name, f"shard-{shard:05d}.parquet")
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if name in store.DATASETS:
+        table = table.cast(store.arrow_schema(name))
+    path = os.path.join(out_dir, relative)
+    pq.write_table(table, f"{path}.tmp")
+    os.replace(f"{path}.tmp", path)
+    return relative
+
+
+def generate_shard(shard, first_property, n_properties, seed_seq):
+    """Generate and write one shard (runs in a worker). Returns its manifest entry."""
+    start = time.perf_counter()
+    rng = np.random.default_rng(seed_seq)
+    props, units, tenants = generate_batch(_WORKER["stats"], first_property, n_properties, rng,
+                                           _WORKER["pools"], _WORKER["as_of"])
+    # Apply the store schema so the feature joins see the same dtypes as load_dataset()
+    props, units, tenants = (store.apply_schema(df, name) for df, name in
+                             ((props, "properties"), (units, "units"), (tenants, "tenants")))
+    frames = {
+        "properties": props,
+        "units": units,
+        "tenants": tenants,
+        "unit_features": build_unit_features(units, props),
+        "tenant_features": build_tenant_features(tenants, units, props),
+    }
+    files = {name: _write(df, name, _WORKER["out_dir"], shard) for name, df in frames.items()}
+    return {
+        "shard": shard,
+        "first_property": first_property,
+        "n_properties": n_properties,
+        "rows": {name: len(df) for name, df in frames.items()},
+        "files": files,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def shard_ranges(n_properties, shard_properties):
+    """[(shard, first_property, n_properties), ...] covering 0 .. n_properties - 1."""
+    return [(i, first, min(shard_properties, n_properties - first))
+            for i, first in enumerate(range(0, n_properties, shard_properties))]
+
+
+def generate_sharded(stats, n_properties, out_dir, seed=42, shard_properties=BATCH_PROPERTIES,
+                     workers=DEFAULT_WORKERS, as_of=None, progress=None):
+    """
+    Generate `n_properties` properties in shards on `workers` processes and
+    write the partitions plus `manifest.json` under `out_dir`.
+
+    Args:
+        stats: Rent (mu, sigma) per unit type from `calibrate_parameters`, or a `MarketCalibration`.
+        n_properties: Total properties.
+        out_dir: Output directory (created if needed).
+        seed: Root seed; shard i uses SeedSequence(seed).spawn(n_shards)[i].
+        shard_properties: Properties per shard (part of the output's identity, like the seed).
+        workers: Worker processes.
+        as_of: Date lease start dates count back from (default: today).
+        progress: Optional callback(done_shards, total_shards, entry) as shards finish.
+
+    Returns:
+        The manifest dict.
+    """
+    if pq is None:
+        raise ImportError("pyarrow is required for sharded generation")
+    start = time.perf_counter()
+    as_of = as_of or date.today()
+    for name in DATASETS:
+        os.makedirs(os.path.join(out_dir, name), exist_ok=True)
+
+    ranges = shard_ranges(n_properties, shard_properties)
+    seeds = np.random.SeedSequence(seed).spawn(len(ranges))
+    pools = NamePools.build(seed)
+    entries = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(stats, pools, as_of, out_dir)) as pool:
+        futures = [pool.submit(generate_shard, shard, first, n, seeds[shard]) for shard, first, n in ranges]
+        for future in as_completed(futures):
+            entries.append(future.result())
+            if progress is not None:
+                progress(len(entries), len(ranges), entries[-1])
+    entries.sort(key=lambda e: e["shard"])
+
+    manifest = {
+        "manifest_version": MANIFEST_VERSION,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "seed": seed,
+        "n_properties": n_properties,
+        "shard_properties": shard_properties,
+        "as_of": str(as_of),
+        "stats": stats_key(stats),
+        "workers": workers,
+        "seconds": round(time.perf_counter() - start, 2),
+        "datasets": {
+            name: {"rows": sum(e["rows"][name] for e in entries), "files": [e["files"][name] for e in entries]}
+            for name in DATASETS
+        },
+        "shards": entries,
+    }
+    # Written last (atomically): readers never see a manifest with missing partitions
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(f"{path}.tmp", path)
+    return manifest
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+    from src.data.synthetic.calibrate_and_generate import calibrate_parameters
+
+    parser = argparse.ArgumentParser(description="Generate a sharded synthetic portfolio on a process pool.")
+    parser.add_argument("--properties", type=int, default=100_000)
+    parser.add_argument("--out", default=os.path.join(store.STORE_DIR, "synthetic"))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--shard-properties", type=int, default=BATCH_PROPERTIES)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--calibration", action="store_true",
+                        help="Sample rents from the per-segment market calibration (calibration.py)")
+    args = parser.parse_args()
+
+    stats = load_calibration() if args.calibration else calibrate_parameters(store.csv_path("listings"))
+
+    def report(done, total, entry):
+        print(f"🔄 Shard {entry['shard']} done ({done}/{total}): {entry['rows']['units']:,} units in {entry['seconds']:.2f}s")
+
+    manifest = generate_sharded(stats, args.properties, args.out, seed=args.seed,
+                                shard_properties=args.shard_properties, workers=args.workers, progress=report)
+    units = manifest["datasets"]["units"]["rows"]
+    print(f"\n✅ {args.properties:,} properties, {units:,} units, {manifest['datasets']['tenants']['rows']:,} tenants "
+          f"in {manifest['seconds']:.1f}s on {args.workers} worker(s) ({units / manifest['seconds']:,.0f} units/s)")
+    print(f"   SYNTHETIC_MANIFEST={os.path.join(args.out, MANIFEST_NAME)}")
@@ -0,0 +1,196 @@
+"""
+Streaming synthetic portfolio writer with constant memory and resume.
+
+`generate_calibrated_data` keeps every property, unit and tenant in Python
+lists until the end. `stream_generate` instead takes batches of
+`batch_properties` properties from `vectorized.iter_batches` and appends each
+one to the calibrated CSVs before generating the next. Peak memory depends on
+the batch size, not on the portfolio size.
+
+After every batch the files are flushed and `_checkpoint.json` records the
+next property and each file's byte length. An interrupted run resumed with the
+same arguments truncates any partly written batch and continues from the last
+completed property. Because batch i always draws from `batch_rng(seed, i)`, the
+resumed files are byte-identical to an uninterrupted run. A resume refuses to
+start if an output file is missing or shorter than the checkpoint says.
+
+Usage:
+    python -m src.data.synthetic.streaming --properties 200000 --out /tmp/portfolio
+    python -m src.data.synthetic.streaming --properties 200000 --out /tmp/portfolio   # resumes if interrupted
+"""
+import json
+import os
+import sys
+import time
+from datetime import date, datetime
+
+from src.data.synthetic.calibration import load_calibration, stats_key
+from src.data.synthetic.vectorized import BATCH_PROPERTIES, NamePools, iter_batches
+
+CHECKPOINT_NAME = "_checkpoint.json"
+OUTPUT_FILES = {
+    "properties": "calibrated_properties.csv",
+    "units": "calibrated_units.csv",
+    "tenants": "calibrated_tenants.csv",
+}
+# Must match between a run and its resume
+RESUME_KEYS = ("seed", "batch_properties", "as_of", "stats")
+
+
+def _peak_rss_mb():
+    """Peak resident memory in MB, or None where `resource` is missing (Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is in bytes on macOS and KiB on Linux
+    per_mb = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / per_mb, 1)
+
+
+def _read_checkpoint(out_dir):
+    path = os.path.join(out_dir, CHECKPOINT_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_checkpoint(out_dir, checkpoint):
+    path = os.path.join(out_dir, CHECKPOINT_NAME)
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(f"{path}.tmp", path)
+
+
+def _check_outputs(out_dir, checkpoint):
+    """Raise if an output file is missing or shorter than the checkpoint's byte count."""
+    for name, filename in OUTPUT_FILES.items():
+        path = os.path.join(out_dir, filename)
+        expected = checkpoint["bytes"][name]
+        size = os.path.getsize(path) if os.path.exists(path) else None
+        if expected and (size is None or size < expected):
+            found = "missing" if size is None else f"{size:,} bytes"
+            raise ValueError(f"Cannot resume {out_dir}: {filename} is {found}, the checkpoint expects at least "
+                             f"{expected:,} bytes; use resume=False (--restart) to start over")
+
+
+def _append(f, df):
+    """Append a batch as CSV rows (header only at the start of the file). Returns the new byte length."""
+    df.to_csv(f, header=f.tell() == 0, index=False, encoding="utf-8")
+    f.flush()
+    os.fsync(f.fileno())
+    return f.tell()
+
+
+def stream_generate(stats, n_properties, out_dir, seed=42, batch_properties=BATCH_PROPERTIES, as_of=None,
+                    progress=None, resume=True):
+    """
+    Generate `n_properties` properties batch by batch, appending to the
+    calibrated CSVs in `out_dir`.
+
+    Args:
+        stats: Rent (mu, sigma) per unit type from `calibrate_parameters`, or a `MarketCalibration`.
+        n_properties: Total properties. A resume can change it only when the properties
+            already written end on a batch boundary and n_properties is not below them.
+        out_dir: Output directory.
+        seed: Root seed; batch i uses `batch_rng(seed, i)`.
+        batch_properties: Properties per batch; bounds memory.
+        as_of: Date lease starts count back from (default: today, or the checkpoint's on resume).
+        progress: Optional callback(done_properties, n_properties, rows) after each batch.
+        resume: Continue from `_checkpoint.json` if present; otherwise start over.
+
+    Returns:
+        The final checkpoint dict (rows written per dataset, timings, peak RSS).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    settings = {
+        "seed": seed,
+        "batch_properties": batch_properties,
+        "as_of": str(as_of or date.today()),
+        "stats": stats_key(stats),
+    }
+    checkpoint = _read_checkpoint(out_dir) if resume else None
+    if checkpoint is not None:
+        if as_of is None:
+            settings["as_of"] = checkpoint["as_of"]
+        mismatched = [k for k in RESUME_KEYS if checkpoint[k] != settings[k]]
+        if mismatched:
+            raise ValueError(f"Cannot resume {out_dir}: {mismatched} differ from the checkpoint; "
+                             f"use resume=False (--restart) to start over")
+        done = checkpoint["next_property"]
+        if n_properties != checkpoint["n_properties"] and (done % batch_properties or n_properties < done):
+            # A partial last batch is drawn differently from the full batch a larger run would write
+            raise ValueError(f"Cannot resume {out_dir} with n_properties={n_properties}: {done} properties are "
+                             f"written, and n_properties can only change from {checkpoint['n_properties']} when "
+                             f"that is a multiple of batch_properties ({batch_properties}) and not above "
+                             f"n_properties; use resume=False (--restart) to start over")
+        _check_outputs(out_dir, checkpoint)
+    else:
+        checkpoint = {**settings, "next_property": 0, "bytes": {name: 0 for name in OUTPUT_FILES},
+                      "rows": {name: 0 for name in OUTPUT_FILES}, "seconds": 0.0}
+    checkpoint["n_properties"] = n_properties
+
+    start = time.perf_counter()
+    files = {}
+    try:
+        for name, filename in OUTPUT_FILES.items():
+            path = os.path.join(out_dir, filename)
+            # Binary mode: tell() / truncate() offsets are bytes, whatever the locale encoding
+            mode = "r+b" if os.path.exists(path) else "w+b"
+            files[name] = open(path, mode)
+            # Drop anything written after the last completed batch
+            files[name].truncate(checkpoint["bytes"][name])
+            files[name].seek(checkpoint["bytes"][name])
+
+        pools = NamePools.build(seed)
+        batches = iter_batches(stats, n_properties, seed, batch_properties, settings["as_of"], pools,
+                               start_property=checkpoint["next_property"])
+        for props, units, tenants in batches:
+            for name, df in (("properties", props), ("units", units), ("tenants", tenants)):
+                checkpoint["bytes"][name] = _append(files[name], df)
+                checkpoint["rows"][name] += len(df)
+            checkpoint["next_property"] += len(props)
+            checkpoint["updated_at"] = datetime.now().isoformat(timespec="seconds")
+            _write_checkpoint(out_dir, checkpoint)
+            if progress is not None:
+                progress(checkpoint["next_property"], n_properties, dict(checkpoint["rows"]))
+    finally:
+        for f in files.values():
+            f.close()
+
+    checkpoint["seconds"] = round(checkpoint["seconds"] + time.perf_counter() - start, 2)
+    checkpoint["peak_rss_mb"] = _peak_rss_mb()
+    _write_checkpoint(out_dir, checkpoint)
+    return checkpoint
+
+
+if __name__ == "__main__":
+    import argparse
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+    from src.data.store import csv_path
+    from src.data.synthetic.calibrate_and_generate import calibrate_parameters
+
+    parser = argparse.ArgumentParser(description="Stream a calibrated synthetic portfolio to CSV in batches.")
+    parser.add_argument("--properties", type=int, default=100_000)
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-properties", type=int, default=BATCH_PROPERTIES)
+    parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint and start over")
+    parser.add_argument("--calibration", action="store_true",
+                        help="Sample rents from the per-segment market calibration (calibration.py)")
+    args = parser.parse_args()
+
+    stats = load_calibration() if args.calibration else calibrate_parameters(csv_path("listings"))
+
+    def rss(mb):
+        return f", peak RSS {mb:.0f} MB" if mb is not None else ""
+
+    def report(done, total, rows):
+        print(f"🔄 {done:,}/{total:,} properties ({done / total:.0%}): {rows['units']:,} units, "
+              f"{rows['tenants']:,} tenants{rss(_peak_rss_mb())}")
+
+    result = stream_generate(stats, args.properties, args.out, seed=args.seed,
+                             batch_properties=args.batch_properties, progress=report, resume=not args.restart)
+    print(f"\n✅ {result['rows']['units']:,} units in {args.out} ({result['seconds']:.1f}s total"
+          f"{rss(result['peak_rss_mb'])})")
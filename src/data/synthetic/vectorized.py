@@ -0,0 +1,266 @@
+"""
+Vectorized, seeded version of `generate_calibrated_data`.
+
+`calibrate_and_generate.generate_calibrated_data` loops over every property and
+unit, drawing each value with a separate `np.random` / `random` / Faker call.
+This module draws whole columns at once for a batch of properties:
+
+- unit types, rents, sqft, occupancy, incomes, credit scores and lease dates
+  are NumPy arrays from one `np.random.Generator` per batch;
+- names come from pools of first/last names built once (Faker is called a few
+  thousand times, not once per row);
+- ids are built with `np.char` instead of f-strings.
+
+The output has the same columns as the calibrated CSVs. The same seed, batch
+size and `as_of` date always give the same portfolio.
+
+Usage:
+    python -m src.data.synthetic.vectorized --properties 20000 --seed 42
+    python -m src.data.synthetic.vectorized --properties 30 --seed 42 --out /tmp/portfolio
+    python -m src.data.synthetic.vectorized --properties 300 --compare   # vs the per-row loop
+"""
+import itertools
+import os
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from src.data.synthetic.calibration import MarketCalibration, load_calibration
+
+try:
+    from faker import Faker
+except ImportError:  # small built-in pools instead
+    Faker = None
+
+# Same distributions as generate_calibrated_data
+NEIGHBORHOODS = np.array(['Tribeca', 'Financial District', 'Upper East Side', 'Harlem', 'East Village'])
+LOCATION_MULTIPLIER = {'Tribeca': 1.4, 'Harlem': 0.7}  # others 1.0
+CLASSES = np.array(['A', 'B', 'B', 'C'])
+NAME_SUFFIXES = np.array(['Towers', 'Court', 'Lofts'])
+UNIT_TYPES = np.array(['Studio', '1BD', '2BD', '3BD'])
+UNIT_TYPE_WEIGHTS = [0.2, 0.4, 0.3, 0.1]
+SQFT_BASE = {'Studio': 500, '1BD': 750, '2BD': 1000, '3BD': 1400}
+SQFT_SIGMA = 50
+DEFAULT_RENT = (3000, 500)
+RENT_FLOOR = 500
+AMENITIES = ['View', 'Doorman', 'Gym', 'Laundry']
+UNITS_PER_PROPERTY = (20, 100)
+OCCUPANCY = 0.92
+INCOME_RENT_MULTIPLE = 40
+INCOME_SIGMA = 0.2
+CREDIT_SCORE = (700, 50)
+LEASE_DAYS = 730  # leases started within the last two years
+
+NAME_POOL_SIZE = 2000
+BATCH_PROPERTIES = 5000
+
+# random.sample(AMENITIES, k) for every ordering and k, so rows pick an entry
+# by index instead of building a list each
+_AMENITY_PERMUTATIONS = list(itertools.permutations(AMENITIES))
+_AMENITY_LISTS = np.empty(len(_AMENITY_PERMUTATIONS) * (len(AMENITIES) + 1), dtype=object)
+for _p, _perm in enumerate(_AMENITY_PERMUTATIONS):
+    for _k in range(len(AMENITIES) + 1):
+        _AMENITY_LISTS[_p * (len(AMENITIES) + 1) + _k] = list(_perm[:_k])
+
+_FALLBACK_FIRST = ['James', 'Mary', 'Robert', 'Patricia', 'John', 'Jennifer', 'Michael', 'Linda', 'David',
+                   'Elizabeth', 'William', 'Barbara', 'Richard', 'Susan', 'Joseph', 'Jessica', 'Thomas', 'Sarah']
+_FALLBACK_LAST = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez',
+                  'Martinez', 'Hernandez', 'Lopez', 'Gonzalez', 'Wilson', 'Anderson', 'Thomas', 'Taylor', 'Moore']
+
+
+class NamePools:
+    """
+    First and last names drawn once and sampled by index.
+
+    Args:
+        first: Array of first names.
+        last: Array of last names.
+    """
+
+    def __init__(self, first, last):
+        self.first = np.asarray(first, dtype=str)
+        self.last = np.asarray(last, dtype=str)
+
+    @classmethod
+    def build(cls, seed=None, size=NAME_POOL_SIZE):
+        """Unique Faker names (seeded), or a small built-in list without Faker."""
+        if Faker is None:
+            return cls(_FALLBACK_FIRST, _FALLBACK_LAST)
+        fake = Faker()
+        fake.seed_instance(seed)
+        first = {fake.first_name() for _ in range(size)}
+        last = {fake.last_name() for _ in range(size)}
+        return cls(sorted(first), sorted(last))
+
+    def full_names(self, rng, n):
+        first = self.first[rng.integers(0, len(self.first), size=n)]
+        last = self.last[rng.integers(0, len(self.last), size=n)]
+        return np.char.add(np.char.add(first, " "), last)
+
+    def last_names(self, rng, n):
+        return self.last[rng.integers(0, len(self.last), size=n)]
+
+
+def _ids(prefix, numbers, width=3):
+    return np.char.add(prefix, np.char.zfill(np.asarray(numbers).astype(str), width))
+
+
+def hex_ids(rng, n):
+    """8-character hex ids (like uuid4()[:8])."""
+    words = rng.integers(0, 2 ** 32, size=n, dtype=np.uint32).astype('>u4')
+    return np.frombuffer(words.tobytes().hex().encode(), dtype='S8').astype(str)
+
+
+def _rent_params(stats):
+    mu = np.array([stats.get(t, DEFAULT_RENT)[0] for t in UNIT_TYPES], dtype=float)
+    sigma = np.array([stats.get(t, DEFAULT_RENT)[1] for t in UNIT_TYPES], dtype=float)
+    return mu, sigma
+
+
+def generate_batch(stats, first_property, n_properties, rng, pools, as_of=None):
+    """
+    Properties `first_property .. first_property + n_properties - 1` with their
+    units and tenants, as (properties, units, tenants) DataFrames.
+
+    `stats` is either the (mu, sigma) per unit type from `calibrate_parameters`
+    or a `calibration.MarketCalibration` to sample rents from.
+    """
+    as_of = np.datetime64(as_of or date.today(), 'D')
+
+    # --- Properties ---
+    property_ids = _ids("PROP_", np.arange(first_property, first_property + n_properties))
+    neighborhood_idx = rng.integers(0, len(NEIGHBORHOODS), size=n_properties)
+    neighborhoods = NEIGHBORHOODS[neighborhood_idx]
+    names = np.char.add(np.char.add(pools.last_names(rng, n_properties), " "),
+                           NAME_SUFFIXES[rng.integers(0, len(NAME_SUFFIXES), size=n_properties)])
+    props = pd.DataFrame({
+        'property_id': property_ids,
+        'name': names,
+        'neighborhood': neighborhoods,
+        'class': CLASSES[rng.integers(0, len(CLASSES), size=n_properties)],
+    })
+
+    # --- Units (one row per unit, properties repeated) ---
+    low, high = UNITS_PER_PROPERTY
+    units_per_property = rng.integers(low, high + 1, size=n_properties)
+    n_units = int(units_per_property.sum())
+    owner = np.repeat(np.arange(n_properties), units_per_property)
+    # Position of each unit within its property: 0, 1, ... per property
+    unit_number = np.arange(n_units) - np.repeat(np.cumsum(units_per_property) - units_per_property, units_per_property)
+
+    type_idx = rng.choice(len(UNIT_TYPES), size=n_units, p=UNIT_TYPE_WEIGHTS)
+    # Neighborhood multiplier (Tribeca is pricier than Harlem)
+    loc_mult = np.array([LOCATION_MULTIPLIER.get(n, 1.0) for n in NEIGHBORHOODS])
+    unit_neighborhood = neighborhood_idx[owner]
+    if isinstance(stats, MarketCalibration):
+        # Per-(type, location cluster) quantiles already price the location in;
+        # neighborhoods without a cluster get the pooled type and the multiplier
+        rows, pooled = stats.segment_table(UNIT_TYPES, NEIGHBORHOODS)
+        base_rent = stats.sample(rng, rows[type_idx, unit_neighborhood])
+        base_rent = np.where(pooled[unit_neighborhood], base_rent * loc_mult[unit_neighborhood], base_rent)
+    else:
+        mu, sigma = _rent_params(stats)
+        base_rent = rng.normal(mu[type_idx], sigma[type_idx]) * loc_mult[unit_neighborhood]
+    market_rent = np.maximum(base_rent, RENT_FLOOR).astype(np.int64)  # Floor at $500
+    sqft_base = np.array([SQFT_BASE[t] for t in UNIT_TYPES], dtype=float)
+    sqft = rng.normal(sqft_base[type_idx], SQFT_SIGMA).astype(np.int64)
+    n_amenities = rng.integers(0, len(AMENITIES) + 1, size=n_units)
+    permutation = rng.integers(0, len(_AMENITY_PERMUTATIONS), size=n_units)
+
+    unit_ids = np.char.add(np.char.add(property_ids[owner], "_U"), np.char.zfill(unit_number.astype(str), 3))
+    units = pd.DataFrame({
+        'unit_id': unit_ids,
+        'property_id': property_ids[owner],
+        'type': UNIT_TYPES[type_idx],
+        'amenities': _AMENITY_LISTS[permutation * (len(AMENITIES) + 1) + n_amenities],
+        'sqft': sqft,
+        'market_rent': market_rent,
+    })
+
+    # --- Tenants (occupied units only) ---
+    occupied = np.flatnonzero(rng.random(n_units) < OCCUPANCY)
+    n_tenants = len(occupied)
+    expected_income = market_rent[occupied] * INCOME_RENT_MULTIPLE  # 40x rent rule generally
+    tenants = pd.DataFrame({
+        'tenant_id': hex_ids(rng, n_tenants),
+        'unit_id': unit_ids[occupied],
+        'name': pools.full_names(rng, n_tenants),
+        'income': rng.normal(expected_income, expected_income * INCOME_SIGMA).astype(np.int64),
+        'credit_score': rng.normal(*CREDIT_SCORE, size=n_tenants).astype(np.int64),
+        'lease_start': as_of - rng.integers(0, LEASE_DAYS + 1, size=n_tenants).astype('timedelta64[D]'),
+    })
+    return props, units, tenants
+
+
+def batch_rng(seed, index):
+    """Generator for batch `index`: that of `SeedSequence(seed).spawn(n)[index]`, without spawning the rest."""
+    root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    return np.random.default_rng(np.random.SeedSequence(root.entropy, spawn_key=root.spawn_key + (index,)))
+
+
+def iter_batches(stats, n_properties=30, seed=None, batch_properties=BATCH_PROPERTIES, as_of=None, pools=None,
+                 start_property=0):
+    """
+    Yield (properties, units, tenants) for consecutive batches of `batch_properties`
+    properties, starting at `start_property` (a batch boundary). Each batch has its
+    own generator (`batch_rng`), so any batch can be regenerated on its own, and the
+    output matches `sharded.py` with the same seed and shard size.
+    """
+    if start_property % batch_properties:
+        raise ValueError(f"start_property {start_property} is not a multiple of batch_properties {batch_properties}")
+    root = np.random.SeedSequence(seed)
+    pools = pools or NamePools.build(seed)
+    for first in range(start_property, n_properties, batch_properties):
+        rng = batch_rng(root, first // batch_properties)
+        yield generate_batch(stats, first, min(batch_properties, n_properties - first), rng, pools, as_of)
+
+
+def generate_vectorized(stats, n_properties=30, seed=None, batch_properties=BATCH_PROPERTIES, as_of=None):
+    """Drop-in for `generate_calibrated_data(stats, n_properties)`: (properties, units, tenants)."""
+    batches = list(iter_batches(stats, n_properties, seed, batch_properties, as_of))
+    return tuple(pd.concat(frames, ignore_index=True) for frames in zip(*batches))
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+    from src.data.store import csv_path
+    from src.data.synthetic.calibrate_and_generate import calibrate_parameters, generate_calibrated_data
+
+    parser = argparse.ArgumentParser(description="Generate a calibrated synthetic portfolio with NumPy.")
+    parser.add_argument("--properties", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="Directory for calibrated_{properties,units,tenants}.csv (default: no files)")
+    parser.add_argument("--compare", action="store_true", help="Also time generate_calibrated_data on the same size")
+    parser.add_argument("--calibration", action="store_true",
+                        help="Sample rents from the per-segment market calibration (calibration.py)")
+    args = parser.parse_args()
+
+    stats = load_calibration() if args.calibration else calibrate_parameters(csv_path("listings"))
+
+    start = time.perf_counter()
+    props_df, units_df, tenants_df = generate_vectorized(stats, args.properties, seed=args.seed)
+    elapsed = time.perf_counter() - start
+    print(f"\n✅ {len(props_df):,} properties, {len(units_df):,} units, {len(tenants_df):,} tenants "
+          f"in {elapsed:.2f}s ({len(units_df) / elapsed:,.0f} units/s)")
+
+    again = generate_vectorized(stats, args.properties, seed=args.seed)
+    assert all(a.equals(b) for a, b in zip((props_df, units_df, tenants_df), again)), "same seed, different output"
+    print("✅ Same seed reproduces the portfolio")
+
+    if args.compare and not args.calibration:
+        start = time.perf_counter()
+        _, loop_units, _ = generate_calibrated_data(stats, args.properties)
+        loop_s = time.perf_counter() - start
+        print(f"⏱️ Per-row loop: {loop_s:.2f}s for {len(loop_units):,} units "
+              f"({len(loop_units) / loop_s:,.0f} units/s, {loop_s / len(loop_units) * len(units_df) / elapsed:.0f}x slower)")
+
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+        props_df.to_csv(os.path.join(args.out, "calibrated_properties.csv"), index=False)
+        units_df.to_csv(os.path.join(args.out, "calibrated_units.csv"), index=False)
+        tenants_df.to_csv(os.path.join(args.out, "calibrated_tenants.csv"), index=False)
+        print(f"✅ Wrote calibrated CSVs to {args.out}")
@@ -0,0 +1,159 @@
+"""
+Micro-batching dispatcher for single-row inference requests.
+
+Concurrent `/predict/*` calls each submit one feature row to a `MicroBatcher`.
+A worker task collects rows for up to `max_wait_ms` (or until `max_batch_size`
+rows are queued), scores them with one batched predict in a worker thread, and
+resolves every caller's future with its own row of the result. The event loop
+never blocks on the model, and the per-call pipeline overhead is paid once per
+batch instead of once per request.
+"""
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_BATCH_SIZE = int(os.getenv("BATCH_MAX_SIZE", "32"))
+DEFAULT_MAX_WAIT_MS = float(os.getenv("BATCH_MAX_WAIT_MS", "2"))
+
+
+class BatchStats:
+    """Batch size, queue wait and predict latency for one dispatcher."""
+
+    def __init__(self, max_samples=1000):
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.requests = 0
+        self.errors = 0
+        self.largest_batch = 0
+        self.size_counts = {}
+        self.waits_ms = deque(maxlen=max_samples)
+        self.predict_ms = deque(maxlen=max_samples)
+
+    def record(self, size, waits_ms, predict_ms):
+        with self._lock:
+            self.batches += 1
+            self.requests += size
+            self.largest_batch = max(self.largest_batch, size)
+            self.size_counts[size] = self.size_counts.get(size, 0) + 1
+            self.waits_ms.extend(waits_ms)
+            self.predict_ms.append(predict_ms)
+
+    def record_error(self):
+        with self._lock:
+            self.errors += 1
+
+    @staticmethod
+    def _percentiles(values):
+        if not values:
+            return None
+        arr = np.asarray(values, dtype=float)
+        return {q: round(float(np.percentile(arr, int(q[1:]))), 3) for q in ("p50", "p95", "p99")}
+
+    def summary(self):
+        with self._lock:
+            return {
+                "batches": self.batches,
+                "requests": self.requests,
+                "errors": self.errors,
+                "mean_batch_size": round(self.requests / self.batches, 2) if self.batches else None,
+                # Largest batch seen; MicroBatcher.status() reports the configured max_batch_size
+                "largest_batch": self.largest_batch,
+                "batch_sizes": dict(sorted(self.size_counts.items())),
+                "queue_wait_ms": self._percentiles(list(self.waits_ms)),
+                "predict_ms": self._percentiles(list(self.predict_ms)),
+            }
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-row predictions into batched calls.
+
+    Args:
+        name: Label used in logs and stats (e.g. 'valuation').
+        predict_fn: Callable taking a DataFrame and returning one result row per input row
+            (e.g. `slot.predict` or `slot.predict_proba`).
+        max_batch_size: Upper bound on rows per predict call.
+        max_wait_ms: How long the first queued row waits for company before dispatch.
+    """
+
+    def __init__(self, name, predict_fn, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+        self.name = name
+        self.predict_fn = predict_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000
+        self.stats = BatchStats()
+        self._queue = None
+        self._worker = None
+        self._loop = None
+
+    def _ensure_worker(self):
+        # Queue and worker are bound to the running loop; recreate them if the
+        # app is served from a new loop (e.g. a restarted TestClient).
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run(), name=f"batcher-{self.name}")
+
+    async def submit(self, row):
+        """Queue one feature dict and wait for its prediction."""
+        self._ensure_worker()
+        future = self._loop.create_future()
+        await self._queue.put((row, future, time.perf_counter()))
+        return await future
+
+    async def _collect(self):
+        batch = [await self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                # Take whatever is already queued without waiting further
+                while len(batch) < self.max_batch_size and not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            dispatched = time.perf_counter()
+            waits_ms = [(dispatched - queued) * 1000 for _, _, queued in batch]
+            # Any failure fails this batch's futures; the worker keeps serving the queue
+            try:
+                rows = pd.DataFrame([row for row, _, _ in batch])
+                start = time.perf_counter()
+                result = await loop.run_in_executor(None, self.predict_fn, rows)
+                predict_ms = (time.perf_counter() - start) * 1000
+                result = np.asarray(result)
+                if result.ndim == 0 or len(result) != len(batch):
+                    raise ValueError(f"{self.name}: predict_fn returned {result.shape} for a batch of {len(batch)} rows")
+                for i, (_, future, _) in enumerate(batch):
+                    if not future.done():
+                        future.set_result(result[i])
+            except Exception as e:
+                self.stats.record_error()
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.stats.record(len(batch), waits_ms, predict_ms)
+
+    def status(self):
+        return {
+            "name": self.name,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            **self.stats.summary(),
+        }
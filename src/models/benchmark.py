@@ -0,0 +1,235 @@
+"""
+Inference benchmarks for registered models.
+
+For every model version loaded through `ModelRegistry`, measures single-row
+latency (p50/p95/p99) and batch throughput from 1 to 100k rows on each
+available engine:
+
+- `pipeline`: the registered artifact called with a DataFrame (what the API
+  did before the compiled path; includes pandas/ColumnTransformer overhead).
+- `native`: the final estimator on a pre-encoded NumPy matrix (XGBoost via
+  `inplace_predict`), i.e. the cost of the trees alone.
+- `compiled`: `CompiledModel` from src/models/compiled.py (dict input for
+  single rows, DataFrame columns for batches).
+
+Results are merged into the version's registry metrics under `benchmark`, so
+versions can be compared on speed as well as MAE/AUC.
+
+Usage:
+    python -m src.models.benchmark                         # production versions
+    python -m src.models.benchmark --all-versions --no-save
+    python -m src.models.benchmark --models churn_risk_model --batch-sizes 1 100 10000
+"""
+import os
+import platform
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_BATCH_SIZES = (1, 10, 100, 1000, 10000, 100000)
+ENGINES = ("pipeline", "native", "compiled")
+LATENCY_CALLS = 200
+MIN_BATCH_SECONDS = 0.3
+
+
+def _prediction_fn(model):
+    """predict_proba[:, 1] for classifiers, predict otherwise."""
+    if hasattr(model, "predict_proba") and getattr(model, "kind", "classifier") == "classifier":
+        return lambda X: model.predict_proba(X)[:, 1]
+    return model.predict
+
+
+def _native_engine(model):
+    """
+    (encode, predict) for the final estimator on a pre-encoded matrix,
+    or None if the artifact is not a Pipeline.
+    """
+    if not hasattr(model, "steps"):
+        return None
+    preprocess, estimator = model[:-1], model.steps[-1][1]
+    if hasattr(estimator, "get_booster"):
+        # Returns the positive-class probability for binary:logistic
+        predict = estimator.get_booster().inplace_predict
+    else:
+        predict = _prediction_fn(estimator)
+
+    def encode(df):
+        X = preprocess.transform(df)
+        if isinstance(X, pd.DataFrame):
+            return X  # native categoricals (valuation v5) stay a typed frame
+        X = X.toarray() if hasattr(X, "toarray") else X
+        return np.ascontiguousarray(X, dtype=np.float32)
+
+    return encode, predict
+
+
+def _compiled_engine(registry, name, version, model):
+    """CompiledModel for the version: the exported artifact, else compiled in memory."""
+    from src.models.compiled import compile_pipeline, load_compiled
+
+    compiled = load_compiled(registry, name, version)
+    if compiled is None and hasattr(model, "steps"):
+        try:
+            compiled = compile_pipeline(model)
+        except NotImplementedError:
+            return None
+    return compiled
+
+
+def _sample_frame(source, columns, n, seed=0):
+    rng = np.random.default_rng(seed)
+    idx = rng.integers(0, len(source), size=n)
+    return source[columns].iloc[idx].reset_index(drop=True)
+
+
+def measure_latency(fn, rows, calls=LATENCY_CALLS):
+    """Per-call latency in ms over `calls` single-row inputs (cycled)."""
+    fn(rows[0])  # warm-up
+    timings = np.empty(calls)
+    for i in range(calls):
+        row = rows[i % len(rows)]
+        start = time.perf_counter()
+        fn(row)
+        timings[i] = time.perf_counter() - start
+    timings *= 1000
+    return {
+        "p50": round(float(np.percentile(timings, 50)), 4),
+        "p95": round(float(np.percentile(timings, 95)), 4),
+        "p99": round(float(np.percentile(timings, 99)), 4),
+    }
+
+
+def measure_throughput(fn, batch, n_rows, min_seconds=MIN_BATCH_SECONDS):
+    """Rows per second, repeating the call until `min_seconds` have elapsed (at least once)."""
+    fn(batch)  # warm-up
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        fn(batch)
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            break
+    return round(n_rows * calls / elapsed, 1)
+
+
+def benchmark_model(registry, name, version, source, batch_sizes=DEFAULT_BATCH_SIZES,
+                    engines=ENGINES, latency_calls=LATENCY_CALLS):
+    """
+    Benchmark one registered version on `source` rows (sampled with replacement).
+
+    Returns the `benchmark` metrics dict, or None if the version expects
+    columns `source` does not have.
+    """
+    model = registry.load_model(name, version)
+    columns = [str(c) for c in getattr(model, "feature_names_in_", source.columns)]
+    missing = [c for c in columns if c not in source.columns]
+    if missing:
+        print(f"⚠️ {name} v{version}: skipped, expects columns {missing} not in the benchmark data")
+        return None
+
+    max_rows = max(batch_sizes)
+    data = _sample_frame(source, columns, max(max_rows, latency_calls))
+    single_frames = [data.iloc[[i]] for i in range(latency_calls)]
+    results = {}
+
+    if "pipeline" in engines:
+        fn = _prediction_fn(model)
+        results["pipeline"] = {
+            "latency_ms": measure_latency(fn, single_frames, latency_calls),
+            "rows_per_s": {str(n): measure_throughput(fn, data.iloc[:n], n) for n in batch_sizes},
+        }
+
+    native = _native_engine(model) if "native" in engines else None
+    if native is not None:
+        encode, predict = native
+        encoded = encode(data)
+        results["native"] = {
+            "latency_ms": measure_latency(predict, [encoded[i:i + 1] for i in range(latency_calls)], latency_calls),
+            "rows_per_s": {str(n): measure_throughput(predict, encoded[:n], n) for n in batch_sizes},
+            "encode_rows_per_s": measure_throughput(encode, data.iloc[:min(max_rows, 10000)], min(max_rows, 10000)),
+        }
+
+    compiled = _compiled_engine(registry, name, version, model) if "compiled" in engines else None
+    if compiled is not None:
+        fn = _prediction_fn(compiled)
+        records = data.iloc[:latency_calls].to_dict("records")
+        results["compiled"] = {
+            "latency_ms": measure_latency(fn, records, latency_calls),
+            "rows_per_s": {str(n): measure_throughput(fn, data.iloc[:n], n) for n in batch_sizes},
+        }
+
+    return {
+        "measured_at": datetime.now().isoformat(timespec="seconds"),
+        "host": _host_info(),
+        "engines": results,
+    }
+
+
+def _host_info():
+    import sklearn
+    info = {"python": platform.python_version(), "cpu_count": os.cpu_count(),
+            "machine": platform.machine(), "sklearn": sklearn.__version__}
+    try:
+        import xgboost
+        info["xgboost"] = xgboost.__version__
+    except ImportError:
+        pass
+    return info
+
+
+def benchmark_table(name, version, benchmark):
+    """Flatten a benchmark dict into one row per engine for printing."""
+    rows = []
+    for engine, stats in benchmark["engines"].items():
+        row = {"model": name, "version": version, "engine": engine,
+               "p50_ms": stats["latency_ms"]["p50"], "p99_ms": stats["latency_ms"]["p99"]}
+        row.update({f"rps@{n}": rate for n, rate in stats["rows_per_s"].items()})
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    import warnings
+    sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+    from src.models.compiled import _parity_frames
+    from src.models.registry import ModelRegistry
+
+    parser = argparse.ArgumentParser(description="Benchmark registered models across batch sizes and engines.")
+    parser.add_argument("--models", nargs="+", default=["rent_valuation_model", "churn_risk_model"])
+    parser.add_argument("--all-versions", action="store_true", help="Benchmark every registered version, not just production")
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=list(DEFAULT_BATCH_SIZES))
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=list(ENGINES))
+    parser.add_argument("--latency-calls", type=int, default=LATENCY_CALLS)
+    parser.add_argument("--no-save", action="store_true", help="Print results without writing them to the registry")
+    args = parser.parse_args()
+
+    # Artifacts pickled with an older sklearn still load; keep the report readable
+    warnings.filterwarnings("ignore", category=UserWarning)
+
+    registry = ModelRegistry()
+    frames = _parity_frames()
+    listing = registry.list_models()
+    tables = []
+    for name in args.models:
+        if args.all_versions:
+            versions = sorted(listing.loc[listing["name"] == name, "version"].tolist())
+        else:
+            versions = [registry.get_alias(name, "production") or registry.get_latest_version(name)]
+        for version in versions:
+            result = benchmark_model(registry, name, int(version), frames[name], args.batch_sizes,
+                                     args.engines, args.latency_calls)
+            if result is None:
+                continue
+            tables.append(benchmark_table(name, int(version), result))
+            if not args.no_save:
+                registry.update_metrics(name, int(version), {"benchmark": result})
+                print(f"✅ Saved benchmark for {name} v{version} to the registry")
+
+    if tables:
+        print()
+        print(pd.concat(tables, ignore_index=True).to_string(index=False))
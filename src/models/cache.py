@@ -0,0 +1,122 @@
+"""
+Registry-backed model cache shared by every API endpoint.
+
+Models are resolved by name/version through `ModelRegistry`, checked against
+their recorded sha256, loaded with `joblib` memory mapping (large numpy arrays
+such as tree node tables stay on disk and are paged in by the OS), and kept in
+a size-bounded LRU so a handful of versions can be served side by side without
+reloading.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+from src.models.registry import ModelRegistry
+
+DEFAULT_MAX_ENTRIES = int(os.getenv("MODEL_CACHE_MAX_ENTRIES", "4"))
+DEFAULT_MAX_BYTES = int(os.getenv("MODEL_CACHE_MAX_MB", "1024")) * 1024 * 1024
+
+
+class ModelCache:
+    """
+    LRU of loaded model versions keyed by (name, version).
+
+    Args:
+        registry: ModelRegistry used to resolve names/versions to artifacts.
+        max_entries: Maximum number of model versions held at once.
+        max_bytes: Budget on the summed artifact size of held versions.
+        mmap: Memory-map arrays on load (ignored by joblib for compressed artifacts).
+    """
+
+    def __init__(self, registry=None, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES, mmap=True):
+        self.registry = registry or ModelRegistry()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.mmap_mode = "r" if mmap else None
+        self._entries = OrderedDict()  # (name, version) -> (model, size_bytes)
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def get(self, name, version=None):
+        """Return the model for name/version (latest if version is None)."""
+        return self.get_with_version(name, version)[1]
+
+    def get_with_version(self, name, version=None):
+        """Return (resolved_version, model), loading through the registry on a miss."""
+        resolved_version, path = self.registry.resolve(name, version)
+        key = (name, resolved_version)
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return resolved_version, self._entries[key][0]
+
+        # Load outside the global lock so hits on other models are not blocked;
+        # the per-key lock stops concurrent misses from loading the same artifact twice.
+        with self._key_lock(key):
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return resolved_version, self._entries[key][0]
+            model = self.registry.load_artifact(name, resolved_version, path, mmap_mode=self.mmap_mode)
+            size = os.path.getsize(path)
+            with self._lock:
+                self.misses += 1
+                self._entries[key] = (model, size)
+                self._evict()
+            print(f"✅ Loaded '{name}' v{resolved_version} into model cache ({size / 1e6:.1f} MB)")
+        return resolved_version, model
+
+    def _evict(self):
+        # Caller holds self._lock. Always keep the most recently used entry.
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self._total_bytes() > self.max_bytes
+        ):
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _total_bytes(self):
+        return sum(size for _, size in self._entries.values())
+
+    def contains(self, name, version):
+        with self._lock:
+            return (name, version) in self._entries
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": [{"name": n, "version": v, "bytes": s} for (n, v), (_, s) in self._entries.items()],
+                "total_bytes": self._total_bytes(),
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "registry_metadata": self.registry.metadata_stats(),
+            }
+
+
+_SHARED_CACHE = None
+_SHARED_LOCK = threading.Lock()
+
+
+def get_model_cache():
+    """Process-wide ModelCache shared across endpoints."""
+    global _SHARED_CACHE
+    with _SHARED_LOCK:
+        if _SHARED_CACHE is None:
+            _SHARED_CACHE = ModelCache()
+        return _SHARED_CACHE
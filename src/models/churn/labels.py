@@ -0,0 +1,176 @@
+"""
+Simulated churn labels for the churn training scripts.
+
+The synthetic portfolio is a snapshot of current tenants, so training needs a
+simulated "did they renew last year?" label. Each simulator scores every
+tenant at once with NumPy masks, maps the score through a sigmoid, and draws
+the labels as one vectorized Bernoulli sample from a seeded generator. The
+same frame and seed always give the same labels.
+
+- `simulate_churn_v1`: original logic from train_churn.py (noisy score).
+- `simulate_churn_v2`: stronger-signal logic from optimize_churn.py.
+
+Usage:
+    python -m src.models.churn.labels --rows 1000000    # benchmark vs the row-wise version
+"""
+import numpy as np
+
+DEFAULT_SEED = 42
+
+
+def _rng(seed=None, rng=None):
+    return rng if rng is not None else np.random.default_rng(seed)
+
+
+def rent_burden(df):
+    """Monthly market rent over monthly income (1.0 where income is missing or zero)."""
+    monthly_income = df['income'].to_numpy(dtype=float) / 12
+    rent = df['market_rent'].to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(monthly_income > 0, rent / monthly_income, 1.0)
+
+
+def _column(df, name):
+    return df[name].to_numpy()
+
+
+def _equals(df, name, value):
+    # Compared in pandas so string columns stay on the Arrow kernels
+    return (df[name] == value).to_numpy(dtype=bool)
+
+
+# --- v1 (train_churn.py) ---
+def churn_scores_v1(df):
+    """Deterministic part of the v1 risk score."""
+    burden = rent_burden(df)
+    credit = _column(df, 'credit_score')
+    income = _column(df, 'income')
+    score = np.zeros(len(df))
+    # Factor 1: Rent Burden (Rent / Income)
+    score += np.where(burden > 0.40, 0.4, 0.0)   # High burden
+    score -= np.where(burden < 0.20, 0.1, 0.0)   # Very affordable
+    # Factor 2: Credit Score (Financial Stability)
+    score += np.where(credit < 620, 0.3, 0.0)    # Financial stress
+    score -= np.where(credit > 750, 0.1, 0.0)    # Stable
+    # Factor 3: Asset Mismatch (Rich person in Class C building -> Moving up?)
+    score += np.where(_equals(df, 'class', 'C') & (income > 150000), 0.3, 0.0)
+    # Factor 4: Neighborhood specific (e.g. Students in Harlem moving out)
+    score += np.where(_equals(df, 'neighborhood', 'Harlem') & _equals(df, 'type', 'Studio'), 0.1, 0.0)
+    return score
+
+
+def churn_probability_v1(score):
+    return 1 / (1 + np.exp(-3 * (score - 0.2)))  # Sigmoid-ish
+
+
+def simulate_churn_v1(df, seed=DEFAULT_SEED, rng=None):
+    """0/1 churn labels (int8) using the v1 logic plus N(0, 0.1) score noise."""
+    rng = _rng(seed, rng)
+    score = churn_scores_v1(df) + rng.normal(0, 0.1, size=len(df))
+    return (rng.random(len(df)) < churn_probability_v1(score)).astype(np.int8)
+
+
+# --- v2 (optimize_churn.py) ---
+def churn_scores_v2(df):
+    burden = rent_burden(df)
+    credit = _column(df, 'credit_score')
+    score = np.zeros(len(df))
+    # Strong Drivers
+    score += np.where(burden > 0.45, 3.0, 0.0)
+    score += np.where(credit < 600, 2.0, 0.0)
+    score += np.where(_equals(df, 'class', 'C') & (_column(df, 'income') > 120000), 2.0, 0.0)  # Flight to quality
+    # Moderate Drivers
+    score += np.where(_equals(df, 'neighborhood', 'Harlem') & _equals(df, 'type', 'Studio'), 1.0, 0.0)
+    # Mitigators
+    score -= np.where(burden < 0.25, 2.0, 0.0)
+    score -= np.where(credit > 760, 1.0, 0.0)
+    return score
+
+
+def churn_probability_v2(score):
+    return 1 / (1 + np.exp(-(score - 1)))  # Sigmoid centered at 1
+
+
+def simulate_churn_v2(df, seed=DEFAULT_SEED, rng=None):
+    """0/1 churn labels (int8) using the v2 logic."""
+    rng = _rng(seed, rng)
+    return (rng.random(len(df)) < churn_probability_v2(churn_scores_v2(df))).astype(np.int8)
+
+
+SIMULATORS = {"v1": simulate_churn_v1, "v2": simulate_churn_v2}
+
+
+def simulate_churn(df, version="v2", seed=DEFAULT_SEED, rng=None):
+    return SIMULATORS[version](df, seed=seed, rng=rng)
+
+
+# --- Row-wise reference (the previous df.apply implementation), kept for benchmarks ---
+def _row_probability_v1(row, noise=0.0):
+    risk_score = 0
+    monthly_income = row['income'] / 12
+    rent_burden = row['market_rent'] / monthly_income if monthly_income > 0 else 1.0
+    if rent_burden > 0.40: risk_score += 0.4
+    if rent_burden < 0.20: risk_score -= 0.1
+    if row['credit_score'] < 620: risk_score += 0.3
+    if row['credit_score'] > 750: risk_score -= 0.1
+    if row['class'] == 'C' and row['income'] > 150000: risk_score += 0.3
+    if row['neighborhood'] == 'Harlem' and row['type'] == 'Studio': risk_score += 0.1
+    risk_score += noise
+    return 1 / (1 + np.exp(-3 * (risk_score - 0.2)))
+
+
+def _row_probability_v2(row):
+    score = 0
+    monthly_income = row['income'] / 12
+    rent_burden = row['market_rent'] / monthly_income if monthly_income > 0 else 1.0
+    if rent_burden > 0.45: score += 3.0
+    if row['credit_score'] < 600: score += 2.0
+    if row['class'] == 'C' and row['income'] > 120000: score += 2.0
+    if row['neighborhood'] == 'Harlem' and row['type'] == 'Studio': score += 1.0
+    if rent_burden < 0.25: score -= 2.0
+    if row['credit_score'] > 760: score -= 1.0
+    return 1 / (1 + np.exp(-(score - 1)))
+
+
+def simulate_churn_rowwise(df, version="v2"):
+    """Previous implementation: one Python call and scalar np.random draws per row."""
+    if version == "v1":
+        return df.apply(lambda row: 1 if np.random.random() < _row_probability_v1(row, np.random.normal(0, 0.1)) else 0, axis=1)
+    return df.apply(lambda row: 1 if np.random.random() < _row_probability_v2(row) else 0, axis=1)
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+    import sys
+    import time
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+    from src.data.features import load_features
+
+    parser = argparse.ArgumentParser(description="Benchmark vectorized vs row-wise churn label simulation.")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Tenant rows to label (portfolio resampled)")
+    parser.add_argument("--rowwise-rows", type=int, default=20_000, help="Rows timed for the row-wise version (extrapolated)")
+    args = parser.parse_args()
+
+    base = load_features("tenant_features")
+
+    # Same probabilities as the row-wise logic on the real portfolio
+    for version, vectorized, row_fn in (("v1", churn_probability_v1(churn_scores_v1(base)), _row_probability_v1),
+                                        ("v2", churn_probability_v2(churn_scores_v2(base)), _row_probability_v2)):
+        rowwise = base.apply(row_fn, axis=1).to_numpy()
+        assert np.allclose(vectorized, rowwise), f"{version} probabilities diverge from the row-wise logic"
+    assert (simulate_churn_v2(base, seed=7) == simulate_churn_v2(base, seed=7)).all()
+    print(f"✅ Probabilities match the row-wise logic on {len(base)} tenants; labels are reproducible per seed")
+
+    df = base.sample(args.rows, replace=True, random_state=0).reset_index(drop=True)
+    for version in ("v1", "v2"):
+        start = time.perf_counter()
+        labels = simulate_churn(df, version, seed=DEFAULT_SEED)
+        vectorized_s = time.perf_counter() - start
+
+        subset = df.head(args.rowwise_rows)
+        start = time.perf_counter()
+        rowwise = simulate_churn_rowwise(subset, version)
+        rowwise_s = (time.perf_counter() - start) * len(df) / len(subset)
+        print(f"⏱️ {version}: vectorized {vectorized_s:.3f}s vs row-wise ~{rowwise_s:.1f}s for {len(df):,} rows "
+              f"({rowwise_s / vectorized_s:.0f}x); churn rate {labels.mean():.1%} vs {rowwise.mean():.1%}")
@@ -1,5 +1,4 @@
 import pandas as pd
-import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import StandardScaler, OneHotEncoder
@@ -7,52 +6,29 @@ from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
 from sklearn.metrics import classification_report, accuracy_score, roc_auc_score
 import joblib
+import sys
+import os
+
+# Add repo root to path to import the data store
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+from src.data.features import load_features
+from src.models.churn.labels import simulate_churn_v1, DEFAULT_SEED
+
+LABEL_SEED = int(os.getenv("CHURN_LABEL_SEED", str(DEFAULT_SEED)))
 
 # 1. Load Data
 print("Loading Data...")
-base_path = r"d:/Python-2025/Antigravity/Beekin_Analysis/src/data/synthetic"
-units_df = pd.read_csv(f"{base_path}/calibrated_units.csv")
-tenants_df = pd.read_csv(f"{base_path}/calibrated_tenants.csv")
-props_df = pd.read_csv(f"{base_path}/calibrated_properties.csv")
-
-# 2. Join Data to create "Tenant State"
-# Tenant -> Unit -> Property
-df = tenants_df.merge(units_df, on='unit_id', how='left')
-df = df.merge(props_df, on='property_id', how='left')
+# 2. "Tenant State": Tenant -> Unit -> Property
+# Joined once and cached by the feature store (src/data/features.py)
+df = load_features("tenant_features")
 
 # 3. Simulate Historical Labels (Ground Truth)
 # Since our synthetic data is a snapshot of *current* tenants, we simulate a "Did they renew last year?" label
 # based on behavioral logic to train the model.
 print("Simulating Historical Churn Labels...")
 
-def simulate_churn_event(row):
-    risk_score = 0
-    
-    # Factor 1: Rent Burden (Rent / Income)
-    monthly_income = row['income'] / 12
-    rent_burden = row['market_rent'] / monthly_income if monthly_income > 0 else 1.0
-    if rent_burden > 0.40: risk_score += 0.4  # High burden
-    if rent_burden < 0.20: risk_score -= 0.1  # Very affordable
-    
-    # Factor 2: Credit Score (Financial Stability)
-    if row['credit_score'] < 620: risk_score += 0.3 # Financial stress
-    if row['credit_score'] > 750: risk_score -= 0.1 # Stable
-    
-    # Factor 3: Asset Mismatch (Rich person in Class C building -> Moving up?)
-    if row['class'] == 'C' and row['income'] > 150000: risk_score += 0.3
-    
-    # Factor 4: Neighborhood specific (e.g. Students in Harlem moving out)
-    if row['neighborhood'] == 'Harlem' and row['type'] == 'Studio': risk_score += 0.1
-    
-    # Random Noise
-    risk_score += np.random.normal(0, 0.1)
-    
-    # Threshold for Churn
-    # If prob > 0.5, they churned
-    prob = 1 / (1 + np.exp(-3 * (risk_score - 0.2))) # Sigmoid-ish
-    return 1 if np.random.random() < prob else 0
-
-df['churned'] = df.apply(simulate_churn_event, axis=1)
+# Vectorized and seeded (src/models/churn/labels.py), so reruns give the same labels
+df['churned'] = simulate_churn_v1(df, seed=LABEL_SEED)
 print(f"Churn Rate in Training Data: {df['churned'].mean():.1%}")
 
 # 4. Feature Selection
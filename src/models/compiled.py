@@ -0,0 +1,476 @@
+"""
+Compiled, array-backed inference for the fitted tree pipelines.
+
+For a single row, most of the sklearn `Pipeline` cost is DataFrame
+construction and per-call validation, not tree traversal. `compile_pipeline`
+flattens a fitted `ColumnTransformer` + tree-ensemble pipeline into:
+
+- an encoder lookup table (numeric columns with their scaler parameters and a
+  category -> output-column dict per one-hot encoded column), and
+- one set of flat node arrays (feature, threshold, left, right, value,
+  default_left) holding every tree, with a root offset per tree.
+
+`CompiledModel.predict` / `predict_proba` take a dict, a list of dicts, a dict
+of columns or a DataFrame and evaluate all trees for all rows at once with
+NumPy, without touching pandas.
+
+Supported estimators: sklearn DecisionTree / RandomForest / ExtraTrees
+(regressor and classifier), GradientBoostingRegressor, binary
+GradientBoostingClassifier, and XGBRegressor / binary XGBClassifier with
+numeric splits.
+
+Usage:
+    python -m src.models.compiled     # compile production models + parity check
+"""
+import json
+import os
+
+import numpy as np
+
+FORMAT_VERSION = 1
+
+
+class CompiledModel:
+    """Array-backed tree ensemble plus the encoder lookup that feeds it."""
+
+    def __init__(self, meta, arrays):
+        self.meta = meta
+        self.kind = meta["kind"]                      # 'regressor' | 'classifier'
+        self.n_features = meta["n_features"]
+        self.numeric = meta["numeric"]                # [[column, out_index, mean, scale], ...]
+        self.categorical = {                          # column -> {category: out_index}
+            col: {cat: idx for cat, idx in mapping}
+            for col, mapping in meta["categorical"]
+        }
+        self.unknown_categories = meta.get("handle_unknown", "ignore")
+        self.input_columns = meta["input_columns"]
+        self.aggregation = meta["aggregation"]        # 'mean' | 'sum'
+        self.base = meta["base"]
+        self.scale = meta["scale"]
+        self.link = meta["link"]                      # 'identity' | 'logistic'
+        self.strict = meta["strict"]                  # x < thr (xgboost) vs x <= thr (sklearn)
+        self.zero_is_missing = meta.get("zero_is_missing", False)
+        self.max_depth = meta["max_depth"]
+        self.classes = meta.get("classes")
+
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.left = arrays["left"]
+        self.right = arrays["right"]
+        self.value = arrays["value"]
+        self.default_left = arrays["default_left"]
+        self.roots = arrays["roots"]
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    # --- Encoding ---
+    def _columns(self, rows):
+        """Normalize supported inputs to (n_rows, {column: sequence})."""
+        if isinstance(rows, dict):
+            first = next(iter(rows.values()), None)
+            if isinstance(first, (list, tuple, np.ndarray)):
+                n = len(first)
+                return n, rows
+            return 1, {k: [v] for k, v in rows.items()}
+        if isinstance(rows, (list, tuple)):
+            return len(rows), {col: [r.get(col) for r in rows] for col in self.input_columns}
+        if hasattr(rows, "columns"):  # DataFrame, without importing pandas
+            return len(rows), {col: rows[col].to_numpy() for col in self.input_columns}
+        raise TypeError(f"Unsupported input type: {type(rows).__name__}")
+
+    def encode(self, rows):
+        """Build the model's feature matrix (float64, float32-rounded) from raw rows."""
+        n, cols = self._columns(rows)
+        X = np.zeros((n, self.n_features), dtype=np.float64)
+        for col, out_idx, mean, scale in self.numeric:
+            values = np.asarray(cols[col], dtype=np.float64)
+            X[:, out_idx] = (values - mean) / scale
+        for col, lookup in self.categorical.items():
+            values = cols[col]
+            if n == 1:
+                uniques, inverse = [values[0]], np.zeros(1, dtype=np.int64)
+            else:
+                uniques, inverse = np.unique(np.asarray(values, dtype=object).astype(str), return_inverse=True)
+            # Look each distinct value up once, then scatter to its rows
+            targets = np.array([lookup.get(str(v), -1) for v in uniques], dtype=np.int64)[inverse]
+            known = targets >= 0
+            if self.unknown_categories == "error" and not known.all():
+                bad = np.asarray(values, dtype=object)[~known][0]
+                raise ValueError(f"Found unknown category {bad!r} in column '{col}'")
+            X[np.nonzero(known)[0], targets[known]] = 1.0
+        # Tree libraries compare in float32
+        return X.astype(np.float32).astype(np.float64)
+
+    # --- Evaluation ---
+    def raw_predict(self, X):
+        """Aggregated tree output (margin for boosted classifiers) for an encoded matrix."""
+        X = np.asarray(X, dtype=np.float64)
+        if self.zero_is_missing:
+            X = np.where(X == 0.0, np.nan, X)
+        n = X.shape[0]
+        nodes = np.broadcast_to(self.roots, (n, self.n_trees)).copy()
+        rows = np.arange(n)[:, None]
+        for _ in range(self.max_depth):
+            feat = self.feature[nodes]
+            internal = feat >= 0
+            if not internal.any():
+                break
+            x = X[rows, np.where(internal, feat, 0)]
+            thr = self.threshold[nodes]
+            go_left = x < thr if self.strict else x <= thr
+            go_left = np.where(np.isnan(x), self.default_left[nodes], go_left)
+            nxt = np.where(go_left, self.left[nodes], self.right[nodes])
+            nodes = np.where(internal, nxt, nodes)
+        leaves = self.value[nodes]
+        if self.aggregation == "mean":
+            out = leaves.mean(axis=1)
+        else:
+            out = leaves.sum(axis=1)
+        return self.base + self.scale * out
+
+    def _positive_proba(self, rows):
+        raw = self.raw_predict(self.encode(rows))
+        if self.link == "logistic":
+            return 1.0 / (1.0 + np.exp(-raw))
+        return raw
+
+    def predict(self, rows):
+        if self.kind == "classifier":
+            p = self._positive_proba(rows)
+            labels = np.asarray(self.classes) if self.classes is not None else np.array([0, 1])
+            return labels[(p > 0.5).astype(int)]
+        return self.raw_predict(self.encode(rows))
+
+    def predict_proba(self, rows):
+        if self.kind != "classifier":
+            raise AttributeError("predict_proba is only available for classifiers")
+        p = self._positive_proba(rows)
+        return np.column_stack([1.0 - p, p])
+
+    # --- Persistence ---
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez(
+            path,
+            meta=np.array(json.dumps(self.meta)),
+            feature=self.feature, threshold=self.threshold, left=self.left, right=self.right,
+            value=self.value, default_left=self.default_left, roots=self.roots,
+        )
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            arrays = {k: data[k] for k in data.files if k != "meta"}
+        if meta.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compiled model format in {path}")
+        return cls(meta, arrays)
+
+
+# --- Compilation ---
+class _TreeBuffer:
+    """Accumulates trees into flat, globally indexed node arrays."""
+
+    def __init__(self):
+        self.feature, self.threshold, self.left, self.right = [], [], [], []
+        self.value, self.default_left, self.roots = [], [], []
+        self.offset = 0
+        self.max_depth = 0
+
+    def add(self, feature, threshold, left, right, value, default_left, depth):
+        feature = np.asarray(feature, dtype=np.int32)
+        is_leaf = feature < 0
+        left = np.where(is_leaf, -1, np.asarray(left) + self.offset)
+        right = np.where(is_leaf, -1, np.asarray(right) + self.offset)
+        self.roots.append(self.offset)
+        self.feature.append(feature)
+        self.threshold.append(np.asarray(threshold, dtype=np.float64))
+        self.left.append(left.astype(np.int32))
+        self.right.append(right.astype(np.int32))
+        self.value.append(np.asarray(value, dtype=np.float64))
+        self.default_left.append(np.asarray(default_left, dtype=bool))
+        self.offset += len(feature)
+        self.max_depth = max(self.max_depth, int(depth))
+
+    def arrays(self):
+        return {
+            "feature": np.concatenate(self.feature),
+            "threshold": np.concatenate(self.threshold),
+            "left": np.concatenate(self.left),
+            "right": np.concatenate(self.right),
+            "value": np.concatenate(self.value),
+            "default_left": np.concatenate(self.default_left),
+            "roots": np.asarray(self.roots, dtype=np.int32),
+        }
+
+
+def _add_sklearn_tree(buf, tree, value):
+    t = tree.tree_
+    missing_left = getattr(t, "missing_go_to_left", None)
+    default_left = np.asarray(missing_left, dtype=bool) if missing_left is not None else np.ones(t.node_count, dtype=bool)
+    buf.add(t.feature, t.threshold, t.children_left, t.children_right, value, default_left, t.max_depth)
+
+
+def _sklearn_leaf_values(tree, classifier):
+    v = tree.tree_.value[:, 0, :]
+    if not classifier:
+        return v[:, 0]
+    totals = v.sum(axis=1)
+    return np.divide(v[:, 1], totals, out=np.zeros_like(totals), where=totals > 0)
+
+
+def _compile_sklearn_forest(est, buf):
+    classifier = hasattr(est, "classes_")
+    if classifier and len(est.classes_) != 2:
+        raise NotImplementedError("Only binary classifiers are supported")
+    trees = getattr(est, "estimators_", [est])
+    for tree in trees:
+        _add_sklearn_tree(buf, tree, _sklearn_leaf_values(tree, classifier))
+    meta = {"aggregation": "mean", "base": 0.0, "scale": 1.0, "link": "identity", "strict": False}
+    if classifier:
+        meta["classes"] = est.classes_.tolist()
+    return ("classifier" if classifier else "regressor"), meta
+
+
+def _compile_sklearn_gb(est, buf):
+    classifier = hasattr(est, "classes_")
+    if classifier and len(est.classes_) != 2:
+        raise NotImplementedError("Only binary classifiers are supported")
+    for stage in est.estimators_[:, 0]:
+        _add_sklearn_tree(buf, stage, stage.tree_.value[:, 0, 0])
+    init = est.init_
+    if init == "zero":
+        base = 0.0
+    elif classifier:
+        prior = float(init.class_prior_[1])
+        base = float(np.log(prior / (1.0 - prior)))
+    else:
+        base = float(np.ravel(init.constant_)[0])
+    meta = {"aggregation": "sum", "base": base, "scale": float(est.learning_rate),
+            "link": "logistic" if classifier else "identity", "strict": False}
+    if classifier:
+        meta["classes"] = est.classes_.tolist()
+    return ("classifier" if classifier else "regressor"), meta
+
+
+def _xgb_tree_depth(left, right):
+    depth = np.zeros(len(left), dtype=np.int64)
+    for node in range(len(left)):  # parents precede children in xgboost's layout
+        if left[node] >= 0:
+            depth[left[node]] = depth[node] + 1
+            depth[right[node]] = depth[node] + 1
+    return int(depth.max()) if len(depth) else 0
+
+
+def _compile_xgboost(est, buf, feature_index):
+    booster = est.get_booster()
+    model = json.loads(bytes(booster.save_raw("json")).decode())
+    learner = model["learner"]
+    objective = learner["objective"]["name"]
+    classifier = objective.startswith("binary:")
+    if not (classifier and objective == "binary:logistic") and objective not in ("reg:squarederror", "reg:linear"):
+        raise NotImplementedError(f"Unsupported xgboost objective '{objective}'")
+    gbm = learner["gradient_booster"]
+    if gbm.get("name") != "gbtree":
+        raise NotImplementedError(f"Unsupported xgboost booster '{gbm.get('name')}'")
+
+    names = booster.feature_names
+    remap = None
+    if names is not None:
+        remap = np.array([feature_index[n] for n in names], dtype=np.int32)
+
+    for tree in gbm["model"]["trees"]:
+        if any(tree.get("split_type", [])):
+            raise NotImplementedError("Categorical xgboost splits are not supported")
+        left = np.asarray(tree["left_children"], dtype=np.int64)
+        right = np.asarray(tree["right_children"], dtype=np.int64)
+        cond = np.asarray(tree["split_conditions"], dtype=np.float32).astype(np.float64)
+        split = np.asarray(tree["split_indices"], dtype=np.int32)
+        is_leaf = left < 0
+        feature = np.where(is_leaf, -1, remap[split] if remap is not None else split)
+        # Leaves store their weight in split_conditions
+        value = np.where(is_leaf, cond, 0.0)
+        buf.add(feature, cond, left, right, value, np.asarray(tree["default_left"], dtype=bool),
+                _xgb_tree_depth(left, right))
+
+    raw_base = learner["learner_model_param"]["base_score"]
+    base_score = float(str(raw_base).strip("[]"))
+    base = float(np.log(base_score / (1.0 - base_score))) if classifier else base_score
+    meta = {"aggregation": "sum", "base": base, "scale": 1.0,
+            "link": "logistic" if classifier else "identity", "strict": True}
+    if classifier:
+        meta["classes"] = [int(c) for c in getattr(est, "classes_", [0, 1])]
+    return ("classifier" if classifier else "regressor"), meta
+
+
+def _compile_preprocessor(pre):
+    """Encoder lookup table for a fitted ColumnTransformer (or None for raw numeric input)."""
+    from sklearn.preprocessing import FunctionTransformer, OneHotEncoder, StandardScaler
+
+    numeric, categorical, input_columns = [], [], []
+    handle_unknown = "ignore"
+    out = 0
+    for name, trans, cols in pre.transformers_:
+        if isinstance(trans, str) and trans == "drop":
+            continue
+        cols = list(cols)
+        if any(not isinstance(c, str) for c in cols):
+            raise NotImplementedError("Only column-name selectors are supported")
+        if trans == "passthrough" or (isinstance(trans, FunctionTransformer) and trans.func is None):
+            for col in cols:
+                numeric.append([col, out, 0.0, 1.0])
+                out += 1
+        elif isinstance(trans, StandardScaler):
+            means = trans.mean_ if trans.with_mean else np.zeros(len(cols))
+            scales = trans.scale_ if trans.with_std else np.ones(len(cols))
+            for col, m, s in zip(cols, means, scales):
+                numeric.append([col, out, float(m), float(s)])
+                out += 1
+        elif isinstance(trans, OneHotEncoder):
+            if trans.drop is not None or getattr(trans, "_infrequent_enabled", False):
+                raise NotImplementedError("OneHotEncoder with drop/infrequent categories is not supported")
+            handle_unknown = "error" if trans.handle_unknown == "error" else "ignore"
+            for col, cats in zip(cols, trans.categories_):
+                mapping = []
+                for cat in cats:
+                    mapping.append([str(cat), out])
+                    out += 1
+                categorical.append([col, mapping])
+        else:
+            raise NotImplementedError(f"Unsupported transformer {type(trans).__name__}")
+        input_columns.extend(c for c in cols if c not in input_columns)
+    return numeric, categorical, input_columns, out, handle_unknown, bool(getattr(pre, "sparse_output_", False))
+
+
+def compile_pipeline(pipeline):
+    """
+    Compile a fitted `Pipeline([('preprocessor', ColumnTransformer), (..., tree model)])`
+    (or a bare tree model fitted on a DataFrame) into a CompiledModel.
+    """
+    from sklearn.compose import ColumnTransformer
+    from sklearn.pipeline import Pipeline
+
+    if isinstance(pipeline, Pipeline):
+        if len(pipeline.steps) != 2:
+            raise NotImplementedError("Expected a [preprocessor, estimator] pipeline")
+        pre, est = pipeline.steps[0][1], pipeline.steps[1][1]
+        if not isinstance(pre, ColumnTransformer):
+            raise NotImplementedError(f"Unsupported preprocessor {type(pre).__name__}")
+        numeric, categorical, input_columns, n_features, handle_unknown, sparse = _compile_preprocessor(pre)
+    else:
+        est = pipeline
+        if not hasattr(est, "feature_names_in_"):
+            raise NotImplementedError("Bare estimators must be fitted on a DataFrame")
+        input_columns = [str(c) for c in est.feature_names_in_]
+        numeric = [[c, i, 0.0, 1.0] for i, c in enumerate(input_columns)]
+        categorical, n_features, handle_unknown, sparse = [], len(input_columns), "ignore", False
+
+    buf = _TreeBuffer()
+    est_type = type(est).__name__
+    zero_is_missing = False
+    if est_type.startswith("XGB"):
+        kind, meta = _compile_xgboost(est, buf, {f"f{i}": i for i in range(n_features)})
+        # xgboost treats entries absent from a sparse matrix as missing
+        zero_is_missing = sparse
+    elif est_type.startswith("GradientBoosting"):
+        kind, meta = _compile_sklearn_gb(est, buf)
+    elif est_type in ("RandomForestRegressor", "RandomForestClassifier", "ExtraTreesRegressor",
+                      "ExtraTreesClassifier", "DecisionTreeRegressor", "DecisionTreeClassifier"):
+        kind, meta = _compile_sklearn_forest(est, buf)
+    else:
+        raise NotImplementedError(f"Unsupported estimator {est_type}")
+
+    meta.update({
+        "format_version": FORMAT_VERSION,
+        "estimator": est_type,
+        "kind": kind,
+        "n_features": n_features,
+        "numeric": numeric,
+        "categorical": categorical,
+        "handle_unknown": handle_unknown,
+        "input_columns": input_columns,
+        "zero_is_missing": zero_is_missing,
+        "max_depth": buf.max_depth + 1,
+    })
+    return CompiledModel(meta, buf.arrays())
+
+
+def check_parity(pipeline, compiled, df, rtol=1e-5, atol=1e-3):
+    """
+    Compare a compiled model with its source pipeline on `df`.
+    Returns max absolute difference; raises AssertionError on mismatch.
+    """
+    if compiled.kind == "classifier":
+        expected = pipeline.predict_proba(df)[:, 1]
+        actual = compiled.predict_proba(df)[:, 1]
+    else:
+        expected = pipeline.predict(df)
+        actual = compiled.predict(df)
+    expected = np.asarray(expected, dtype=np.float64)
+    diff = float(np.max(np.abs(expected - actual))) if len(expected) else 0.0
+    if not np.allclose(actual, expected, rtol=rtol, atol=atol):
+        raise AssertionError(f"Compiled model diverges from pipeline (max abs diff {diff:.6g})")
+    # The dict path must agree with the batch path
+    single = compiled.predict_proba(df.iloc[0].to_dict())[:, 1] if compiled.kind == "classifier" \
+        else compiled.predict(df.iloc[0].to_dict())
+    if not np.allclose(single, actual[:1], rtol=rtol, atol=atol):
+        raise AssertionError("Compiled single-row path diverges from batch path")
+    return diff
+
+
+def compiled_path(models_dir, name, version):
+    return os.path.join(models_dir, "compiled", name, f"v{version}.npz")
+
+
+def export_compiled(registry, name, version):
+    """Compile a registered pipeline and store it under models/compiled/<name>/v<version>.npz."""
+    pipeline = registry.load_model(name, version)
+    compiled = compile_pipeline(pipeline)
+    path = compiled.save(compiled_path(registry.models_dir, name, version))
+    return pipeline, compiled, path
+
+
+def load_compiled(registry, name, version):
+    """Load a previously exported compiled model, or None if it has not been exported."""
+    path = compiled_path(registry.models_dir, name, version)
+    return CompiledModel.load(path) if os.path.exists(path) else None
+
+
+def _parity_frames():
+    """Real portfolio rows in the shape each served model expects."""
+    from src.data.features import load_features
+
+    unit_rows = load_features("unit_features")
+    valuation = unit_rows[["neighborhood", "class", "type", "sqft"]].astype({"neighborhood": str, "class": str, "type": str})
+    tenant_rows = load_features("tenant_features")
+    churn = tenant_rows[["income", "credit_score", "market_rent", "sqft", "type", "class", "neighborhood", "rent_burden"]]
+    churn = churn.astype({"neighborhood": str, "class": str, "type": str})
+    return {"rent_valuation_model": valuation, "churn_risk_model": churn}
+
+
+if __name__ == "__main__":
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+    from src.models.registry import ModelRegistry
+
+    registry = ModelRegistry()
+    frames = _parity_frames()
+    failed = False
+    for name, df in frames.items():
+        version = registry.get_alias(name, "production") or registry.get_latest_version(name)
+        try:
+            pipeline, compiled, path = export_compiled(registry, name, version)
+            diff = check_parity(pipeline, compiled, df)
+            print(f"✅ {name} v{version}: {compiled.n_trees} trees / {compiled.n_nodes} nodes -> {path} "
+                  f"(parity on {len(df)} rows, max abs diff {diff:.2e})")
+        except Exception as e:
+            failed = True
+            print(f"❌ {name} v{version}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,146 @@
+"""
+Precomputed valuation table for the rent estimator widget.
+
+The `/predict/rent` input space is small: a few neighborhoods x 3 classes x
+3 unit types x a bounded sqft range. `ValuationLookupTable.build` scores the
+whole grid in one batched predict whenever the served model version changes,
+and `lookup` answers in O(1). Inputs outside the grid return None so the
+caller can fall back to the live model.
+"""
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CLASSES = ("A", "B", "C")
+DEFAULT_TYPES = ("Studio", "1BD", "2BD")
+DEFAULT_SQFT_RANGE = (200, 3000)
+
+
+class ValuationLookupTable:
+    """
+    Dense grid of valuation predictions indexed by
+    (neighborhood, class, type, sqft bucket).
+
+    With `sqft_step=1` the table is exact for integer sqft; larger steps
+    linearly interpolate between neighbouring grid points.
+    """
+
+    def __init__(self, version, neighborhoods, classes, types, sqft_min, sqft_step, values):
+        self.version = version
+        self.neighborhoods = list(neighborhoods)
+        self.classes = list(classes)
+        self.types = list(types)
+        self.sqft_min = int(sqft_min)
+        self.sqft_step = int(sqft_step)
+        self.values = np.asarray(values, dtype=np.float64)  # (N, C, T, S)
+        self._n_idx = {n: i for i, n in enumerate(self.neighborhoods)}
+        self._c_idx = {c: i for i, c in enumerate(self.classes)}
+        self._t_idx = {t: i for i, t in enumerate(self.types)}
+        self.build_seconds = None
+
+    @property
+    def sqft_max(self):
+        return self.sqft_min + self.sqft_step * (self.values.shape[-1] - 1)
+
+    @property
+    def size(self):
+        return int(self.values.size)
+
+    @classmethod
+    def build(cls, model, version, neighborhoods, classes=DEFAULT_CLASSES, types=DEFAULT_TYPES,
+              sqft_range=DEFAULT_SQFT_RANGE, sqft_step=1):
+        """Tabulate `model.predict` over the full grid in a single batch."""
+        start = time.perf_counter()
+        sqft_grid = np.arange(sqft_range[0], sqft_range[1] + 1, sqft_step)
+        neighborhoods, classes, types = list(neighborhoods), list(classes), list(types)
+        shape = (len(neighborhoods), len(classes), len(types), len(sqft_grid))
+        n_idx, c_idx, t_idx, s_idx = np.indices(shape).reshape(4, -1)
+        grid = pd.DataFrame({
+            "neighborhood": np.asarray(neighborhoods, dtype=object)[n_idx],
+            "class": np.asarray(classes, dtype=object)[c_idx],
+            "type": np.asarray(types, dtype=object)[t_idx],
+            "sqft": sqft_grid[s_idx],
+        })
+        values = np.asarray(model.predict(grid), dtype=np.float64).reshape(shape)
+        table = cls(version, neighborhoods, classes, types, sqft_grid[0], sqft_step, values)
+        table.build_seconds = round(time.perf_counter() - start, 3)
+        return table
+
+    def lookup(self, neighborhood, p_class, u_type, sqft):
+        """Predicted rent for an in-grid input, else None."""
+        n = self._n_idx.get(neighborhood)
+        c = self._c_idx.get(p_class)
+        t = self._t_idx.get(u_type)
+        if n is None or c is None or t is None:
+            return None
+        if sqft is None or not (self.sqft_min <= sqft <= self.sqft_max):
+            return None
+        pos = (sqft - self.sqft_min) / self.sqft_step
+        lo = int(pos)
+        row = self.values[n, c, t]
+        if lo == pos or lo + 1 >= row.shape[0]:
+            return float(row[lo])
+        frac = pos - lo
+        return float(row[lo] * (1 - frac) + row[lo + 1] * frac)
+
+    # --- Persistence ---
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez(
+            path,
+            version=np.array(self.version),
+            neighborhoods=np.array(self.neighborhoods), classes=np.array(self.classes),
+            types=np.array(self.types), sqft=np.array([self.sqft_min, self.sqft_step]),
+            values=self.values,
+        )
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            sqft_min, sqft_step = data["sqft"].tolist()
+            return cls(int(data["version"]), data["neighborhoods"].tolist(), data["classes"].tolist(),
+                       data["types"].tolist(), sqft_min, sqft_step, data["values"])
+
+    def covers(self, neighborhoods, classes=DEFAULT_CLASSES, types=DEFAULT_TYPES):
+        """True if the table was built for at least these categories."""
+        return (set(neighborhoods) <= set(self.neighborhoods) and set(classes) <= set(self.classes)
+                and set(types) <= set(self.types))
+
+    def status(self):
+        return {
+            "version": self.version,
+            "cells": self.size,
+            "neighborhoods": self.neighborhoods,
+            "sqft_range": [self.sqft_min, self.sqft_max],
+            "sqft_step": self.sqft_step,
+            "build_seconds": self.build_seconds,
+        }
+
+
+def lookup_table_path(models_dir, name, version, sha256):
+    """Keyed by the artifact checksum too, so a re-registered version never reuses a stale table."""
+    return os.path.join(models_dir, "compiled", name, f"v{version}_{sha256[:16]}_lookup.npz")
+
+
+def load_or_build(model, registry, name, version, neighborhoods, **grid):
+    """
+    Reuse the table cached on disk for this model version (and artifact sha256)
+    if it covers the requested categories, otherwise build and cache a new one.
+    """
+    path = lookup_table_path(registry.models_dir, name, version, registry.artifact_sha256(name, version))
+    if os.path.exists(path):
+        try:
+            table = ValuationLookupTable.load(path)
+            if table.version == version and table.covers(neighborhoods):
+                return table
+        except Exception as e:
+            print(f"❌ Ignoring unreadable lookup table {path}: {e}")
+    table = ValuationLookupTable.build(model, version, neighborhoods, **grid)
+    try:
+        table.save(path)
+    except OSError as e:
+        print(f"❌ Could not cache lookup table: {e}")
+    return table
@@ -0,0 +1,434 @@
+"""
+Out-of-core training for portfolios that do not fit in memory.
+
+The regular trainers load every row into pandas. These paths stream row
+batches from columnar files (Parquet / Feather shards, or CSV) so peak memory
+depends on `batch_rows`, not on the portfolio size:
+
+- `xgb`: an `xgboost.DataIter` feeds the batches to an `ExtMemQuantileDMatrix`.
+  XGBoost keeps the quantized pages in an on-disk cache, and the raw rows are
+  never held at once. It still holds per-row gradients and predictions
+  (~16 bytes per row), so memory grows slowly with the row count.
+- `sgd`: `SGDRegressor` / `SGDClassifier` trained with `partial_fit` over
+  several epochs. One-hot encoding (`StreamingOneHotEncoder`) and scaling are
+  fitted incrementally as well.
+
+Both paths return a Pipeline that takes the same DataFrame columns as the
+served model, so `--register` produces a version the API can load like any
+other. One row in `HOLDOUT_EVERY` is held out (capped at `eval_rows`) for the
+MAE / AUC metrics; `xgb` early-stops on half of those rows and reports metrics
+on the other half, so the round count is not tuned on the reported rows. Churn labels are simulated per batch by
+`churn/labels.py` and seeded by batch index, so every pass sees the same labels.
+
+Usage:
+    python -m src.models.out_of_core --task churn --engine xgb --rows 10000000
+    python -m src.models.out_of_core --task valuation --engine sgd --source shards/ --register
+"""
+import glob
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.linear_model import SGDClassifier, SGDRegressor
+from sklearn.metrics import accuracy_score, mean_absolute_error, r2_score, roc_auc_score
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+try:
+    import pyarrow.dataset as pa_dataset
+    import pyarrow.parquet as pq
+except ImportError:  # CSV sources still stream through pandas
+    pa_dataset = None
+    pq = None
+
+BATCH_ROWS = int(os.getenv("OOC_BATCH_ROWS", "250000"))
+EVAL_ROWS = 200_000
+HOLDOUT_EVERY = 10
+LABEL_SEED = 42
+
+TASKS = {
+    "valuation": {
+        "name": "rent_valuation_model",
+        "table": "unit_features",
+        "numeric": ['sqft'],
+        "categorical": ['neighborhood', 'class', 'type'],
+        "columns": ['neighborhood', 'class', 'type', 'sqft'],
+        "kind": "regressor",
+    },
+    "churn": {
+        "name": "churn_risk_model",
+        "table": "tenant_features",
+        "numeric": ['income', 'credit_score', 'market_rent', 'sqft', 'rent_burden'],
+        "categorical": ['type', 'class', 'neighborhood'],
+        # Same order as CHURN_FEATURES in churn_scoring.py
+        "columns": ['income', 'credit_score', 'market_rent', 'sqft', 'type', 'class', 'neighborhood', 'rent_burden'],
+        "kind": "classifier",
+    },
+}
+
+
+# --- 1. BATCH SOURCE ---
+class ChunkSource:
+    """
+    Row batches from columnar files, read lazily.
+
+    Args:
+        paths: Files, directories (all .parquet/.feather/.csv inside) or glob patterns.
+        columns: Columns to read (None = all).
+        batch_rows: Maximum rows per batch.
+    """
+
+    FORMATS = {".parquet": "parquet", ".feather": "feather", ".arrow": "feather", ".csv": "csv"}
+
+    def __init__(self, paths, columns=None, batch_rows=BATCH_ROWS):
+        self.files = self._expand([paths] if isinstance(paths, str) else list(paths))
+        if not self.files:
+            raise FileNotFoundError(f"No .parquet/.feather/.csv files found in {paths}")
+        self.columns = columns
+        self.batch_rows = batch_rows
+
+    @classmethod
+    def _expand(cls, paths):
+        files = []
+        for path in paths:
+            if os.path.isdir(path):
+                files += sorted(os.path.join(path, f) for f in os.listdir(path)
+                                if os.path.splitext(f)[1] in cls.FORMATS)
+            else:
+                files += sorted(glob.glob(path))
+        return files
+
+    def _file_batches(self, path, columns):
+        fmt = self.FORMATS[os.path.splitext(path)[1]]
+        if fmt == "csv" or pa_dataset is None:
+            yield from pd.read_csv(path, usecols=columns, chunksize=self.batch_rows)
+            return
+        for batch in pa_dataset.dataset(path, format=fmt).to_batches(columns=columns, batch_size=self.batch_rows):
+            if batch.num_rows:
+                yield batch.to_pandas()
+
+    def batches(self, columns=None):
+        """Yield (batch_index, row_offset, DataFrame) across all files, in a fixed order."""
+        columns = columns or self.columns
+        index = offset = 0
+        for path in self.files:
+            for df in self._file_batches(path, columns):
+                yield index, offset, df
+                index += 1
+                offset += len(df)
+
+    def __iter__(self):
+        for _, _, df in self.batches():
+            yield df
+
+
+def write_resampled(table, rows, out_dir, shard_rows=1_000_000, seed=0):
+    """
+    Write `rows` rows sampled (with replacement) from a feature-store table as
+    Parquet shards of `shard_rows`, one shard in memory at a time. Returns out_dir.
+    """
+    from src.data.features import load_features
+
+    if pq is None:
+        raise ImportError("pyarrow is required to write Parquet shards")
+    base = load_features(table)
+    os.makedirs(out_dir, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    for shard, start in enumerate(range(0, rows, shard_rows)):
+        n = min(shard_rows, rows - start)
+        part = base.iloc[rng.integers(0, len(base), size=n)].reset_index(drop=True)
+        part.to_parquet(os.path.join(out_dir, f"part-{shard:05d}.parquet"), index=False)
+    return out_dir
+
+
+# --- 2. STREAMING ENCODING ---
+class StreamingOneHotEncoder(BaseEstimator, TransformerMixin):
+    """
+    Numeric passthrough plus one-hot categoricals, fitted one batch at a time.
+
+    Categories seen by `partial_fit` are appended in sorted order per column;
+    finish fitting before the first `transform`, since new categories change
+    the output width. Unknown categories encode as all zeros.
+
+    Args:
+        numeric: Numeric columns, emitted first as float32.
+        categorical: Columns to one-hot encode.
+    """
+
+    def __init__(self, numeric, categorical):
+        self.numeric = numeric
+        self.categorical = categorical
+
+    def partial_fit(self, X, y=None):
+        if not hasattr(self, "categories_"):
+            self.categories_ = {col: [] for col in self.categorical}
+            self.feature_names_in_ = np.asarray(list(X.columns), dtype=object)
+        for col in self.categorical:
+            seen = set(self.categories_[col])
+            new = [v for v in pd.unique(X[col].dropna().astype(str)) if v not in seen]
+            self.categories_[col] = sorted(seen.union(new))
+        return self
+
+    def fit(self, X, y=None):
+        for attr in ("categories_", "feature_names_in_"):
+            if hasattr(self, attr):
+                delattr(self, attr)
+        return self.partial_fit(X, y)
+
+    def get_feature_names_out(self, input_features=None):
+        names = list(self.numeric)
+        for col in self.categorical:
+            names += [f"{col}_{value}" for value in self.categories_[col]]
+        return np.asarray(names, dtype=object)
+
+    def transform(self, X):
+        n_out = len(self.numeric) + sum(len(values) for values in self.categories_.values())
+        out = np.zeros((len(X), n_out), dtype=np.float32)
+        for i, col in enumerate(self.numeric):
+            out[:, i] = X[col].to_numpy(dtype=np.float32)
+        rows = np.arange(len(X))
+        offset = len(self.numeric)
+        for col in self.categorical:
+            values = X[col].astype(str) if not isinstance(X[col].dtype, pd.CategoricalDtype) else X[col]
+            codes = pd.Categorical(values, categories=self.categories_[col]).codes
+            known = codes >= 0
+            out[rows[known], offset + codes[known]] = 1.0
+            offset += len(self.categories_[col])
+        return out
+
+
+# --- 3. TASK DATA ---
+def _targets(task, index, df):
+    """Regression target or simulated churn labels for one batch (seeded by batch index)."""
+    if task == "valuation":
+        return df['market_rent'].to_numpy(dtype=np.float32)
+    from src.models.churn.labels import simulate_churn_v2
+    return simulate_churn_v2(df, rng=np.random.default_rng([LABEL_SEED, index]))
+
+
+def _read_columns(task):
+    spec = TASKS[task]
+    columns = list(spec["columns"])
+    if task == "valuation":
+        columns.append('market_rent')
+    else:
+        columns += [c for c in ('income', 'market_rent', 'credit_score', 'class', 'neighborhood', 'type') if c not in columns]
+    return columns
+
+
+def _holdout_mask(offset, n):
+    return (np.arange(offset, offset + n) % HOLDOUT_EVERY) == 0
+
+
+def fit_vocabulary(source, task, eval_rows=EVAL_ROWS):
+    """
+    First pass: fit the encoder's categories on training rows and collect up
+    to `eval_rows` holdout rows with their targets. Returns (encoder, X_eval, y_eval, train_rows).
+    """
+    spec = TASKS[task]
+    encoder = StreamingOneHotEncoder(spec["numeric"], spec["categorical"])
+    eval_parts, eval_targets, kept, train_rows = [], [], 0, 0
+    for index, offset, df in source.batches(_read_columns(task)):
+        holdout = _holdout_mask(offset, len(df))
+        y = _targets(task, index, df)
+        encoder.partial_fit(df.loc[~holdout, spec["columns"]])
+        train_rows += int((~holdout).sum())
+        if kept < eval_rows:
+            part = df.loc[holdout, spec["columns"]].iloc[:eval_rows - kept]
+            eval_parts.append(part)
+            eval_targets.append(y[holdout][:len(part)])
+            kept += len(part)
+    X_eval = pd.concat(eval_parts, ignore_index=True)
+    return encoder, X_eval, np.concatenate(eval_targets), train_rows
+
+
+def _train_batches(source, task, encoder):
+    """Encoded (X, y) training rows per batch, holdout rows removed."""
+    columns = TASKS[task]["columns"]
+    for index, offset, df in source.batches(_read_columns(task)):
+        keep = ~_holdout_mask(offset, len(df))
+        yield index, encoder.transform(df.loc[keep, columns]), _targets(task, index, df)[keep]
+
+
+def evaluate(model, task, X_eval, y_eval):
+    if TASKS[task]["kind"] == "regressor":
+        predictions = model.predict(X_eval)
+        return {"mae": round(float(mean_absolute_error(y_eval, predictions)), 2),
+                "r2": round(float(r2_score(y_eval, predictions)), 4)}
+    probabilities = model.predict_proba(X_eval)[:, 1]
+    return {"auc": round(float(roc_auc_score(y_eval, probabilities)), 4),
+            "accuracy": round(float(accuracy_score(y_eval, probabilities > 0.5)), 4)}
+
+
+# --- 4. XGBOOST (EXTERNAL MEMORY) ---
+def _make_iter(source, task, encoder, cache_prefix):
+    import xgboost as xgb
+
+    class BatchIter(xgb.DataIter):
+        """Feeds encoded training batches to XGBoost; restarted for every pass it makes."""
+
+        def __init__(self):
+            self._batches = None
+            super().__init__(cache_prefix=cache_prefix, on_host=False)
+
+        def next(self, input_data):
+            if self._batches is None:
+                self._batches = _train_batches(source, task, encoder)
+            try:
+                _, X, y = next(self._batches)
+            except StopIteration:
+                return False
+            input_data(data=X, label=y)
+            return True
+
+        def reset(self):
+            self._batches = None
+
+    return BatchIter()
+
+
+def train_xgb(source, task, params=None, num_boost_round=500, early_stopping_rounds=20,
+              eval_rows=EVAL_ROWS, cache_dir=None):
+    """
+    Train XGBoost from batches via an external-memory quantile DMatrix.
+
+    Returns (Pipeline, metrics, params).
+    """
+    import xgboost as xgb
+
+    spec = TASKS[task]
+    encoder, X_eval, y_eval, train_rows = fit_vocabulary(source, task, eval_rows)
+    params = {
+        "objective": "reg:squarederror" if spec["kind"] == "regressor" else "binary:logistic",
+        "eval_metric": "mae" if spec["kind"] == "regressor" else "auc",
+        "tree_method": "hist",
+        "max_depth": 6,
+        "learning_rate": 0.1,
+        "max_bin": 256,
+        "seed": 42,
+        **(params or {}),
+    }
+    cache_dir = cache_dir or tempfile.mkdtemp(prefix="xgb-extmem-")
+    try:
+        dtrain = xgb.ExtMemQuantileDMatrix(_make_iter(source, task, encoder, os.path.join(cache_dir, "cache")),
+                                           max_bin=params["max_bin"])
+        # Early stopping picks the round count on half of the holdout; metrics use the other half
+        stop = np.arange(len(y_eval)) % 2 == 0
+        dvalid = xgb.DMatrix(encoder.transform(X_eval[stop]), label=y_eval[stop])
+        booster = xgb.train(params, dtrain, num_boost_round=num_boost_round, evals=[(dvalid, "valid")],
+                            early_stopping_rounds=early_stopping_rounds, verbose_eval=False)
+        best_rounds = booster.best_iteration + 1
+        booster = booster[:best_rounds]
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    # Load the booster into the sklearn API so the Pipeline serves like the in-memory models
+    estimator_cls = xgb.XGBRegressor if spec["kind"] == "regressor" else xgb.XGBClassifier
+    estimator = estimator_cls(n_estimators=best_rounds, **{k: v for k, v in params.items() if k not in ("seed", "max_bin")})
+    estimator.load_model(booster.save_raw("ubj"))
+    pipeline = Pipeline([('encoder', encoder), ('model', estimator)])
+    metrics = evaluate(pipeline, task, X_eval[~stop], y_eval[~stop])
+    metrics.update(train_rows=train_rows, early_stopping_rows=int(stop.sum()), eval_rows=int((~stop).sum()))
+    return pipeline, metrics, {**params, "n_estimators": best_rounds}
+
+
+# --- 5. SGD (PARTIAL_FIT) ---
+def train_sgd(source, task, epochs=3, eval_rows=EVAL_ROWS, seed=42):
+    """
+    Train a linear model with partial_fit over `epochs` passes of shuffled batches.
+
+    Returns (Pipeline, metrics, params).
+    """
+    spec = TASKS[task]
+    encoder, X_eval, y_eval, train_rows = fit_vocabulary(source, task, eval_rows)
+    scaler = StandardScaler()
+    for _, X, _ in _train_batches(source, task, encoder):
+        scaler.partial_fit(X)
+
+    if spec["kind"] == "regressor":
+        model = SGDRegressor(loss="huber", epsilon=200.0, alpha=1e-5, learning_rate="adaptive", eta0=0.01, random_state=seed)
+        fit_kwargs = {}
+    else:
+        model = SGDClassifier(loss="log_loss", alpha=1e-5, learning_rate="adaptive", eta0=0.01, random_state=seed)
+        fit_kwargs = {"classes": np.array([0, 1])}
+    rng = np.random.default_rng(seed)
+    for epoch in range(epochs):
+        for _, X, y in _train_batches(source, task, encoder):
+            order = rng.permutation(len(y))
+            model.partial_fit(scaler.transform(X[order]), y[order], **fit_kwargs)
+
+    pipeline = Pipeline([('encoder', encoder), ('scaler', scaler), ('model', model)])
+    metrics = evaluate(pipeline, task, X_eval, y_eval)
+    metrics["train_rows"] = train_rows
+    params = {k: v for k, v in model.get_params().items() if isinstance(v, (int, float, str, bool))}
+    return pipeline, metrics, {**params, "epochs": epochs}
+
+
+TRAINERS = {"xgb": train_xgb, "sgd": train_sgd}
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process so far, or None where `resource` is missing (Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is in bytes on macOS and KiB on Linux
+    per_mb = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / per_mb, 1)
+
+
+def train_out_of_core(source, task, engine="xgb", registry=None, **kwargs):
+    """
+    Train `task` ('valuation' or 'churn') with `engine` from a ChunkSource.
+    Registers the Pipeline when `registry` is given. Returns (pipeline, metrics).
+    """
+    start = time.perf_counter()
+    pipeline, metrics, params = TRAINERS[engine](source, task, **kwargs)
+    metrics.update({"engine": engine, "out_of_core": True, "batch_rows": source.batch_rows,
+                    "train_seconds": round(time.perf_counter() - start, 1), "peak_rss_mb": peak_rss_mb()})
+    if registry is not None:
+        registry.save_model(pipeline, TASKS[task]["name"], metrics=metrics, params=params)
+    return pipeline, metrics
+
+
+if __name__ == "__main__":
+    import argparse
+    import warnings
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+    from src.data.store import STORE_DIR
+
+    parser = argparse.ArgumentParser(description="Train valuation / churn models from batches on disk.")
+    parser.add_argument("--task", choices=TASKS, default="churn")
+    parser.add_argument("--engine", choices=TRAINERS, default="xgb")
+    parser.add_argument("--source", nargs="+", help="Parquet/Feather/CSV files or directories (default: resampled portfolio)")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows to resample when no --source is given")
+    parser.add_argument("--batch-rows", type=int, default=BATCH_ROWS)
+    parser.add_argument("--register", action="store_true", help="Save the trained Pipeline as a new registry version")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore", category=UserWarning)
+    paths = args.source
+    if not paths:
+        table = TASKS[args.task]["table"]
+        out_dir = os.path.join(STORE_DIR, "resampled", f"{table}-{args.rows}")
+        if not os.path.isdir(out_dir):
+            start = time.perf_counter()
+            write_resampled(table, args.rows, out_dir)
+            print(f"✅ Wrote {args.rows:,} resampled {table} rows to {out_dir} ({time.perf_counter() - start:.1f}s)")
+        paths = [out_dir]
+
+    registry = None
+    if args.register:
+        from src.models.registry import ModelRegistry
+        registry = ModelRegistry()
+
+    source = ChunkSource(paths, batch_rows=args.batch_rows)
+    print(f"🔄 Training {args.task} ({args.engine}) from {len(source.files)} file(s), {args.batch_rows:,} rows per batch...")
+    _, metrics = train_out_of_core(source, args.task, args.engine, registry=registry)
+    print(f"✅ {metrics}")
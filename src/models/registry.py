@@ -1,124 +1,536 @@
-
 import sqlite3
 import os
 import joblib
 import json
+import hashlib
+import tempfile
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 import pandas as pd
 
+# Content-addressed artifact store: artifacts/<sha256[:2]>/<sha256>.pkl
+ARTIFACTS_DIR = "artifacts"
+# joblib compression level for new artifacts. 0 keeps the raw layout that
+# ModelCache can memory-map; 1-9 trades load speed for disk space.
+DEFAULT_COMPRESS = int(os.getenv("REGISTRY_COMPRESS", "0"))
+# WAL lets the API read while a training script or the CLI writes (set by `migrate`)
+REGISTRY_WAL = os.getenv("REGISTRY_WAL", "1") == "1"
+HASH_CHUNK_BYTES = 1024 * 1024
+# PRAGMA user_version of a fully migrated registry.db:
+#   1 = model_aliases, 2 = tuning_trials and the sha256 / size_bytes / layout columns
+SCHEMA_VERSION = 2
+
+
+class RegistrySchemaError(RuntimeError):
+    """The registry database needs `python -m src.models.registry migrate` before this write."""
+
+
+def file_sha256(path):
+    """Hex sha256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
 class ModelRegistry:
-    def __init__(self, db_path=None, models_dir=None):
+    def __init__(self, db_path=None, models_dir=None, compress=DEFAULT_COMPRESS):
         # Default paths
         base_dir = os.path.dirname(os.path.abspath(__file__))
-        
+
         if models_dir is None:
             self.models_dir = base_dir
         else:
             self.models_dir = models_dir
-            
+
         if db_path is None:
             self.db_path = os.path.join(self.models_dir, "registry.db")
         else:
             self.db_path = db_path
 
-        self._init_db()
-
-    def _init_db(self):
-        """Initialize the SQLite database for model versioning."""
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS models (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                version INTEGER NOT NULL,
-                path TEXT NOT NULL,
-                metrics TEXT,  -- JSON string
-                params TEXT,   -- JSON string
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        conn.commit()
-        conn.close()
+        self.compress = compress
+        # One connection per registry (and per process), shared by threads under a lock
+        self._lock = threading.RLock()
+        self._conn = None
+        self._conn_pid = None
+        # In-memory copy of the models table, refreshed when PRAGMA data_version moves
+        self._metadata = None
+        self._data_version = None
+        self.metadata_hits = 0
+        self.metadata_misses = 0
+        # path -> (mtime_ns, size, sha256) of artifacts that already passed verification
+        self._verified = {}
+
+        # A new database is created at the current schema. An existing one is
+        # only opened: reading or serving never rewrites registry.db, and
+        # migrations run through `migrate()` (the `migrate` CLI command).
+        if not os.path.exists(self.db_path):
+            self.migrate()
+
+    # --- Connection ---
+    def _connect(self):
+        # Caller holds self._lock. Reconnect in forked children instead of sharing the parent's handle.
+        if self._conn is None or self._conn_pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            # Per-connection setting; the WAL journal mode itself is stored in the file by migrate()
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn, self._conn_pid = conn, os.getpid()
+            self._metadata = None
+        return self._conn
+
+    @contextmanager
+    def _cursor(self, commit=False):
+        with self._lock:
+            conn = self._connect()
+            c = conn.cursor()
+            try:
+                yield c
+                if commit:
+                    conn.commit()
+                    self._metadata = None
+            except Exception:
+                if commit:
+                    conn.rollback()
+                raise
+            finally:
+                c.close()
+
+    def close(self):
+        """Close the connection (the last close also checkpoints the WAL into registry.db)."""
+        with self._lock:
+            if self._conn is not None and self._conn_pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+            self._metadata = None
+
+    # --- Schema ---
+    def schema_version(self):
+        with self._cursor() as c:
+            return c.execute('PRAGMA user_version').fetchone()[0]
+
+    def _require_schema(self):
+        """Writes need the current schema; reads work on older databases."""
+        version = self.schema_version()
+        if version < SCHEMA_VERSION:
+            raise RegistrySchemaError(f"{self.db_path} is at schema v{version}, this code writes v{SCHEMA_VERSION}: "
+                                      f"run `python -m src.models.registry migrate` first")
+
+    def migrate(self):
+        """
+        Create missing tables and columns, switch to WAL (unless REGISTRY_WAL=0)
+        and stamp SCHEMA_VERSION. Idempotent. Returns (old_version, new_version).
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        old_version = self.schema_version()
+        with self._cursor(commit=True) as c:
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS models (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    version INTEGER NOT NULL,
+                    path TEXT NOT NULL,
+                    metrics TEXT,  -- JSON string
+                    params TEXT,   -- JSON string
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            # Named pointers to a version (e.g. 'production', 'canary') that the
+            # API follows, so promoting a model is an alias move, not a redeploy.
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS model_aliases (
+                    name TEXT NOT NULL,
+                    alias TEXT NOT NULL,
+                    version INTEGER NOT NULL,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (name, alias)
+                )
+            ''')
+            # One row per hyperparameter trial (src/models/churn/tuning.py)
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS tuning_trials (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    study TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    trial INTEGER NOT NULL,
+                    rung INTEGER NOT NULL,
+                    params TEXT,        -- JSON string
+                    budget INTEGER,     -- max boosting rounds at this rung
+                    fraction REAL,      -- share of training rows at this rung
+                    best_iteration INTEGER,
+                    score REAL,
+                    fold_scores TEXT,   -- JSON string
+                    seconds REAL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            # Artifact integrity / layout columns, added in place on older databases
+            existing = {row[1] for row in c.execute('PRAGMA table_info(models)')}
+            for column, ddl in (("sha256", "TEXT"), ("size_bytes", "INTEGER"), ("layout", "TEXT")):
+                if column not in existing:
+                    c.execute(f'ALTER TABLE models ADD COLUMN {column} {ddl}')
+            c.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        if REGISTRY_WAL:
+            with self._lock:
+                self._connect().execute("PRAGMA journal_mode=WAL")
+        return old_version, SCHEMA_VERSION
+
+    # --- Metadata cache ---
+    def _rows(self):
+        """
+        All rows of the models table (newest version first per name). Served from
+        memory until this registry writes or another connection commits.
+        """
+        with self._lock:
+            conn = self._connect()
+            data_version = conn.execute('PRAGMA data_version').fetchone()[0]
+            if self._metadata is None or data_version != self._data_version:
+                c = conn.execute('SELECT * FROM models ORDER BY name, version DESC')
+                columns = [d[0] for d in c.description]
+                self._metadata = (columns, [dict(zip(columns, row)) for row in c.fetchall()])
+                self._data_version = data_version
+                self.metadata_misses += 1
+            else:
+                self.metadata_hits += 1
+            return self._metadata
+
+    def _row(self, name, version=None):
+        for row in self._rows()[1]:
+            if row["name"] == name and (version is None or row["version"] == int(version)):
+                return row
+        raise ValueError(f"Model '{name}' (version {version}) not found in registry.")
+
+    def metadata_stats(self):
+        return {"hits": self.metadata_hits, "misses": self.metadata_misses, "verified_artifacts": len(self._verified)}
 
     def get_latest_version(self, name):
         """Get the latest version number for a given model name."""
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute('SELECT MAX(version) FROM models WHERE name = ?', (name,))
-        res = c.fetchone()
-        conn.close()
-        return res[0] if res[0] is not None else 0
+        versions = [row["version"] for row in self._rows()[1] if row["name"] == name]
+        return max(versions) if versions else 0
 
-    def save_model(self, model, name, metrics=None, params=None):
+    # --- Artifact store ---
+    def artifact_path(self, sha256):
+        return os.path.join(self.models_dir, ARTIFACTS_DIR, sha256[:2], f"{sha256}.pkl")
+
+    def _store_artifact(self, model, compress):
+        """
+        Serialize `model` into the content-addressed store.
+        Returns (sha256, path, size_bytes, reused) where `reused` means a
+        byte-identical artifact was already stored.
+        """
+        tmp_dir = os.path.join(self.models_dir, ARTIFACTS_DIR, "tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir, suffix=".pkl")
+        os.close(fd)
+        try:
+            # Save artifact using joblib (efficient for numpy/sklearn)
+            joblib.dump(model, tmp_path, compress=compress)
+            sha256 = file_sha256(tmp_path)
+            size = os.path.getsize(tmp_path)
+            path = self.artifact_path(sha256)
+            reused = os.path.exists(path) and file_sha256(path) == sha256
+            if not reused:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp_path, path)
+            return sha256, path, size, reused
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _stored_path(self, path):
+        """Paths inside models_dir are stored relative to it."""
+        abs_path = os.path.abspath(path)
+        models_root = os.path.abspath(self.models_dir)
+        if os.path.commonpath([abs_path, models_root]) == models_root:
+            return os.path.relpath(abs_path, models_root)
+        return abs_path
+
+    def save_model(self, model, name, metrics=None, params=None, compress=None):
         """
         Save a model artifact and register it in the database.
-        
+
         Args:
             model: The model object (e.g., sklearn estimator).
             name: Name of the model (e.g., 'rent_valuation').
             metrics: Dict of metrics (e.g., {'rmse': 0.5}).
             params: Dict of parameters (e.g., {'n_estimators': 100}).
+            compress: joblib compression level; None uses the registry default
+                (0 = raw, memory-mappable layout).
         """
+        self._require_schema()
         version = self.get_latest_version(name) + 1
-        
-        # Create version specific directory
-        # Structure: models/name/v1/model.pkl
-        model_dir = os.path.join(self.models_dir, name, f"v{version}")
-        os.makedirs(model_dir, exist_ok=True)
-        
-        model_path = os.path.join(model_dir, "model.pkl")
-        
-        # Save artifact using joblib (efficient for numpy/sklearn)
-        joblib.dump(model, model_path)
-        
+        compress = self.compress if compress is None else compress
+
+        # Structure: models/artifacts/<sha256[:2]>/<sha256>.pkl, shared by identical versions
+        sha256, model_path, size, reused = self._store_artifact(model, compress)
+        layout = "compressed" if compress else "raw"
+
         # Save metadata to DB
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute('''
-            INSERT INTO models (name, version, path, metrics, params)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (name, version, model_path, json.dumps(metrics), json.dumps(params)))
-        conn.commit()
-        conn.close()
-        
+        with self._cursor(commit=True) as c:
+            c.execute('''
+                INSERT INTO models (name, version, path, metrics, params, sha256, size_bytes, layout)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (name, version, self._stored_path(model_path), json.dumps(metrics), json.dumps(params),
+                  sha256, size, layout))
+
         print(f"✅ Model '{name}' version {version} saved successfully.")
-        print(f"   Path: {model_path}")
+        print(f"   Path: {model_path}" + (" (identical artifact already stored, reused)" if reused else ""))
         return version
 
-    def load_model(self, name, version=None):
+    def register_artifact(self, name, path, version=None, metrics=None, params=None):
         """
-        Load a model from the registry.
-        
+        Register an artifact that already exists on disk (no copy is made).
+
         Args:
             name: Name of the model.
-            version: Integer version number. If None, loads latest.
+            path: Path to the artifact. Paths inside models_dir are stored relative to it.
+            version: Explicit version number. If None, uses latest + 1.
+            metrics: Dict of metrics.
+            params: Dict of parameters.
         """
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Model file not found at {path}")
+        self._require_schema()
         if version is None:
-            c.execute('SELECT path, version FROM models WHERE name = ? ORDER BY version DESC LIMIT 1', (name,))
-        else:
-            c.execute('SELECT path, version FROM models WHERE name = ? AND version = ?', (name, version))
-            
-        res = c.fetchone()
-        conn.close()
-        
-        if res:
-            path, loaded_version = res
-            if os.path.exists(path):
-                print(f"Loading '{name}' version {loaded_version} from {path}")
-                return joblib.load(path)
-            else:
+            version = self.get_latest_version(name) + 1
+
+        with self._cursor(commit=True) as c:
+            c.execute('''
+                INSERT INTO models (name, version, path, metrics, params, sha256, size_bytes)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (name, version, self._stored_path(path), json.dumps(metrics), json.dumps(params),
+                  file_sha256(path), os.path.getsize(path)))
+        return version
+
+    def resolve(self, name, version=None):
+        """
+        Resolve a model name/version to (version, artifact path) without loading it.
+
+        Relative paths are resolved against models_dir. Absolute paths recorded on
+        another machine fall back to the models/<name>/v<version>/model.pkl layout.
+        """
+        row = self._row(name, version)
+        path, resolved_version = row["path"], row["version"]
+        if not os.path.isabs(path):
+            path = os.path.join(self.models_dir, path)
+        if not os.path.exists(path):
+            fallback = os.path.join(self.models_dir, name, f"v{resolved_version}", "model.pkl")
+            if not os.path.exists(fallback):
                 raise FileNotFoundError(f"Model file not found at {path}")
-        else:
-            raise ValueError(f"Model '{name}' (version {version}) not found in registry.")
+            path = fallback
+        return resolved_version, path
+
+    def artifact_sha256(self, name, version):
+        """sha256 of a version's artifact: the recorded checksum, else the file's hash (legacy rows)."""
+        recorded = self._row(name, version).get("sha256")
+        return recorded or file_sha256(self.resolve(name, version)[1])
+
+    def verify(self, name, version, path=None):
+        """
+        Check an artifact against its recorded sha256.
+
+        Returns True if it matches, None if no checksum was recorded (legacy rows),
+        and raises ValueError on a mismatch. Unchanged files are hashed only once.
+        """
+        expected = self._row(name, version).get("sha256")
+        if not expected:
+            return None
+        if path is None:
+            path = self.resolve(name, version)[1]
+        stat = os.stat(path)
+        cached = self._verified.get(path)
+        if cached == (stat.st_mtime_ns, stat.st_size, expected):
+            return True
+        actual = file_sha256(path)
+        if actual != expected:
+            raise ValueError(f"Artifact for '{name}' v{version} at {path} failed checksum verification "
+                             f"(expected {expected[:12]}, got {actual[:12]})")
+        self._verified[path] = (stat.st_mtime_ns, stat.st_size, expected)
+        return True
+
+    def load_artifact(self, name, version, path, mmap_mode=None, verify=True):
+        """Load a resolved artifact, verifying its checksum first."""
+        if verify:
+            self.verify(name, version, path)
+        if self._row(name, version).get("layout") == "compressed":
+            mmap_mode = None  # joblib cannot memory-map compressed files
+        return joblib.load(path, mmap_mode=mmap_mode)
+
+    def load_model(self, name, version=None, mmap_mode=None, verify=True):
+        """
+        Load a model from the registry.
+
+        Args:
+            name: Name of the model.
+            version: Integer version number. If None, loads latest.
+            mmap_mode: Passed to joblib.load (e.g. 'r') to memory-map large arrays.
+            verify: Check the artifact's sha256 (when one was recorded) before loading.
+        """
+        loaded_version, path = self.resolve(name, version)
+        print(f"Loading '{name}' version {loaded_version} from {path}")
+        return self.load_artifact(name, loaded_version, path, mmap_mode=mmap_mode, verify=verify)
+
+    def record_checksums(self):
+        """Hash and record artifacts of rows registered before checksums existed. Returns the count."""
+        updated = 0
+        self._require_schema()
+        for row in self._rows()[1]:
+            if row["sha256"]:
+                continue
+            _, path = self.resolve(row["name"], row["version"])
+            with self._cursor(commit=True) as c:
+                c.execute('UPDATE models SET sha256 = ?, size_bytes = ? WHERE id = ?',
+                          (file_sha256(path), os.path.getsize(path), row["id"]))
+            updated += 1
+        return updated
+
+    def get_metrics(self, name, version):
+        """Return the metrics dict recorded for a version ({} if none were recorded)."""
+        metrics = self._row(name, version)["metrics"]
+        return json.loads(metrics) if metrics else {}
+
+    def update_metrics(self, name, version, metrics):
+        """
+        Merge `metrics` into the metrics already recorded for a version
+        (e.g. add benchmark results next to MAE/AUC). Returns the merged dict.
+        """
+        self._require_schema()
+        merged = self.get_metrics(name, version) or {}
+        merged.update(metrics)
+        with self._cursor(commit=True) as c:
+            c.execute('UPDATE models SET metrics = ? WHERE name = ? AND version = ?',
+                      (json.dumps(merged), name, version))
+        return merged
+
+    def log_trials(self, study, name, trials):
+        """
+        Record hyperparameter trials for a tuning study.
+
+        Args:
+            study: Study id shared by every trial of one search run.
+            name: Model name the study tunes.
+            trials: Dicts with trial, rung, params, budget, fraction, best_iteration,
+                score, fold_scores and seconds.
+        """
+        self._require_schema()
+        with self._cursor(commit=True) as c:
+            c.executemany('''
+                INSERT INTO tuning_trials (study, name, trial, rung, params, budget, fraction, best_iteration, score, fold_scores, seconds)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [(study, name, t["trial"], t["rung"], json.dumps(t["params"]), t.get("budget"), t.get("fraction"),
+                   t.get("best_iteration"), t.get("score"), json.dumps(t.get("fold_scores")), t.get("seconds")) for t in trials])
+
+    def list_trials(self, name=None, study=None):
+        """List tuning trials, optionally for one model or study."""
+        query, params = "SELECT * FROM tuning_trials", []
+        filters = [(col, val) for col, val in (("name", name), ("study", study)) if val is not None]
+        if filters:
+            query += " WHERE " + " AND ".join(f"{col} = ?" for col, _ in filters)
+            params = [val for _, val in filters]
+        with self._lock:
+            try:
+                return pd.read_sql_query(query + " ORDER BY study, rung, score DESC", self._connect(), params=params)
+            except pd.errors.DatabaseError:
+                return pd.DataFrame()  # not migrated yet: no trials
 
     def list_models(self):
         """List all registered models."""
-        conn = sqlite3.connect(self.db_path)
-        df = pd.read_sql_query("SELECT * FROM models ORDER BY name, version DESC", conn)
-        conn.close()
-        return df
+        columns, rows = self._rows()
+        return pd.DataFrame(rows, columns=columns)
+
+    def set_alias(self, name, alias, version):
+        """
+        Point an alias (e.g. 'production') at an existing model version.
+
+        Args:
+            name: Name of the model.
+            alias: Alias name.
+            version: Integer version number; must already be registered.
+        """
+        self.resolve(name, version)  # raises if the version does not exist
+        self._require_schema()
+        with self._cursor(commit=True) as c:
+            c.execute('''
+                INSERT INTO model_aliases (name, alias, version, updated_at)
+                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(name, alias) DO UPDATE SET version = excluded.version, updated_at = excluded.updated_at
+            ''', (name, alias, int(version)))
+        print(f"✅ Alias '{name}@{alias}' -> version {version}")
+
+    def get_alias(self, name, alias):
+        """Return the version an alias points at, or None if it is not set."""
+        try:
+            with self._cursor() as c:
+                c.execute('SELECT version FROM model_aliases WHERE name = ? AND alias = ?', (name, alias))
+                res = c.fetchone()
+        except sqlite3.OperationalError:
+            return None  # not migrated yet: no aliases
+        return res[0] if res else None
+
+    def delete_alias(self, name, alias):
+        self._require_schema()
+        with self._cursor(commit=True) as c:
+            c.execute('DELETE FROM model_aliases WHERE name = ? AND alias = ?', (name, alias))
+
+    def list_aliases(self, name=None):
+        """List aliases, optionally for a single model."""
+        query, params = "SELECT * FROM model_aliases ORDER BY name, alias", None
+        if name is not None:
+            query, params = "SELECT * FROM model_aliases WHERE name = ? ORDER BY alias", (name,)
+        with self._lock:
+            try:
+                return pd.read_sql_query(query, self._connect(), params=params)
+            except pd.errors.DatabaseError:
+                return pd.DataFrame(columns=["name", "alias", "version", "updated_at"])  # not migrated yet
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect the model registry and move aliases.")
+    sub_parsers = parser.add_subparsers(dest="command", required=True)
+    sub_parsers.add_parser("list", help="List registered models and aliases")
+    sub_parsers.add_parser("migrate", help="Bring registry.db to the current schema")
+    alias_parser = sub_parsers.add_parser("set-alias", help="Point an alias at a version")
+    alias_parser.add_argument("name")
+    alias_parser.add_argument("alias")
+    alias_parser.add_argument("version", type=int)
+    register_parser = sub_parsers.add_parser("register", help="Register an existing artifact (no copy is made)")
+    register_parser.add_argument("name")
+    register_parser.add_argument("path")
+    register_parser.add_argument("--version", type=int, help="Explicit version (default: latest + 1)")
+    register_parser.add_argument("--source", help="Script that produced the artifact (recorded in params)")
+    verify_parser = sub_parsers.add_parser("verify", help="Check every artifact against its recorded sha256")
+    verify_parser.add_argument("--record", action="store_true", help="Record checksums for rows that have none")
+    args = parser.parse_args()
+
+    registry = ModelRegistry()
+    if args.command == "migrate":
+        old, new = registry.migrate()
+        print(f"✅ {registry.db_path}: schema v{old} -> v{new}" if old != new else f"✅ {registry.db_path} is up to date (v{new})")
+    elif args.command == "list":
+        models = registry.list_models()
+        print(models[[c for c in ("name", "version", "metrics", "layout", "size_bytes", "created_at") if c in models]].to_string(index=False))
+        print()
+        print(registry.list_aliases().to_string(index=False))
+    elif args.command == "set-alias":
+        registry.set_alias(args.name, args.alias, args.version)
+    elif args.command == "register":
+        params = {"source": args.source} if args.source else None
+        version = registry.register_artifact(args.name, args.path, version=args.version, params=params)
+        print(f"✅ Registered '{args.name}' version {version} -> {registry.resolve(args.name, version)[1]}")
+    elif args.command == "verify":
+        if args.record:
+            print(f"✅ Recorded checksums for {registry.record_checksums()} artifacts")
+        failed = False
+        for row in registry.list_models().itertuples():
+            try:
+                ok = registry.verify(row.name, row.version)
+                print(f"{'✅' if ok else '⚠️'} {row.name} v{row.version}: {'ok' if ok else 'no checksum recorded'}")
+            except (ValueError, FileNotFoundError) as e:
+                failed = True
+                print(f"❌ {row.name} v{row.version}: {e}")
+        registry.close()
+        raise SystemExit(1 if failed else 0)
+    registry.close()
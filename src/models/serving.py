@@ -0,0 +1,317 @@
+"""
+Zero-downtime model serving on top of registry aliases.
+
+A `ModelSlot` is what the API calls `predict`/`predict_proba` on. It follows a
+registry alias (e.g. `rent_valuation_model@production`); when `ModelWatcher`
+sees the alias move, the slot loads the new version through the shared
+ModelCache, warms it with sample rows (in the executor's workers too, when
+predictions run there), and only then swaps it in. Requests already running
+keep the model object they started with.
+
+Optional shadow mode scores a percentage of traffic with a second alias
+(e.g. `canary`) off the request path and records latency and prediction deltas.
+Shadow work is dropped rather than queued while the previous sample is still
+being scored, so it cannot pile up under load.
+"""
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.models.cache import get_model_cache
+
+
+class ShadowStats:
+    """Running comparison of primary vs shadow predictions."""
+
+    def __init__(self, max_samples=500):
+        self._lock = threading.Lock()
+        self.samples = deque(maxlen=max_samples)
+        self.count = 0
+        self.errors = 0
+        self.dropped = 0
+        self.sum_abs_delta = 0.0
+        self.max_abs_delta = 0.0
+        self.sum_primary_ms = 0.0
+        self.sum_shadow_ms = 0.0
+
+    def record(self, primary_version, shadow_version, primary_ms, shadow_ms, deltas):
+        abs_deltas = np.abs(np.asarray(deltas, dtype=float))
+        with self._lock:
+            self.count += 1
+            self.sum_abs_delta += float(abs_deltas.mean()) if abs_deltas.size else 0.0
+            self.max_abs_delta = max(self.max_abs_delta, float(abs_deltas.max()) if abs_deltas.size else 0.0)
+            self.sum_primary_ms += primary_ms
+            self.sum_shadow_ms += shadow_ms
+            self.samples.append({
+                "at": time.time(),
+                "primary_version": primary_version,
+                "shadow_version": shadow_version,
+                "primary_ms": round(primary_ms, 3),
+                "shadow_ms": round(shadow_ms, 3),
+                "mean_abs_delta": round(float(abs_deltas.mean()), 6) if abs_deltas.size else 0.0,
+            })
+
+    def record_error(self):
+        with self._lock:
+            self.errors += 1
+
+    def record_dropped(self):
+        with self._lock:
+            self.dropped += 1
+
+    def summary(self, recent=20):
+        with self._lock:
+            n = self.count
+            return {
+                "scored": n,
+                "errors": self.errors,
+                "dropped": self.dropped,
+                "mean_abs_delta": self.sum_abs_delta / n if n else None,
+                "max_abs_delta": self.max_abs_delta if n else None,
+                "mean_primary_ms": self.sum_primary_ms / n if n else None,
+                "mean_shadow_ms": self.sum_shadow_ms / n if n else None,
+                "recent": list(self.samples)[-recent:],
+            }
+
+
+class ModelSlot:
+    """
+    A served model that follows a registry alias and can be swapped atomically.
+
+    Args:
+        name: Registry model name.
+        alias: Registry alias to follow (falls back to the latest version if unset).
+        pinned_version: Serve this exact version and ignore the alias.
+        warmup_rows: List of feature dicts scored before a new version goes live.
+        cache: ModelCache to load through (defaults to the shared one).
+        executor: Optional ProcessExecutor (src/api/executor.py); when set, primary
+            predictions run in its worker processes instead of this one.
+    """
+
+    def __init__(self, name, alias="production", pinned_version=None, warmup_rows=None, cache=None, executor=None):
+        self.name = name
+        self.alias = alias
+        self.pinned_version = pinned_version
+        self.warmup_df = pd.DataFrame(warmup_rows) if warmup_rows else None
+        self.cache = cache or get_model_cache()
+        self.executor = executor
+        # (version, model); replaced as a whole so readers never see a torn pair
+        self._active = (None, None)
+        self._shadow = (None, None)
+        self.shadow_alias = None
+        self.shadow_percent = 0.0
+        self.shadow_stats = ShadowStats()
+        self._shadow_pool = None
+        # Held while a shadow sample is scored; released by the shadow thread
+        self._shadow_busy = threading.Lock()
+        self._swap_lock = threading.Lock()
+        self._listeners = []
+        self._score_listeners = []
+        self.swaps = 0
+        self.last_error = None
+        self.last_swap_at = None
+
+    # --- Introspection ---
+    @property
+    def version(self):
+        return self._active[0]
+
+    @property
+    def model(self):
+        return self._active[1]
+
+    @property
+    def loaded(self):
+        return self._active[1] is not None
+
+    def on_swap(self, callback):
+        """Register callback(slot, version, model), run after each successful swap."""
+        self._listeners.append(callback)
+
+    def on_score(self, callback):
+        """Register callback(slot, version, method, rows, seconds), run after each primary prediction."""
+        self._score_listeners.append(callback)
+
+    # --- Resolution / swapping ---
+    def target_version(self, alias=None):
+        """Version the slot should serve right now according to the registry."""
+        if alias is None and self.pinned_version is not None:
+            return self.pinned_version
+        registry = self.cache.registry
+        version = registry.get_alias(self.name, alias or self.alias)
+        if version is None and alias is None:
+            version = registry.get_latest_version(self.name) or None
+        return version
+
+    def _warm(self, version, model, method):
+        if self.warmup_df is not None:
+            getattr(model, method)(self.warmup_df)
+        # Primary predictions run in the workers: load the version there before it serves
+        if self.executor is not None and self.executor.running:
+            self.executor.warm(self.name, version, method, self.warmup_df)
+
+    def refresh(self):
+        """
+        Load, warm and swap in the target version if it changed. Returns True on swap.
+        Failures keep the current version serving.
+        """
+        with self._swap_lock:
+            try:
+                target = self.target_version()
+                if target is None:
+                    raise ValueError(f"No versions registered for '{self.name}'")
+                if target == self.version:
+                    return False
+                version, model = self.cache.get_with_version(self.name, target)
+                self._warm(version, model, "predict")
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"❌ Model swap failed for '{self.name}': {e}")
+                return False
+            previous = self.version
+            self._active = (version, model)
+            self.swaps += 1
+            self.last_swap_at = time.time()
+            self.last_error = None
+        print(f"🔁 '{self.name}' now serving v{version} (was v{previous})")
+        for callback in self._listeners:
+            try:
+                callback(self, version, model)
+            except Exception as e:
+                print(f"❌ Model swap listener failed: {e}")
+        return True
+
+    def configure_shadow(self, alias, percent):
+        """Score `percent`% of calls with the `alias` version in the background."""
+        self.shadow_alias = alias
+        self.shadow_percent = max(0.0, min(100.0, float(percent)))
+        if self.shadow_percent > 0 and self._shadow_pool is None:
+            self._shadow_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"shadow-{self.name}")
+        self.refresh_shadow()
+
+    def refresh_shadow(self):
+        if not self.shadow_alias or self.shadow_percent <= 0:
+            self._shadow = (None, None)
+            return False
+        try:
+            target = self.target_version(self.shadow_alias)
+            if target is None or target == self._shadow[0]:
+                return False
+            version, model = self.cache.get_with_version(self.name, target)
+            # Shadow scoring runs in this process, so only warm it here
+            if self.warmup_df is not None:
+                model.predict(self.warmup_df)
+            self._shadow = (version, model)
+            print(f"👥 '{self.name}' shadowing v{version} ({self.shadow_alias}) on {self.shadow_percent:g}% of traffic")
+            return True
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"❌ Shadow load failed for '{self.name}': {e}")
+            return False
+
+    # --- Scoring ---
+    def _score(self, method, X):
+        version, model = self._active
+        if model is None:
+            raise RuntimeError(f"Model '{self.name}' is not loaded")
+        start = time.perf_counter()
+        if self.executor is not None and self.executor.running:
+            result = self.executor.predict(self.name, version, method, X)
+        else:
+            result = getattr(model, method)(X)
+        primary_ms = (time.perf_counter() - start) * 1000
+        for callback in self._score_listeners:
+            try:
+                callback(self, version, method, len(X), primary_ms / 1000)
+            except Exception as e:
+                print(f"❌ Model score listener failed: {e}")
+
+        shadow_version, shadow_model = self._shadow
+        if (shadow_model is not None and shadow_version != version and self._shadow_pool is not None
+                and random.random() * 100 < self.shadow_percent):
+            if not self._shadow_busy.acquire(blocking=False):
+                # The previous sample is still being scored: drop this one instead of queueing
+                self.shadow_stats.record_dropped()
+            else:
+                self._shadow_pool.submit(self._score_shadow, method, X, version, result, primary_ms,
+                                         shadow_version, shadow_model)
+        return result
+
+    def _score_shadow(self, method, X, version, primary_result, primary_ms, shadow_version, shadow_model):
+        try:
+            start = time.perf_counter()
+            shadow_result = getattr(shadow_model, method)(X)
+            shadow_ms = (time.perf_counter() - start) * 1000
+            deltas = np.asarray(shadow_result, dtype=float) - np.asarray(primary_result, dtype=float)
+            self.shadow_stats.record(version, shadow_version, primary_ms, shadow_ms, deltas.ravel())
+        except Exception:
+            self.shadow_stats.record_error()
+        finally:
+            self._shadow_busy.release()
+
+    def predict(self, X):
+        return self._score("predict", X)
+
+    def predict_proba(self, X):
+        return self._score("predict_proba", X)
+
+    def status(self):
+        return {
+            "name": self.name,
+            "alias": None if self.pinned_version is not None else self.alias,
+            "pinned_version": self.pinned_version,
+            "version": self.version,
+            "swaps": self.swaps,
+            "last_swap_at": self.last_swap_at,
+            "last_error": self.last_error,
+            "shadow": {
+                "alias": self.shadow_alias,
+                "percent": self.shadow_percent,
+                "version": self._shadow[0],
+                **self.shadow_stats.summary(),
+            } if self.shadow_alias and self.shadow_percent > 0 else None,
+        }
+
+
+class ModelWatcher:
+    """Background thread that polls registry aliases and refreshes slots."""
+
+    def __init__(self, slots, interval=15.0):
+        self.slots = slots
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self.interval <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="model-watch", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def check_now(self):
+        swapped = []
+        for slot in list(self.slots):
+            if slot.refresh():
+                swapped.append(slot.name)
+            slot.refresh_shadow()
+        return swapped
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check_now()
+            except Exception as e:
+                print(f"❌ Model watch error: {e}")
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
@@ -0,0 +1,74 @@
+"""
+XGBoost valuation pipeline with native categorical splits.
+
+Instead of one-hot encoding `neighborhood` / `class` / `type` (one column per
+category, which grows with every new neighborhood), `CategoryCaster` turns
+them into pandas categoricals with the category lists fixed at fit time, and
+XGBoost's `hist` tree method splits on category sets directly. The pipeline
+takes the same DataFrame columns as the earlier valuation versions, so the API,
+lookup table and micro-batcher serve it unchanged.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.pipeline import Pipeline
+
+XGB_THREADS = int(os.getenv("XGB_THREADS", str(os.cpu_count() or 1)))
+
+CATEGORICAL_FEATURES = ['neighborhood', 'class', 'type']
+NUMERIC_FEATURES = ['sqft']
+
+# Shallow trees: the portfolio has few units per neighborhood/class/type cell
+DEFAULT_PARAMS = {
+    'n_estimators': 300,
+    'learning_rate': 0.05,
+    'max_depth': 3,
+    'min_child_weight': 5,
+    'subsample': 0.8,
+    'max_cat_to_onehot': 1,  # always partition-based categorical splits
+    'max_bin': 256,
+}
+
+
+class CategoryCaster(BaseEstimator, TransformerMixin):
+    """
+    Cast categorical columns to pandas categoricals with the categories seen at
+    fit time (unknown values become missing) and numeric columns to float32.
+
+    Args:
+        categorical: Columns to cast to categoricals.
+        numeric: Columns passed through as float32.
+    """
+
+    def __init__(self, categorical=CATEGORICAL_FEATURES, numeric=NUMERIC_FEATURES):
+        self.categorical = categorical
+        self.numeric = numeric
+
+    def fit(self, X, y=None):
+        self.feature_names_in_ = np.asarray(list(X.columns), dtype=object)
+        self.categories_ = {col: sorted(pd.unique(X[col].dropna().astype(str))) for col in self.categorical}
+        return self
+
+    def transform(self, X):
+        out = {}
+        for col in self.feature_names_in_:
+            if col in self.categories_:
+                dtype = pd.CategoricalDtype(self.categories_[col])
+                out[col] = pd.Categorical(X[col].astype(str), dtype=dtype)
+            else:
+                out[col] = X[col].to_numpy(dtype=np.float32)
+        return pd.DataFrame(out, index=X.index)
+
+    def get_feature_names_out(self, input_features=None):
+        return self.feature_names_in_
+
+
+def build_pipeline(params=None, n_jobs=XGB_THREADS, random_state=42):
+    """Unfitted `Pipeline([('categorize', CategoryCaster), ('regressor', XGBRegressor)])`."""
+    from xgboost import XGBRegressor
+
+    regressor = XGBRegressor(tree_method='hist', enable_categorical=True, n_jobs=n_jobs,
+                             random_state=random_state, **{**DEFAULT_PARAMS, **(params or {})})
+    return Pipeline(steps=[('categorize', CategoryCaster()), ('regressor', regressor)])
@@ -7,17 +7,22 @@ from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
 from sklearn.metrics import mean_absolute_error, r2_score
 import joblib
+import sys
+import os
+
+# Add repo root to path to import the data store
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+from src.data.store import load_dataset
+from src.data.features import load_features
 
 # 1. Load Data
 # We use the synthetic 'calibrated' units as our "Internal" data
 # We use the scraped real listings as our "Competitor" data
-internal_df = pd.read_csv(r"d:/Python-2025/Antigravity/Beekin_Analysis/src/data/synthetic/calibrated_units.csv")
-props_df = pd.read_csv(r"d:/Python-2025/Antigravity/Beekin_Analysis/src/data/synthetic/calibrated_properties.csv")
-# Join property details (neighborhood/class) to units
-df = internal_df.merge(props_df, on='property_id', how='left')
+# Units with property details (neighborhood/class), joined once by the feature store
+df = load_features("unit_features")
 
 # 2. Competitor Data Analysis
-real_df = pd.read_csv(r"d:/Python-2025/Antigravity/Beekin_Analysis/src/data/scrapers/real_listings.csv")
+real_df = load_dataset("listings")
 # Simple standardization of competitor data to match our schema for comparison
 real_df['neighborhood'] = 'Competitor_Market' # We simplify for now as precise mapping is complex
 # Calculate Competitor Avg per Bedroom Type
@@ -0,0 +1,129 @@
+"""
+Valuation v5: XGBoost `hist` with native categorical splits.
+
+Trains `native_xgb.build_pipeline()` on the unit feature table. On the same
+split, it also refits the current production valuation recipe (v4) and the
+one-hot RandomForest from train_model.py. The report compares training time,
+single-row latency, batch throughput, pickled size, MAE and R2 for each, and
+the XGBoost model is registered as the next `rent_valuation_model` version.
+
+Usage:
+    python src/models/valuation/train_xgb.py                # train, compare, register
+    python src/models/valuation/train_xgb.py --no-register
+    python src/models/valuation/train_xgb.py --promote      # also point 'production' at it
+"""
+import argparse
+import os
+import pickle
+import sys
+import time
+import warnings
+
+import pandas as pd
+from sklearn.base import clone
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_absolute_error, r2_score
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder
+
+# Add repo root to path to import the data store and registry
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+from src.data.features import load_features
+from src.models.benchmark import measure_latency, measure_throughput
+from src.models.registry import ModelRegistry
+from src.models.valuation.native_xgb import (CATEGORICAL_FEATURES, DEFAULT_PARAMS, NUMERIC_FEATURES,
+                                             XGB_THREADS, build_pipeline)
+
+MODEL_NAME = 'rent_valuation_model'
+FEATURES = CATEGORICAL_FEATURES + NUMERIC_FEATURES
+TARGET = 'market_rent'
+LATENCY_CALLS = 200
+BATCH_ROWS = 10_000
+
+
+def onehot_forest():
+    """The RandomForest candidate from train_model.py."""
+    preprocessor = ColumnTransformer(transformers=[
+        ('num', 'passthrough', NUMERIC_FEATURES),
+        ('cat', OneHotEncoder(handle_unknown='ignore'), CATEGORICAL_FEATURES),
+    ])
+    return Pipeline(steps=[('preprocessor', preprocessor),
+                           ('regressor', RandomForestRegressor(n_estimators=100, random_state=42))])
+
+
+def profile(label, model, columns, X_train, y_train, X_test, y_test):
+    """Fit `model` on `columns` of the training split and measure it on the test split."""
+    start = time.perf_counter()
+    model.fit(X_train[columns], y_train)
+    train_seconds = time.perf_counter() - start
+
+    predictions = model.predict(X_test[columns])
+    batch = X_test[columns].sample(BATCH_ROWS, replace=True, random_state=0)
+    latency = measure_latency(model.predict, [X_test[columns].iloc[[i % len(X_test)]] for i in range(LATENCY_CALLS)],
+                              LATENCY_CALLS)
+    return {
+        'model': label,
+        'features': len(columns),
+        'train_s': round(train_seconds, 3),
+        'p50_ms': latency['p50'],
+        'p99_ms': latency['p99'],
+        f'rows_per_s@{BATCH_ROWS}': measure_throughput(model.predict, batch, BATCH_ROWS),
+        'size_kb': round(len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)) / 1024, 1),
+        'mae': round(float(mean_absolute_error(y_test, predictions)), 2),
+        'r2': round(float(r2_score(y_test, predictions)), 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train valuation v5 (XGBoost, native categoricals) and compare with v4.")
+    parser.add_argument('--no-register', action='store_true', help="Only print the comparison")
+    parser.add_argument('--promote', action='store_true', help="Point the 'production' alias at the new version")
+    args = parser.parse_args()
+
+    # Artifacts pickled with an older sklearn still load; keep the report readable
+    warnings.filterwarnings('ignore', category=UserWarning)
+
+    # 1. Load Data (units joined to properties, from the feature store)
+    print("Loading Data...")
+    df = load_features("unit_features")
+    X_train, X_test, y_train, y_test = train_test_split(df[FEATURES], df[TARGET], test_size=0.2, random_state=42)
+
+    # 2. Current production recipe, refitted on the same split
+    registry = ModelRegistry()
+    current_version = registry.get_alias(MODEL_NAME, 'production') or registry.get_latest_version(MODEL_NAME)
+    current = registry.load_model(MODEL_NAME, current_version)
+    current_features = [str(c) for c in getattr(current, 'feature_names_in_', FEATURES)]
+
+    # 3. Train & Compare
+    print(f"\n--- Training (XGBoost on {XGB_THREADS} threads) ---")
+    v5 = build_pipeline()
+    report = pd.DataFrame([
+        profile(f"v{current_version} (production, refit)", clone(current), current_features, X_train, y_train, X_test, y_test),
+        profile("one-hot RandomForest (train_model.py)", onehot_forest(), FEATURES, X_train, y_train, X_test, y_test),
+        profile("XGBoost hist, native categoricals", v5, FEATURES, X_train, y_train, X_test, y_test),
+    ])
+    print(report.to_string(index=False))
+    result = report.iloc[-1].to_dict()
+
+    # 4. Register
+    if args.no_register:
+        return
+    metrics = {
+        'mae': result['mae'],
+        'r2': result['r2'],
+        'train_seconds': result['train_s'],
+        'comparison': report.to_dict('records'),
+    }
+    params = {**DEFAULT_PARAMS, 'tree_method': 'hist', 'enable_categorical': True, 'n_jobs': XGB_THREADS,
+              'features': FEATURES, 'source': 'src/models/valuation/train_xgb.py'}
+    version = registry.save_model(v5, MODEL_NAME, metrics=metrics, params=params)
+    print(f"\n✅ Registered {MODEL_NAME} v{version}")
+    if args.promote:
+        registry.set_alias(MODEL_NAME, 'production', version)
+        print(f"✅ production -> v{version}")
+
+
+if __name__ == '__main__':
+    main()
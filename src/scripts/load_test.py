@@ -0,0 +1,281 @@
+"""
+Offline load test for the API.
+
+Starts the FastAPI app in-process (httpx ASGI transport, lifespan included),
+points the LLM agents at a local stub server, drives a weighted mix of routes
+at a fixed concurrency, and reports throughput and p50/p95/p99 per route.
+Results can be saved as a baseline and later runs compared against it:
+
+    python src/scripts/load_test.py --mix dashboard --concurrency 16 --requests 600
+    python src/scripts/load_test.py --save-baseline          # record src/scripts/load_baseline.json
+    python src/scripts/load_test.py --compare                 # exit 1 on p95/throughput regressions
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "load_baseline.json")
+
+# Route mixes: operation -> relative weight
+MIXES = {
+    # Dashboard browsing: mostly reads and widget predictions
+    "dashboard": {"properties": 20, "tenants": 15, "listings": 15, "predict_rent": 25, "predict_churn": 20, "token": 3, "chat": 2},
+    # Model endpoints only
+    "predict": {"predict_rent": 50, "predict_churn": 50},
+    # Assistant-heavy traffic (RAG + stubbed LLM)
+    "chat": {"chat": 60, "tenants": 20, "properties": 20},
+    # Everything equally
+    "uniform": {"token": 1, "properties": 1, "tenants": 1, "listings": 1, "predict_rent": 1, "predict_churn": 1, "chat": 1},
+}
+
+CHAT_MESSAGES = [
+    "how many tenants are high risk",
+    "give me an overview count",
+    "show me listings available in Harlem",
+    "which property has the highest noi",
+]
+LISTING_QUERIES = [None, "1br harlem", "2br", "studio", "undervalued 1br"]
+
+
+# --- 1. LLM STUB ---
+class _StubHandler(BaseHTTPRequestHandler):
+    latency = 0.05
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        time.sleep(self.latency)
+        body = json.dumps({"choices": [{"message": {"content": "Stubbed analysis for load testing."}}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_llm_stub(latency_ms):
+    """Serve a fake chat-completions endpoint on localhost; returns (server, url)."""
+    handler = type("StubHandler", (_StubHandler,), {"latency": latency_ms / 1000})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, name="llm-stub", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/chat/completions"
+
+
+# --- 2. OPERATIONS ---
+async def op_token(client, ctx, rng):
+    return "POST /token", await client.post("/token", data={"username": "admin", "password": "superadmin123"})
+
+async def op_properties(client, ctx, rng):
+    return "GET /properties", await client.get("/properties", headers=ctx["auth"])
+
+async def op_tenants(client, ctx, rng):
+    return "GET /tenants", await client.get("/tenants", headers=ctx["auth"])
+
+async def op_listings(client, ctx, rng):
+    query = rng.choice(LISTING_QUERIES)
+    return "GET /listings", await client.get("/listings", params={"query": query} if query else None)
+
+async def op_predict_rent(client, ctx, rng):
+    body = {
+        "neighborhood": rng.choice(["Tribeca", "Harlem", "East Village", "Upper East Side", "Financial District"]),
+        "property_class": rng.choice(["Class A (Luxury)", "Class B", "Class C"]),
+        "unit_type": rng.choice(["Studio", "1 Bed", "2 Bed"]),
+        "sqft": rng.randint(350, 1800),
+    }
+    return "POST /predict/rent", await client.post("/predict/rent", json=body)
+
+async def op_predict_churn(client, ctx, rng):
+    body = {"income": rng.randint(40000, 250000), "credit_score": rng.randint(520, 820), "market_rent": rng.randint(1800, 7000)}
+    return "POST /predict/churn", await client.post("/predict/churn", json=body)
+
+async def op_chat(client, ctx, rng):
+    return "POST /chat", await client.post("/chat", json={"message": rng.choice(CHAT_MESSAGES)}, headers=ctx["auth"])
+
+OPERATIONS = {
+    "token": op_token,
+    "properties": op_properties,
+    "tenants": op_tenants,
+    "listings": op_listings,
+    "predict_rent": op_predict_rent,
+    "predict_churn": op_predict_churn,
+    "chat": op_chat,
+}
+
+
+# --- 3. RUNNER ---
+async def run_load(app, lifespan, mix, concurrency, total_requests, warmup, seed):
+    import httpx
+
+    weights = MIXES[mix]
+    ops, op_weights = list(weights), list(weights.values())
+    samples = []  # (route, seconds, status)
+
+    async with lifespan(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=120) as client:
+            token = (await client.post("/token", data={"username": "admin", "password": "superadmin123"})).json()["access_token"]
+            ctx = {"auth": {"Authorization": f"Bearer {token}"}}
+
+            # Warm caches / lazy imports so they do not skew the first percentiles
+            warm_rng = random.Random(seed - 1)
+            for name in ops:
+                for _ in range(max(1, warmup // len(ops))):
+                    await OPERATIONS[name](client, ctx, warm_rng)
+
+            remaining = {"n": total_requests}
+
+            async def worker(worker_id):
+                rng = random.Random(seed + worker_id)
+                while remaining["n"] > 0:
+                    remaining["n"] -= 1
+                    name = rng.choices(ops, weights=op_weights)[0]
+                    start = time.perf_counter()
+                    try:
+                        route, response = await OPERATIONS[name](client, ctx, rng)
+                        status = response.status_code
+                    except Exception:
+                        route, status = name, 599
+                    samples.append((route, time.perf_counter() - start, status))
+
+            start = time.perf_counter()
+            await asyncio.gather(*[worker(i) for i in range(concurrency)])
+            elapsed = time.perf_counter() - start
+    return samples, elapsed
+
+
+def summarize(samples, elapsed):
+    routes = {}
+    for route in sorted({s[0] for s in samples}):
+        latencies = np.array([s[1] for s in samples if s[0] == route]) * 1000
+        errors = sum(1 for s in samples if s[0] == route and s[2] >= 400)
+        routes[route] = {
+            "requests": int(len(latencies)),
+            "errors": errors,
+            "rps": round(len(latencies) / elapsed, 2),
+            "p50_ms": round(float(np.percentile(latencies, 50)), 2),
+            "p95_ms": round(float(np.percentile(latencies, 95)), 2),
+            "p99_ms": round(float(np.percentile(latencies, 99)), 2),
+        }
+    all_latencies = np.array([s[1] for s in samples]) * 1000
+    overall = {
+        "requests": len(samples),
+        "errors": sum(1 for s in samples if s[2] >= 400),
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(len(samples) / elapsed, 2),
+        "p50_ms": round(float(np.percentile(all_latencies, 50)), 2),
+        "p95_ms": round(float(np.percentile(all_latencies, 95)), 2),
+        "p99_ms": round(float(np.percentile(all_latencies, 99)), 2),
+    }
+    return {"overall": overall, "routes": routes}
+
+
+def compare(result, baseline, tolerance, min_delta_ms=5.0):
+    """
+    Routes whose p95 grew by more than `tolerance` (fraction) and `min_delta_ms`,
+    new errors, or an overall throughput drop beyond `tolerance`.
+    """
+    regressions = []
+    for route, stats in result["routes"].items():
+        base = baseline.get("routes", {}).get(route)
+        if not base:
+            continue
+        if stats["p95_ms"] > base["p95_ms"] * (1 + tolerance) and stats["p95_ms"] - base["p95_ms"] > min_delta_ms:
+            regressions.append(f"{route}: p95 {base['p95_ms']:.1f}ms -> {stats['p95_ms']:.1f}ms")
+        if stats["errors"] > base.get("errors", 0):
+            regressions.append(f"{route}: errors {base.get('errors', 0)} -> {stats['errors']}")
+    base_rps = baseline.get("overall", {}).get("rps")
+    if base_rps and result["overall"]["rps"] < base_rps * (1 - tolerance):
+        regressions.append(f"overall: {base_rps:.1f} req/s -> {result['overall']['rps']:.1f} req/s")
+    return regressions
+
+
+def print_report(result, config):
+    import pandas as pd
+    print(f"\n⏱️ Load test: mix={config['mix']} concurrency={config['concurrency']} requests={config['requests']}")
+    table = pd.DataFrame.from_dict(result["routes"], orient="index")
+    print(table.to_string())
+    o = result["overall"]
+    print(f"\nOverall: {o['requests']} requests in {o['elapsed_s']:.2f}s = {o['rps']:.1f} req/s "
+          f"(p50 {o['p50_ms']:.1f}ms, p95 {o['p95_ms']:.1f}ms, p99 {o['p99_ms']:.1f}ms, errors {o['errors']})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="In-process load test for the ASA API.")
+    parser.add_argument("--mix", choices=sorted(MIXES), default="dashboard")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=600)
+    parser.add_argument("--warmup", type=int, default=14, help="Requests spread over the mix before measuring")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--llm-latency-ms", type=float, default=50.0, help="Latency of the stubbed LLM API")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    # Saving first would overwrite the baseline and then compare the run against itself
+    baseline_mode = parser.add_mutually_exclusive_group()
+    baseline_mode.add_argument("--save-baseline", action="store_true", help="Write this run as the new baseline")
+    baseline_mode.add_argument("--compare", action="store_true", help="Compare with the baseline; exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed fractional p95 / throughput regression")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="Ignore p95 increases smaller than this")
+    parser.add_argument("--output", help="Also write the results JSON here")
+    args = parser.parse_args()
+
+    try:
+        import httpx  # noqa: F401  (used by run_load; not in requirements.txt)
+    except ImportError:
+        print("❌ The load test needs httpx for its in-process ASGI client: pip install httpx")
+        sys.exit(2)
+
+    # Must be configured before the agents module is imported
+    stub, stub_url = start_llm_stub(args.llm_latency_ms)
+    os.environ["PERPLEXITY_API_URL"] = stub_url
+    os.environ["PERPLEXITY_API_KEY"] = "load-test-stub"
+    os.environ.setdefault("DATA_WATCH_SECONDS", "0")
+    os.environ.setdefault("MODEL_WATCH_SECONDS", "0")
+
+    from src.api import server
+
+    samples, elapsed = asyncio.run(run_load(server.app, server.lifespan, args.mix, args.concurrency,
+                                            args.requests, args.warmup, args.seed))
+    stub.shutdown()
+    config = {"mix": args.mix, "concurrency": args.concurrency, "requests": args.requests,
+              "llm_latency_ms": args.llm_latency_ms, "cpu_count": os.cpu_count()}
+    result = dict(summarize(samples, elapsed), config=config, recorded_at=time.strftime("%Y-%m-%dT%H:%M:%S"))
+    print_report(result, config)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"✅ Baseline saved to {args.baseline}")
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"❌ No baseline at {args.baseline}; run with --save-baseline first")
+            sys.exit(2)
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("config", {}).get("mix") != args.mix or baseline.get("config", {}).get("concurrency") != args.concurrency:
+            print(f"⚠️ Baseline was recorded with {baseline.get('config')}; comparison may not be meaningful")
+        regressions = compare(result, baseline, args.tolerance, args.min_delta_ms)
+        if regressions:
+            print("❌ Regressions vs baseline:")
+            for line in regressions:
+                print(f"   - {line}")
+            sys.exit(1)
+        print(f"✅ No regressions vs baseline (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
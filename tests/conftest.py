@@ -0,0 +1,16 @@
+"""Shared fixtures for the synthetic-portfolio tests."""
+from datetime import date
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def stats():
+    """Rent (mu, sigma) per unit type, as `calibrate_parameters` returns them."""
+    return {"Studio": (2500, 500), "1BD": (3200, 600), "2BD": (4500, 1000), "3BD": (6000, 1500)}
+
+
+@pytest.fixture(scope="session")
+def as_of():
+    """Fixed date lease start dates count back from, so generated portfolios do not depend on today."""
+    return date(2026, 1, 1)
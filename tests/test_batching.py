@@ -0,0 +1,97 @@
+"""MicroBatcher coalescing, ordering and stats (src/models/batching.py)."""
+import asyncio
+
+import numpy as np
+
+from src.models.batching import MicroBatcher
+
+
+def _double(df):
+    return df["x"].to_numpy() * 2
+
+
+async def _submit_all(batcher, values):
+    return await asyncio.gather(*(batcher.submit({"x": v}) for v in values))
+
+
+def test_concurrent_requests_share_a_batch_and_keep_their_rows():
+    calls = []
+
+    def predict(df):
+        calls.append(len(df))
+        return _double(df)
+
+    batcher = MicroBatcher("test", predict, max_batch_size=32, max_wait_ms=50)
+    results = asyncio.run(_submit_all(batcher, range(10)))
+
+    assert [float(r) for r in results] == [2.0 * v for v in range(10)]
+    assert calls == [10]
+    status = batcher.status()
+    assert status["batches"] == 1 and status["requests"] == 10
+    assert status["largest_batch"] == 10
+
+
+def test_batches_are_capped_at_max_batch_size():
+    batcher = MicroBatcher("test", _double, max_batch_size=4, max_wait_ms=50)
+    results = asyncio.run(_submit_all(batcher, range(10)))
+
+    assert [float(r) for r in results] == [2.0 * v for v in range(10)]
+    status = batcher.status()
+    # The configured limit is not overwritten by the stats
+    assert status["max_batch_size"] == 4
+    assert status["largest_batch"] == 4
+    assert sum(size * n for size, n in status["batch_sizes"].items()) == 10
+    assert max(status["batch_sizes"]) <= 4
+
+
+def test_predict_errors_reach_every_caller():
+    def fail(df):
+        raise ValueError("model unavailable")
+
+    batcher = MicroBatcher("test", fail, max_batch_size=8, max_wait_ms=20)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit({"x": v}) for v in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, ValueError) for r in results)
+    assert batcher.status()["errors"] == 1
+
+
+def test_wrong_length_results_fail_the_batch_and_the_worker_survives():
+    def predict(df):
+        return _double(df)[:-1] if len(df) > 1 else _double(df)
+
+    batcher = MicroBatcher("test", predict, max_batch_size=8, max_wait_ms=20)
+
+    async def run():
+        first = await asyncio.wait_for(
+            asyncio.gather(*(batcher.submit({"x": v}) for v in range(3)), return_exceptions=True), timeout=5)
+        # The same worker still answers later requests
+        second = await asyncio.wait_for(batcher.submit({"x": 4}), timeout=5)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert all(isinstance(r, ValueError) and "batch of 3 rows" in str(r) for r in first)
+    assert float(second) == 8.0
+    assert batcher.status()["errors"] == 1
+
+
+def test_unbuildable_rows_fail_instead_of_hanging():
+    batcher = MicroBatcher("test", _double, max_batch_size=8, max_wait_ms=20)
+
+    async def run():
+        # A dict and a scalar in one batch make the DataFrame build raise
+        failed = await asyncio.wait_for(
+            asyncio.gather(batcher.submit({"x": 1}), batcher.submit(5), return_exceptions=True), timeout=5)
+        return failed, await asyncio.wait_for(batcher.submit({"x": 1}), timeout=5)
+
+    failed, result = asyncio.run(run())
+    assert all(isinstance(r, TypeError) for r in failed)
+    assert float(result) == 2.0
+
+
+def test_rows_of_2d_results_are_returned_per_caller():
+    batcher = MicroBatcher("test", lambda df: np.column_stack([1 - df["x"], df["x"]]), max_wait_ms=20)
+    results = asyncio.run(_submit_all(batcher, [0.1, 0.7]))
+    assert np.allclose(results[1], [0.3, 0.7])
@@ -0,0 +1,78 @@
+"""Inference benchmark suite (src/models/benchmark.py)."""
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+from src.models.benchmark import (ENGINES, _native_engine, _prediction_fn, benchmark_model, benchmark_table,
+                                  measure_latency, measure_throughput)
+from src.models.registry import ModelRegistry
+
+NAME = "test_model"
+
+
+@pytest.fixture(scope="module")
+def source():
+    rng = np.random.default_rng(0)
+    n = 300
+    return pd.DataFrame({
+        "income": rng.normal(100000, 30000, n),
+        "sqft": rng.integers(300, 1500, n),
+        "class": rng.choice(["A", "B", "C"], n).astype(object),
+        "churned": rng.integers(0, 2, n),
+    })
+
+
+@pytest.fixture(scope="module")
+def model(source):
+    pre = ColumnTransformer([("num", StandardScaler(), ["income", "sqft"]),
+                             ("cat", OneHotEncoder(handle_unknown="ignore"), ["class"])])
+    clf = Pipeline([("preprocessor", pre), ("classifier", RandomForestClassifier(n_estimators=5, random_state=0))])
+    return clf.fit(source[["income", "sqft", "class"]], source["churned"])
+
+
+@pytest.fixture
+def registry(tmp_path, model):
+    registry = ModelRegistry(db_path=str(tmp_path / "registry.db"), models_dir=str(tmp_path))
+    registry.save_model(model, NAME)
+    return registry
+
+
+def test_measure_latency_times_every_call():
+    calls = []
+    latency = measure_latency(calls.append, ["a", "b"], calls=10)
+    assert calls == ["a"] + ["a", "b"] * 5  # warm-up, then rows cycled
+    assert 0 <= latency["p50"] <= latency["p95"] <= latency["p99"]
+
+
+def test_measure_throughput_calls_at_least_once():
+    calls = []
+    rate = measure_throughput(calls.append, "batch", 100, min_seconds=0)
+    assert calls == ["batch", "batch"]  # warm-up plus one timed call
+    assert rate > 0
+
+
+def test_native_engine_scores_like_the_pipeline(model, source):
+    encode, predict = _native_engine(model)
+    X = source[["income", "sqft", "class"]]
+    np.testing.assert_allclose(predict(encode(X)), _prediction_fn(model)(X))
+
+
+def test_benchmark_model_reports_every_engine(registry, source):
+    result = benchmark_model(registry, NAME, 1, source, batch_sizes=(1, 50), latency_calls=20)
+    assert set(result["engines"]) == set(ENGINES)
+    for stats in result["engines"].values():
+        assert set(stats["rows_per_s"]) == {"1", "50"}
+        assert all(rate > 0 for rate in stats["rows_per_s"].values())
+    assert result["host"]["cpu_count"]
+
+    table = benchmark_table(NAME, 1, result)
+    assert list(table["engine"]) == list(result["engines"])
+    assert {"p50_ms", "p99_ms", "rps@1", "rps@50"} <= set(table.columns)
+
+
+def test_benchmark_skips_versions_missing_columns(registry, source):
+    assert benchmark_model(registry, NAME, 1, source.drop(columns=["sqft"]), batch_sizes=(1,), latency_calls=5) is None
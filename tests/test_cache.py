@@ -0,0 +1,50 @@
+"""Registry-backed LRU model cache (src/models/cache.py)."""
+import os
+
+import pandas as pd
+import pytest
+from sklearn.dummy import DummyRegressor
+
+from src.models.cache import ModelCache
+from src.models.registry import ModelRegistry
+
+NAME = "test_model"
+X = pd.DataFrame({"x": [1.0, 2.0]})
+
+
+@pytest.fixture
+def registry(tmp_path):
+    registry = ModelRegistry(db_path=str(tmp_path / "registry.db"), models_dir=str(tmp_path))
+    for value in (1.0, 2.0, 3.0):
+        registry.save_model(DummyRegressor(strategy="constant", constant=value).fit(X, [value] * len(X)), NAME)
+    return registry
+
+
+def _versions(cache):
+    return [version for _, version in cache._entries]
+
+
+def test_least_recently_used_version_is_evicted(registry):
+    cache = ModelCache(registry, max_entries=2)
+    cache.get(NAME, 1)
+    cache.get(NAME, 2)
+    cache.get(NAME, 1)  # hit: version 2 is now the oldest
+    cache.get(NAME, 3)
+
+    assert _versions(cache) == [1, 3]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 3, 1)
+
+
+def test_byte_budget_evicts_but_keeps_the_newest_entry(registry):
+    size = os.path.getsize(registry.resolve(NAME, 1)[1])
+    cache = ModelCache(registry, max_entries=10, max_bytes=int(size * 1.5))
+    cache.get(NAME, 1)
+    cache.get(NAME, 2)
+    assert _versions(cache) == [2]
+    assert cache.stats()["total_bytes"] <= cache.max_bytes
+
+    # A single artifact over budget is still served rather than evicted
+    cache = ModelCache(registry, max_bytes=1)
+    assert cache.get(NAME) is not None
+    assert _versions(cache) == [3]
@@ -0,0 +1,22 @@
+"""Calibration provenance (src/data/synthetic/calibration.py)."""
+import os
+
+import pytest
+
+from src.data import store
+from src.data.synthetic import calibration
+from src.data.synthetic.calibration import REPO_ROOT, calibrate, load_calibration
+from src.models.registry import file_sha256
+
+
+def test_source_is_stored_relative_to_the_repo(tmp_path, monkeypatch):
+    out = str(tmp_path / "calibration.json")
+    source = store.source_path("listings")
+    fitted = calibrate(source, out=out)
+    assert not os.path.isabs(fitted.meta["source"])
+    assert os.path.samefile(os.path.join(REPO_ROOT, fitted.meta["source"]), source)
+    assert fitted.meta["source_sha256"] == file_sha256(source)
+
+    # Unchanged source: the saved artifact is current and loads without a refit
+    monkeypatch.setattr(calibration, "calibrate", lambda **kwargs: pytest.fail("refitted a current calibration"))
+    assert load_calibration(out).meta == fitted.meta
@@ -0,0 +1,52 @@
+"""Batch portfolio churn scoring (src/models/churn_scoring.py)."""
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+from src.data.features import build_tenant_features
+from src.data.synthetic.vectorized import generate_vectorized
+from src.models.churn.labels import simulate_churn
+from src.models.churn_scoring import CHURN_FEATURES, ChurnScores, build_churn_features, risk_level, score_portfolio
+
+
+@pytest.fixture(scope="module")
+def portfolio(stats, as_of):
+    props, units, tenants = generate_vectorized(stats, 2, seed=3, as_of=as_of)[:3]
+    return tenants, units, props
+
+
+@pytest.fixture(scope="module")
+def model(portfolio):
+    df = build_churn_features(*portfolio)
+    pre = ColumnTransformer([
+        ("num", StandardScaler(), ["income", "credit_score", "market_rent", "sqft", "rent_burden"]),
+        ("cat", OneHotEncoder(handle_unknown="ignore"), ["type", "class", "neighborhood"]),
+    ])
+    clf = Pipeline([("pre", pre), ("clf", RandomForestClassifier(n_estimators=20, random_state=0))])
+    return clf.fit(df[CHURN_FEATURES], simulate_churn(df, seed=0))
+
+
+def test_batch_scores_match_per_row_predict_proba(portfolio, model):
+    scores = score_portfolio(model, *portfolio, model_version=2, data_version=5)
+    rows = build_churn_features(*portfolio)
+    expected = [model.predict_proba(rows.iloc[[i]][CHURN_FEATURES])[0, 1] for i in range(len(rows))]
+
+    assert len(scores) == len(rows) > 0
+    np.testing.assert_allclose(scores.for_units(rows.index)['churn_probability'].to_numpy(), expected)
+    assert list(scores.frame['risk_level']) == [risk_level(p) for p in scores.frame['churn_probability']]
+    assert (scores.model_version, scores.data_version) == (2, 5)
+
+
+def test_materialized_features_score_like_the_join(portfolio, model):
+    joined = score_portfolio(model, *portfolio)
+    stored = score_portfolio(model, features=build_tenant_features(*portfolio))
+    pd.testing.assert_frame_equal(joined.frame, stored.frame)
+
+
+def test_empty_portfolio_scores_nothing(model):
+    scores = score_portfolio(model, pd.DataFrame(), features=pd.DataFrame())
+    assert scores.empty and list(scores.frame.columns) == ChurnScores.COLUMNS
@@ -0,0 +1,69 @@
+"""DataManager snapshot swaps (src/api/data_manager.py)."""
+import pytest
+
+from src.api.data_manager import DataManager
+from src.data.synthetic.sharded import generate_sharded
+
+DATASETS = {"props": "properties", "units": "units", "tenants": "tenants"}
+
+
+def _portfolio(path, seed, n_properties, stats, as_of):
+    manifest = generate_sharded(stats, n_properties, str(path), seed=seed, shard_properties=n_properties,
+                                workers=1, as_of=as_of)
+    return str(path / "manifest.json"), manifest
+
+
+@pytest.fixture
+def portfolios(tmp_path, monkeypatch, stats, as_of):
+    first = _portfolio(tmp_path / "v1", 1, 4, stats, as_of)
+    second = _portfolio(tmp_path / "v2", 2, 6, stats, as_of)
+    monkeypatch.setenv("SYNTHETIC_MANIFEST", first[0])
+    return first, second
+
+
+def test_load_builds_first_snapshot(portfolios):
+    (_, manifest), _ = portfolios
+    data = DataManager(DATASETS)
+    snap = data.load()
+
+    assert snap.version == 1
+    assert len(snap.props) == 4
+    assert len(snap.units) == manifest["datasets"]["units"]["rows"]
+    assert len(snap.tenant_features) == manifest["datasets"]["tenants"]["rows"]
+    pid = str(snap.props["property_id"].iloc[0])
+    assert (snap.units_for([pid])["property_id"].astype(str) == pid).all()
+
+
+def test_reload_swaps_without_touching_held_snapshot(portfolios, monkeypatch):
+    _, (second_path, second) = portfolios
+    data = DataManager(DATASETS)
+    swapped = []
+    data.on_swap(swapped.append)
+    old = data.load()
+    old_units = old.units.copy()
+
+    monkeypatch.setenv("SYNTHETIC_MANIFEST", second_path)
+    assert data.reload()
+    data._reload_thread.join(timeout=60)
+
+    new = data.snapshot()
+    assert new.version == 2 and new is not old
+    assert len(new.props) == 6
+    assert len(new.units) == second["datasets"]["units"]["rows"]
+    # A request still holding the old snapshot sees the old frames unchanged
+    assert old.version == 1
+    assert old.units.equals(old_units)
+    assert [s.version for s in swapped] == [1, 2]
+
+
+def test_failed_reload_keeps_current_snapshot(portfolios, monkeypatch, tmp_path):
+    data = DataManager(DATASETS)
+    old = data.load()
+
+    monkeypatch.setenv("SYNTHETIC_MANIFEST", str(tmp_path / "missing" / "manifest.json"))
+    data.reload()
+    data._reload_thread.join(timeout=60)
+
+    assert data.snapshot() is old
+    assert data.last_error
+    assert data.status()["version"] == 1
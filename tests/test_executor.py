@@ -0,0 +1,69 @@
+"""ProcessExecutor restarts and in-process fallback (src/api/executor.py)."""
+import os
+import signal
+import threading
+import time
+
+import pytest
+
+from src.api import executor as executor_module
+from src.api.executor import ProcessExecutor
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    # os.getpid pickles by reference, so it runs in the workers without importing this module
+    monkeypatch.setitem(executor_module.TASKS, "pid", os.getpid)
+    ex = ProcessExecutor(workers=1, start_method="fork")
+    ex.start()
+    yield ex
+    ex.shutdown()
+
+
+def _kill_worker(ex):
+    pid = ex.call("pid")
+    assert pid != os.getpid()
+    os.kill(pid, signal.SIGKILL)
+    # Wait until the pool has noticed the dead worker
+    deadline = time.time() + 10
+    while not ex._pool._broken and time.time() < deadline:
+        time.sleep(0.05)
+    return pid
+
+
+def test_killed_worker_restarts_the_pool(executor):
+    old_pid = _kill_worker(executor)
+    new_pid = executor.call("pid")
+    assert new_pid not in (old_pid, os.getpid())
+    assert executor.restarts == 1
+    assert executor.running
+
+
+def test_failed_restart_runs_tasks_in_process(executor):
+    _kill_worker(executor)
+    executor.start_method = "no-such-method"
+    assert executor.call("pid") == os.getpid()
+    assert executor.restarts == 1
+    assert not executor.running
+    assert executor.status()["tasks"]["pid"]["failed"] == 0
+
+
+def test_concurrent_callers_restart_a_broken_pool_once(executor):
+    broken = executor._pool
+    _kill_worker(executor)
+    threads = [threading.Thread(target=executor.restart, kwargs={"broken": broken}) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert executor.restarts == 1
+    assert executor.running and executor._pool is not broken
+    assert executor.call("pid") != os.getpid()
+
+
+def test_disabled_executor_runs_in_process(monkeypatch):
+    monkeypatch.setitem(executor_module.TASKS, "pid", os.getpid)
+    ex = ProcessExecutor(workers=0)
+    ex.start()
+    assert not ex.running
+    assert ex.call("pid") == os.getpid()
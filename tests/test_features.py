@@ -0,0 +1,71 @@
+"""Hash-versioned feature tables (src/data/features.py)."""
+import os
+
+import pytest
+
+from src.data import features, store
+from src.data.synthetic.vectorized import generate_vectorized
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch, stats, as_of):
+    """A small portfolio as the store's source CSVs, with the store and feature tables under tmp_path."""
+    os.makedirs(tmp_path / "synthetic")
+    frames = dict(zip(("properties", "units", "tenants"), generate_vectorized(stats, 3, seed=1, as_of=as_of)))
+    for name, df in frames.items():
+        df.to_csv(tmp_path / store.DATASETS[name]["csv"], index=False)
+    monkeypatch.delenv("SYNTHETIC_MANIFEST", raising=False)
+    monkeypatch.setattr(store, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(store, "STORE_DIR", str(tmp_path / "store"))
+    monkeypatch.setattr(features, "FEATURE_DIR", str(tmp_path / "store" / "features"))
+    return tmp_path
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    """Tables passed to _compute, i.e. every rebuild."""
+    built = []
+    compute = features._compute
+    monkeypatch.setattr(features, "_compute", lambda table: built.append(table) or compute(table))
+    return built
+
+
+def _stored_versions(table):
+    return sorted(f for f in os.listdir(features.FEATURE_DIR) if f.startswith(f"{table}-") and f.endswith(".feather"))
+
+
+def test_unchanged_inputs_reuse_the_stored_table(data_dir, builds):
+    first, version = features.load_features("tenant_features", with_version=True)
+    second, again = features.load_features("tenant_features", with_version=True)
+    assert version == again and builds == ["tenant_features"]
+    assert second.equals(first)
+    assert _stored_versions("tenant_features") == [f"tenant_features-{version}.feather"]
+
+
+def test_changed_input_rematerializes(data_dir, builds):
+    before, version = features.load_features("tenant_features", with_version=True)
+    units_version = features.materialize("unit_features")[0]
+
+    csv = data_dir / store.DATASETS["tenants"]["csv"]
+    lines = csv.read_text().splitlines(keepends=True)
+    csv.write_text("".join(lines[:-1]))  # drop the last tenant
+
+    after, new_version = features.load_features("tenant_features", with_version=True)
+    assert new_version != version and len(after) == len(before) - 1
+    assert builds == ["tenant_features", "unit_features", "tenant_features"]
+    # unit_features does not read tenants, so its version is unchanged
+    assert features.materialize("unit_features")[0] == units_version
+    assert len(builds) == 3
+
+
+def test_definition_bump_rematerializes_and_prunes(data_dir, builds, monkeypatch):
+    monkeypatch.setattr(features, "KEEP_VERSIONS", 1)
+    version = features.materialize("tenant_features")[0]
+    monkeypatch.setattr(features, "FEATURES_VERSION", features.FEATURES_VERSION + 1)
+    new_version = features.materialize("tenant_features")[0]
+
+    assert new_version != version and len(builds) == 2
+    assert _stored_versions("tenant_features") == [f"tenant_features-{new_version}.feather"]
+    assert features.status()["tenant_features"][0]["version"] == new_version
@@ -0,0 +1,63 @@
+"""Lease history simulator (src/data/synthetic/generate_leases.py)."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.synthetic.generate_leases import LEASE_MONTHS, decision_frame, simulate_leases
+
+
+@pytest.fixture(scope="module")
+def units():
+    rng = np.random.default_rng(0)
+    n = 300
+    return pd.DataFrame({
+        "unit_id": [f"PROP_{i // 10:03d}_U{i % 10:03d}" for i in range(n)],
+        "type": rng.choice(["Studio", "1BD", "2BD"], size=n),
+        "sqft": rng.integers(400, 1400, size=n),
+        "market_rent": rng.normal(3500, 800, size=n).round(),
+        "neighborhood": rng.choice(["Harlem", "Tribeca", "East Village"], size=n),
+        "class": rng.choice(["A", "B", "C"], size=n),
+    })
+
+
+@pytest.fixture(scope="module")
+def events(units, as_of):
+    return simulate_leases(units, years=4, seed=7, as_of=as_of)
+
+
+def test_same_seed_same_history(units, events, as_of):
+    pd.testing.assert_frame_equal(events, simulate_leases(units, years=4, seed=7, as_of=as_of))
+    assert not events.equals(simulate_leases(units, years=4, seed=8, as_of=as_of))
+
+
+def test_event_counts(units, events):
+    counts = events["event"].value_counts()
+    assert all(counts[event] > 0 for event in ("move_in", "renewal", "move_out"))
+    # Every unit has a lease end at least every LEASE_MONTHS while let, so most units see events
+    assert events["unit_id"].nunique() > 0.9 * len(units)
+    assert events["event_date"].is_monotonic_increasing
+
+
+def test_lease_invariants(events):
+    months = events["event_date"].to_numpy().astype("datetime64[M]").astype(int)
+    for _, unit in events.assign(month=months).groupby("unit_id", sort=False):
+        previous = None
+        for row in unit.itertuples():
+            if row.event == "move_in":
+                # A move-in only on a vacant unit: the previous event (if any) was a move-out
+                assert previous is None or previous.event == "move_out"
+            elif previous is not None:
+                # Lease ends follow the same tenant's move-in or renewal by exactly one lease term
+                assert previous.event in ("move_in", "renewal")
+                assert row.tenant_id == previous.tenant_id
+                assert row.month == previous.month + LEASE_MONTHS
+                assert row.prev_rent == previous.rent
+            previous = row
+
+
+def test_tenant_ids_are_unique_per_lease_decision(units, events):
+    move_ins = events[events["event"] == "move_in"]
+    assert move_ins["tenant_id"].is_unique
+    decisions = decision_frame(events, units)
+    assert not decisions.duplicated(["tenant_id", "event_date"]).any()
+    assert set(decisions["churned"].unique()) == {0, 1}
@@ -0,0 +1,63 @@
+"""Vectorized churn labels match the row-wise logic they replaced (src/models/churn/labels.py)."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.churn.labels import (_row_probability_v1, _row_probability_v2, churn_probability_v1,
+                                     churn_probability_v2, churn_scores_v1, churn_scores_v2, simulate_churn,
+                                     simulate_churn_v1, simulate_churn_v2)
+
+
+@pytest.fixture(scope="module")
+def tenants():
+    """Random tenants plus rows on every threshold of both score functions."""
+    rng = np.random.default_rng(0)
+    n = 2000
+    df = pd.DataFrame({
+        "income": rng.normal(120000, 50000, size=n).round(),
+        "credit_score": rng.integers(500, 850, size=n),
+        "market_rent": rng.normal(3500, 1200, size=n).round(),
+        "class": rng.choice(["A", "B", "C"], size=n),
+        "neighborhood": rng.choice(["Harlem", "Tribeca", "East Village"], size=n),
+        "type": rng.choice(["Studio", "1BD", "2BD"], size=n),
+    })
+    edges = pd.DataFrame({
+        "income": [0, -1000, 120000, 120000, 150000, 150001, 120001, 60000],
+        "credit_score": [620, 619, 750, 751, 600, 599, 760, 761],
+        "market_rent": [3000, 3000, 4000, 2000, 2500, 5000, 1250, 2250],
+        "class": ["C", "C", "C", "C", "C", "C", "C", "A"],
+        "neighborhood": ["Harlem"] * 8,
+        "type": ["Studio", "1BD", "Studio", "Studio", "2BD", "Studio", "Studio", "Studio"],
+    })
+    # Arrow-backed strings, as load_features returns them
+    df = pd.concat([df, edges], ignore_index=True)
+    return df.astype({"class": "string", "neighborhood": "string", "type": "string"})
+
+
+def test_probabilities_match_rowwise(tenants):
+    np.testing.assert_allclose(churn_probability_v1(churn_scores_v1(tenants)),
+                               tenants.apply(_row_probability_v1, axis=1).to_numpy())
+    np.testing.assert_allclose(churn_probability_v2(churn_scores_v2(tenants)),
+                               tenants.apply(_row_probability_v2, axis=1).to_numpy())
+
+
+def test_labels_match_rowwise_with_the_same_draws(tenants):
+    n = len(tenants)
+    # v2: one uniform per row
+    uniform = np.random.default_rng(7).random(n)
+    rowwise = uniform < tenants.apply(_row_probability_v2, axis=1).to_numpy()
+    np.testing.assert_array_equal(simulate_churn_v2(tenants, seed=7), rowwise.astype(np.int8))
+
+    # v1: N(0, 0.1) score noise per row, then one uniform per row
+    rng = np.random.default_rng(7)
+    noise, uniform = rng.normal(0, 0.1, size=n), rng.random(n)
+    probability = np.array([_row_probability_v1(row, eps) for (_, row), eps in zip(tenants.iterrows(), noise)])
+    np.testing.assert_array_equal(simulate_churn_v1(tenants, seed=7), (uniform < probability).astype(np.int8))
+
+
+@pytest.mark.parametrize("version", ["v1", "v2"])
+def test_labels_are_reproducible_per_seed(tenants, version):
+    first = simulate_churn(tenants, version, seed=3)
+    assert first.dtype == np.int8
+    np.testing.assert_array_equal(first, simulate_churn(tenants, version, seed=3))
+    assert not np.array_equal(first, simulate_churn(tenants, version, seed=4))
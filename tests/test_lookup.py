@@ -0,0 +1,71 @@
+"""Precomputed rent lookup table vs. the live valuation model (src/models/lookup.py)."""
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder
+
+from src.models.lookup import ValuationLookupTable
+
+NEIGHBORHOODS = ["Tribeca", "Northside"]
+SQFT_RANGE = (400, 1200)
+
+
+@pytest.fixture(scope="module")
+def model():
+    rng = np.random.default_rng(0)
+    n = 400
+    X = pd.DataFrame({
+        "neighborhood": rng.choice(NEIGHBORHOODS, n),
+        "class": rng.choice(["A", "B", "C"], n),
+        "type": rng.choice(["Studio", "1BD", "2BD"], n),
+        "sqft": rng.integers(300, 1500, n),
+    })
+    y = 2.5 * X["sqft"] + (X["class"] == "A") * 400 + (X["neighborhood"] == "Tribeca") * 600 + rng.normal(0, 50, n)
+    pre = ColumnTransformer([("cat", OneHotEncoder(handle_unknown="ignore"), ["neighborhood", "class", "type"])],
+                            remainder="passthrough")
+    return Pipeline([("pre", pre), ("model", RandomForestRegressor(n_estimators=10, random_state=0))]).fit(X, y)
+
+
+def _live(model, neighborhood, p_class, u_type, sqft):
+    row = pd.DataFrame([{"neighborhood": neighborhood, "class": p_class, "type": u_type, "sqft": sqft}])
+    return float(model.predict(row)[0])
+
+
+@pytest.mark.parametrize("row", [
+    ("Tribeca", "A", "Studio", 400),
+    ("Northside", "B", "2BD", 777),
+    ("Northside", "C", "1BD", 1200),
+])
+def test_in_grid_lookup_matches_live_model(model, row):
+    table = ValuationLookupTable.build(model, 1, NEIGHBORHOODS, sqft_range=SQFT_RANGE)
+    assert table.lookup(*row) == pytest.approx(_live(model, *row))
+
+
+def test_coarse_grid_interpolates_between_grid_points(model):
+    table = ValuationLookupTable.build(model, 1, NEIGHBORHOODS, sqft_range=SQFT_RANGE, sqft_step=100)
+    assert table.lookup("Tribeca", "A", "1BD", 500) == pytest.approx(_live(model, "Tribeca", "A", "1BD", 500))
+    lo, hi = (_live(model, "Tribeca", "A", "1BD", s) for s in (500, 600))
+    assert table.lookup("Tribeca", "A", "1BD", 525) == pytest.approx(0.75 * lo + 0.25 * hi)
+
+
+@pytest.mark.parametrize("row", [
+    ("Midtown", "A", "Studio", 800),     # unknown neighborhood
+    ("Tribeca", "D", "Studio", 800),     # unknown class
+    ("Tribeca", "A", "3BD", 800),        # unknown unit type
+    ("Tribeca", "A", "Studio", 399),     # below the sqft range
+    ("Tribeca", "A", "Studio", 1201),    # above the sqft range
+    ("Tribeca", "A", "Studio", None),
+])
+def test_out_of_grid_inputs_fall_back_to_the_live_model(model, row):
+    table = ValuationLookupTable.build(model, 1, NEIGHBORHOODS, sqft_range=SQFT_RANGE)
+    assert table.lookup(*row) is None
+
+
+def test_saved_table_round_trips(model, tmp_path):
+    table = ValuationLookupTable.build(model, 3, NEIGHBORHOODS, sqft_range=SQFT_RANGE)
+    loaded = ValuationLookupTable.load(table.save(str(tmp_path / "lookup.npz")))
+    assert loaded.version == 3 and loaded.covers(NEIGHBORHOODS)
+    assert np.array_equal(loaded.values, table.values)
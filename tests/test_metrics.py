@@ -0,0 +1,69 @@
+"""Prometheus exposition and per-route request metrics (src/api/metrics.py, GET /metrics)."""
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.metrics import CONTENT_TYPE, MetricsRegistry
+
+SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{.*\})? (\S+)$')
+
+
+def _samples(text):
+    """{(name, labels): value} for every sample line; checks each line is HELP, TYPE or a valid sample."""
+    samples = {}
+    for line in text.splitlines():
+        if line.startswith(("# HELP ", "# TYPE ")):
+            continue
+        match = SAMPLE.match(line)
+        assert match, f"not a Prometheus sample line: {line!r}"
+        name, labels, value = match.groups()
+        samples[(name, labels or "")] = float(value)
+    return samples
+
+
+def test_histogram_exposition():
+    registry = MetricsRegistry()
+    latency = registry.histogram("demo_seconds", "Demo latency", ["route"], buckets=(0.01, 0.5, 5))
+    for value in (0.003, 0.2, 7):
+        latency.observe(value, route='/a"b')
+    registry.counter("demo_total", "Demo count").inc(2)
+
+    text = registry.render()
+    assert text.endswith("\n")
+    assert "# HELP demo_seconds Demo latency\n# TYPE demo_seconds histogram\n" in text
+    samples = _samples(text)
+    label = 'route="/a\\"b"'
+    buckets = [samples[("demo_seconds_bucket", f'{{{label},le="{le}"}}')] for le in ("0.01", "0.5", "5", "+Inf")]
+    assert buckets == [1, 2, 2, 3]
+    assert samples[("demo_seconds_count", f"{{{label}}}")] == 3
+    assert samples[("demo_seconds_sum", f"{{{label}}}")] == pytest.approx(7.203)
+    assert samples[("demo_total", "")] == 2
+
+
+def test_metrics_endpoint_labels_requests_by_route_template():
+    from src.api.server import app
+
+    client = TestClient(app)
+    before = _samples(client.get("/metrics").text)
+
+    status = client.get("/properties/PROP_001/yield").status_code
+    assert client.get("/properties/PROP_002/yield").status_code == status
+    assert client.get("/no/such/path").status_code == 404
+    route = f'{{method="GET",route="/properties/{{id}}/yield",status="{status}"}}'
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == CONTENT_TYPE
+    samples = _samples(response.text)
+    assert samples[("http_requests_total", route)] == before.get(("http_requests_total", route), 0) + 2
+    assert samples[("http_requests_total", '{method="GET",route="unmatched",status="404"}')] >= 1
+    # No series per raw path
+    assert not any("PROP_001" in labels for _, labels in samples)
+
+    latency = '{method="GET",route="/properties/{id}/yield"'
+    buckets = sorted((value for (name, labels), value in samples.items()
+                      if name == "http_request_duration_seconds_bucket" and labels.startswith(latency)))
+    count = samples[("http_request_duration_seconds_count", latency + "}")]
+    # Cumulative buckets end at +Inf == _count
+    assert buckets[-1] == count >= 2
@@ -0,0 +1,42 @@
+"""Out-of-core trainers on a small CSV source (src/models/out_of_core.py)."""
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.out_of_core import ChunkSource, train_out_of_core
+
+
+@pytest.fixture(scope="module")
+def source(tmp_path_factory):
+    rng = np.random.default_rng(0)
+    n = 3000
+    df = pd.DataFrame({
+        "neighborhood": rng.choice(["Harlem", "Tribeca", "East Village"], size=n),
+        "class": rng.choice(["A", "B", "C"], size=n),
+        "type": rng.choice(["Studio", "1BD", "2BD"], size=n),
+        "sqft": rng.integers(400, 1400, size=n),
+        "income": rng.normal(120000, 50000, size=n).round(),
+        "credit_score": rng.integers(500, 850, size=n),
+    })
+    df["market_rent"] = (df["sqft"] * 3 + rng.normal(0, 100, size=n)).round()
+    df["rent_burden"] = df["market_rent"] * 12 / df["income"].clip(lower=1)
+    path = tmp_path_factory.mktemp("ooc") / "features.csv"
+    df.to_csv(path, index=False)
+    return ChunkSource(str(path), batch_rows=1000)
+
+
+@pytest.mark.parametrize("task", ["valuation", "churn"])
+def test_xgb_pipeline_survives_pickling(source, task):
+    pipeline, metrics = train_out_of_core(source, task, "xgb", num_boost_round=20, eval_rows=100)
+    assert metrics["train_rows"] == 2700
+    # The reported metrics come from holdout rows early stopping did not see
+    assert metrics["early_stopping_rows"] == metrics["eval_rows"] == 50
+    X = pd.read_csv(source.files[0]).head(50)
+    restored = pickle.loads(pickle.dumps(pipeline))
+    if task == "valuation":
+        np.testing.assert_allclose(restored.predict(X), pipeline.predict(X))
+    else:
+        assert list(restored.classes_) == [0, 1]
+        np.testing.assert_allclose(restored.predict_proba(X), pipeline.predict_proba(X))
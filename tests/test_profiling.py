@@ -0,0 +1,71 @@
+"""Request profiling middleware (src/api/profiling.py)."""
+import asyncio
+import os
+import pstats
+
+from src.api.profiling import Profiler, ProfileStore, ProfilingMiddleware
+
+
+def _after_overlap():
+    return sum(range(100))
+
+
+async def _request(app, path, mode):
+    scope = {"type": "http", "method": "GET", "path": path, "headers": [(b"x-profile", mode.encode())]}
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    return messages[0]
+
+
+def test_overlapping_cprofile_requests_do_not_clobber_each_other(tmp_path):
+    gate = asyncio.Event()
+
+    async def endpoint(scope, receive, send):
+        if scope["path"] == "/slow":
+            await gate.wait()
+            _after_overlap()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    profiler = Profiler(enabled=True, mode="cprofile", store=ProfileStore(str(tmp_path)))
+    app = ProfilingMiddleware(endpoint, profiler)
+
+    async def run():
+        slow = asyncio.create_task(_request(app, "/slow", "cprofile"))
+        await asyncio.sleep(0.05)
+        # Arrives while /slow holds the profiler: served, but not profiled
+        fast = await _request(app, "/fast", "cprofile")
+        gate.set()
+        return await slow, fast
+
+    slow, fast = asyncio.run(run())
+    assert slow["status"] == fast["status"] == 200
+    assert any(name == b"x-profile-id" for name, _ in slow["headers"])
+    assert not any(name == b"x-profile-id" for name, _ in fast["headers"])
+    assert profiler.status()["captured"] == 1 and profiler.status()["skipped_busy"] == 1
+
+    [meta] = profiler.store.list()
+    stats = pstats.Stats(os.path.join(str(tmp_path), meta["file"]))
+    # Calls made after the overlapping request finished are still in the profile
+    assert any(func[2] == "_after_overlap" for func in stats.stats)
+
+
+def test_sample_mode_saves_collapsed_stacks(tmp_path):
+    async def endpoint(scope, receive, send):
+        await asyncio.sleep(0.02)
+        await send({"type": "http.response.start", "status": 204, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    profiler = Profiler(enabled=True, mode="sample", interval_ms=1, store=ProfileStore(str(tmp_path)))
+    response = asyncio.run(_request(ProfilingMiddleware(endpoint, profiler), "/x", "sample"))
+    assert response["status"] == 204
+    [meta] = profiler.store.list()
+    assert meta["mode"] == "sample" and meta["status"] == 204
+    assert meta["file"].endswith(".collapsed")
@@ -0,0 +1,68 @@
+"""Content-addressed artifacts, checksums and the metadata cache (src/models/registry.py)."""
+import os
+
+import pandas as pd
+import pytest
+from sklearn.dummy import DummyRegressor
+
+from src.models.registry import ARTIFACTS_DIR, ModelRegistry
+
+NAME = "test_model"
+X = pd.DataFrame({"x": [1.0, 2.0]})
+
+
+def _constant(value):
+    return DummyRegressor(strategy="constant", constant=value).fit(X, [value] * len(X))
+
+
+@pytest.fixture
+def registry(tmp_path):
+    registry = ModelRegistry(db_path=str(tmp_path / "registry.db"), models_dir=str(tmp_path))
+    yield registry
+    registry.close()
+
+
+def _artifact_files(registry):
+    root = os.path.join(registry.models_dir, ARTIFACTS_DIR)
+    return sorted(f for _, _, files in os.walk(root) for f in files)
+
+
+def test_identical_models_share_one_artifact(registry):
+    assert registry.save_model(_constant(1.0), NAME) == 1
+    assert registry.save_model(_constant(1.0), NAME) == 2
+    assert registry.save_model(_constant(2.0), "other_model") == 1
+
+    assert registry.resolve(NAME, 1)[1] == registry.resolve(NAME, 2)[1]
+    assert registry.artifact_sha256(NAME, 1) == registry.artifact_sha256(NAME, 2)
+    assert len(_artifact_files(registry)) == 2
+    assert registry.load_model(NAME, 2).constant == 1.0
+
+
+def test_checksum_mismatch_refuses_to_load(registry):
+    registry.save_model(_constant(1.0), NAME)
+    assert registry.verify(NAME, 1) is True
+    path = registry.resolve(NAME, 1)[1]
+    with open(path, "ab") as f:
+        f.write(b"tampered")
+
+    with pytest.raises(ValueError, match="failed checksum verification"):
+        registry.verify(NAME, 1)
+    with pytest.raises(ValueError, match="failed checksum verification"):
+        registry.load_model(NAME, 1)
+    assert registry.load_model(NAME, 1, verify=False) is not None
+
+
+def test_metadata_cache_sees_writes_from_other_connections(registry, tmp_path):
+    registry.save_model(_constant(1.0), NAME)
+    assert registry.get_latest_version(NAME) == 1
+    misses = registry.metadata_stats()["misses"]
+    assert registry.get_latest_version(NAME) == 1
+    assert registry.metadata_stats()["misses"] == misses  # unchanged database: served from memory
+
+    other = ModelRegistry(db_path=registry.db_path, models_dir=registry.models_dir)
+    other.save_model(_constant(2.0), NAME)
+    other.close()
+
+    assert registry.get_latest_version(NAME) == 2
+    assert registry.metadata_stats()["misses"] == misses + 1
+    assert registry.load_model(NAME).constant == 2.0
@@ -0,0 +1,112 @@
+"""Alias-following model slots: hot swap, warm-up and shadow scoring (src/models/serving.py)."""
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.dummy import DummyRegressor
+
+from src.api import executor as executor_module
+from src.api.executor import ProcessExecutor
+from src.models import cache as cache_module
+from src.models.cache import ModelCache
+from src.models.registry import ModelRegistry
+from src.models.serving import ModelSlot, ModelWatcher
+
+NAME = "test_model"
+ROWS = [{"x": 1.0}, {"x": 2.0}]
+X = pd.DataFrame(ROWS)
+# Blocks BlockingRegressor.predict until set
+RELEASE = threading.Event()
+
+
+class BlockingRegressor(DummyRegressor):
+    def predict(self, X):
+        RELEASE.wait(5)
+        return super().predict(X)
+
+
+def _constant(value, cls=DummyRegressor):
+    return cls(strategy="constant", constant=value).fit(X, [value] * len(X))
+
+
+def _cached_versions():
+    return sorted(version for name, version in cache_module.get_model_cache()._entries if name == NAME)
+
+
+@pytest.fixture
+def registry(tmp_path):
+    registry = ModelRegistry(db_path=str(tmp_path / "registry.db"), models_dir=str(tmp_path))
+    for value in (1.0, 2.0, 3.0):
+        registry.save_model(_constant(value), NAME)
+    registry.set_alias(NAME, "production", 1)
+    return registry
+
+
+@pytest.fixture
+def cache(registry, monkeypatch):
+    cache = ModelCache(registry)
+    # Forked executor workers inherit this as their shared cache
+    monkeypatch.setattr(cache_module, "_SHARED_CACHE", cache)
+    return cache
+
+
+def test_alias_move_swaps_the_served_version(registry, cache):
+    slot = ModelSlot(NAME, warmup_rows=ROWS, cache=cache)
+    assert slot.refresh() and slot.version == 1
+    assert np.allclose(slot.predict(X), 1.0)
+
+    registry.set_alias(NAME, "production", 2)
+    assert ModelWatcher([slot]).check_now() == [NAME]
+    assert slot.version == 2 and slot.swaps == 2
+    assert np.allclose(slot.predict(X), 2.0)
+    # Unchanged alias: nothing to do
+    assert not slot.refresh()
+
+
+def test_failed_load_keeps_the_current_version_serving(registry, cache):
+    slot = ModelSlot(NAME, cache=cache)
+    slot.refresh()
+    registry.set_alias(NAME, "production", 3)
+    with open(registry.resolve(NAME, 3)[1], "wb") as f:
+        f.write(b"not a pickle")
+
+    assert not slot.refresh()
+    assert slot.version == 1 and slot.last_error
+    assert np.allclose(slot.predict(X), 1.0)
+
+
+def test_swap_warms_the_new_version_in_executor_workers(registry, cache, monkeypatch):
+    monkeypatch.setitem(executor_module.TASKS, "cached", _cached_versions)
+    executor = ProcessExecutor(workers=1, start_method="fork")
+    executor.start()
+    try:
+        slot = ModelSlot(NAME, warmup_rows=ROWS, cache=cache, executor=executor)
+        slot.refresh()
+        registry.set_alias(NAME, "production", 2)
+        assert slot.refresh()
+        # The worker already holds v2 before the first live request
+        assert 2 in executor.call("cached")
+        assert np.allclose(slot.predict(X), 2.0)
+    finally:
+        executor.shutdown()
+
+
+def test_shadow_samples_are_dropped_while_one_is_pending(registry, cache):
+    registry.save_model(_constant(5.0, BlockingRegressor), NAME)
+    registry.set_alias(NAME, "canary", 4)
+    slot = ModelSlot(NAME, cache=cache)
+    slot.refresh()
+    RELEASE.clear()
+    slot.configure_shadow("canary", 100)
+    assert slot.status()["shadow"]["version"] == 4
+
+    # The first sample occupies the shadow thread until released; the rest are dropped
+    for _ in range(5):
+        assert np.allclose(slot.predict(X), 1.0)
+    RELEASE.set()
+    slot._shadow_pool.shutdown(wait=True)
+
+    shadow = slot.status()["shadow"]
+    assert shadow["scored"] == 1 and shadow["dropped"] == 4
+    assert shadow["mean_abs_delta"] == pytest.approx(4.0)
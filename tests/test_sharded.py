@@ -0,0 +1,47 @@
+"""Sharded generation is independent of the worker count (src/data/synthetic/sharded.py)."""
+import io
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.data import store
+from src.data.synthetic.sharded import DATASETS, generate_sharded
+from src.data.synthetic.vectorized import iter_batches
+
+
+def _read(out_dir, manifest, name):
+    files = manifest["datasets"][name]["files"]
+    return pd.concat([pd.read_parquet(os.path.join(out_dir, f)) for f in files], ignore_index=True)
+
+
+@pytest.fixture(scope="module")
+def runs(tmp_path_factory, stats, as_of):
+    out = {}
+    for workers in (1, 2):
+        out_dir = str(tmp_path_factory.mktemp(f"workers{workers}"))
+        out[workers] = out_dir, generate_sharded(stats, 23, out_dir, seed=7, shard_properties=5,
+                                                 workers=workers, as_of=as_of)
+    return out
+
+
+@pytest.mark.parametrize("name", DATASETS)
+def test_worker_count_does_not_change_output(runs, name):
+    pd.testing.assert_frame_equal(_read(*runs[1], name), _read(*runs[2], name))
+    assert runs[1][1]["datasets"][name]["rows"] == runs[2][1]["datasets"][name]["rows"]
+
+
+def test_shards_match_vectorized_batches(runs, stats, as_of):
+    out_dir, manifest = runs[2]
+    batches = list(iter_batches(stats, 23, seed=7, batch_properties=5, as_of=as_of))
+    assert len(batches) == len(manifest["shards"])
+    for entry, frames in zip(manifest["shards"], batches):
+        for df, name in zip(frames, ("properties", "units", "tenants")):
+            # Write the batch the way the shard writer does, so both sides read back the same dtypes
+            buffer = io.BytesIO()
+            table = pa.Table.from_pandas(store.apply_schema(df, name), preserve_index=False)
+            pq.write_table(table.cast(store.arrow_schema(name)), buffer)
+            pd.testing.assert_frame_equal(pd.read_parquet(os.path.join(out_dir, entry["files"][name])),
+                                          pd.read_parquet(buffer))
@@ -0,0 +1,20 @@
+"""Dataset schemas (src/data/store.py)."""
+import pandas as pd
+import pytest
+
+from src.data.store import apply_schema
+
+
+def test_apply_schema_coerces_csv_columns():
+    raw = pd.DataFrame({"unit_id": ["U1"], "property_id": ["P1"], "type": ["1BD"],
+                        "amenities": ["['Gym', 'View']"], "sqft": ["700"], "market_rent": [3200.0]})
+    df = apply_schema(raw, "units")
+    assert df["sqft"].dtype == "int32" and df["market_rent"].dtype == "int32"
+    assert df["amenities"].iloc[0] == ["Gym", "View"]
+
+
+@pytest.mark.parametrize("bad", [None, "", "n/a"])
+def test_blank_or_malformed_int_names_the_column(bad):
+    raw = pd.DataFrame({"tenant_id": ["T1", "T2"], "income": [90000, 80000], "credit_score": [700, bad]})
+    with pytest.raises(ValueError, match=r"tenants\.credit_score: 1 blank or non-numeric .*rows: \[1\]"):
+        apply_schema(raw, "tenants")
@@ -0,0 +1,78 @@
+"""Streaming CSV generation and resume (src/data/synthetic/streaming.py)."""
+import os
+
+import pytest
+
+from src.data.synthetic import streaming
+from src.data.synthetic.streaming import OUTPUT_FILES, stream_generate
+
+
+def _contents(out_dir):
+    out = {}
+    for filename in OUTPUT_FILES.values():
+        with open(os.path.join(out_dir, filename), "rb") as f:
+            out[filename] = f.read()
+    return out
+
+
+@pytest.fixture(scope="session")
+def generate(stats, as_of):
+    """stream_generate with the shared stats, seed 7 and batches of 5 properties."""
+    def run(n_properties, out_dir, **kwargs):
+        return stream_generate(stats, n_properties, str(out_dir), seed=7, batch_properties=5, as_of=as_of, **kwargs)
+    return run
+
+
+@pytest.fixture(scope="module")
+def uninterrupted(tmp_path_factory, generate):
+    out_dir = str(tmp_path_factory.mktemp("full"))
+    generate(23, out_dir)
+    return _contents(out_dir)
+
+
+def test_resume_after_crash_mid_batch_is_byte_identical(tmp_path, monkeypatch, generate, uninterrupted):
+    append = streaming._append
+    calls = []
+
+    def crash_in_third_batch(f, df):
+        calls.append(1)
+        if len(calls) == 8:  # the units of batch 3: its properties are already on disk
+            df.iloc[:len(df) // 2].to_csv(f, header=False, index=False)
+            f.flush()
+            raise KeyboardInterrupt
+        return append(f, df)
+
+    monkeypatch.setattr(streaming, "_append", crash_in_third_batch)
+    with pytest.raises(KeyboardInterrupt):
+        generate(23, tmp_path)
+    monkeypatch.setattr(streaming, "_append", append)
+
+    checkpoint = generate(23, tmp_path)
+    assert checkpoint["next_property"] == 23
+    assert _contents(str(tmp_path)) == uninterrupted
+
+
+def test_raising_n_properties_on_a_batch_boundary(tmp_path, generate, uninterrupted):
+    generate(10, tmp_path)
+    generate(23, tmp_path)
+    assert _contents(str(tmp_path)) == uninterrupted
+
+
+def test_refuses_n_properties_change_after_a_partial_batch(tmp_path, generate):
+    generate(23, tmp_path)
+    with pytest.raises(ValueError, match="n_properties=40"):
+        generate(40, tmp_path)
+
+
+@pytest.mark.parametrize("damage", ["delete", "shorten"])
+def test_refuses_to_resume_over_missing_or_short_output(tmp_path, generate, damage):
+    generate(10, tmp_path)
+    path = os.path.join(str(tmp_path), OUTPUT_FILES["units"])
+    if damage == "delete":
+        os.remove(path)
+    else:
+        os.truncate(path, os.path.getsize(path) // 2)
+    with pytest.raises(ValueError, match=OUTPUT_FILES["units"]):
+        generate(23, tmp_path)
+    # --restart still works
+    generate(23, tmp_path, resume=False)